@@ -32,6 +32,7 @@ export interface LoanResult {
     prediction: string;
     confidence: number;
   };
+  policy_version?: string;
 }
 
 export interface ApiResponse {
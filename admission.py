@@ -0,0 +1,434 @@
+"""Admission control for expensive endpoints, shared across gunicorn workers
+
+Every guarded endpoint has a ``Limit``: a token bucket (``rate`` requests per
+second, up to ``burst`` at once) and a cap on requests in flight across all
+workers (``concurrency``). A request is
+
+- rejected with 503 and ``Retry-After`` straight away when more than
+  ``max_backlog`` connections wait in the server's listen queue, or when it
+  already waited longer than ``max_queue_age`` in front of the app
+  (``X-Request-Start`` set by a proxy), since its client has most likely
+  given up;
+- rejected with 429 when the bucket is empty;
+- queued for at most ``queue_timeout`` seconds while ``concurrency`` requests
+  are in flight (at most ``max_queue`` waiting), then rejected with 503;
+- admitted but *degraded* when it had to queue, ``degrade_backlog`` or more
+  connections are waiting, or the bucket is nearly empty (below
+  ``degrade_below`` of ``burst``): handlers then skip work that waits on
+  Google Translate and answer from the catalog and cache, or in English.
+
+Sync workers take requests from the listen backlog one at a time, so the
+app never sees a burst arrive: it sits in the backlog until gunicorn's
+timeout kills the workers. The workers therefore read the backlog length of
+their listening sockets (``TCP_INFO``, Linux) before each guarded request;
+answering the excess with a cheap 503, or in English, drains it instead.
+
+The buckets and in-flight counts live in a small file mapped into every
+worker (``ADMISSION_STATE_PATH``, created by gunicorn_hooks), updated under
+``flock``. Each worker owns one slot of per-endpoint counters, so the
+master can release a dead worker's requests (``release_worker``).
+``time.monotonic`` is system-wide on Linux, so every process refills the
+buckets against the same clock. Without a state file the limits apply per
+process.
+
+It is off unless ``ADMISSION_CONTROL=true``: ``DEFAULT_LIMITS`` are a starting
+point, to be sized for the deployment (``ADMISSION_LIMITS``) before enabling.
+"""
+import fcntl
+import math
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# rate: requests/s refilled; burst: bucket size; concurrency: in flight across workers
+Limit = namedtuple('Limit', ['rate', 'burst', 'concurrency'])
+
+DEFAULT_LIMITS = {
+    'calculate_loan': Limit(50, 100, 16),
+    'calculate_loan_batch': Limit(1, 4, 2),
+    'counterfactual': Limit(20, 40, 8),
+    'translate': Limit(10, 20, 8),
+    'chatbot': Limit(50, 100, 16),
+}
+
+# Outcomes counted per endpoint (metrics 'admission' counter)
+OUTCOMES = ('admitted', 'queued', 'degraded', 'rate_limited', 'overloaded', 'expired')
+
+MAGIC = b'LOANADM1'
+MAX_WORKERS = 64
+
+# magic, endpoint count; then one pid per worker slot
+HEADER = struct.Struct('=8sI4x')
+PIDS = struct.Struct(f'={MAX_WORKERS}q')
+# Per endpoint: bucket (tokens, last refill), in flight per slot, waiting per slot
+BUCKET = struct.Struct('=dd')
+COUNTS = struct.Struct(f'={MAX_WORKERS}i')
+SLOT = struct.Struct('=i')
+
+
+# struct tcp_info: 8 u8 fields, then rto, ato, snd_mss, rcv_mss, unacked, sacked;
+# on a listening socket unacked is the accept queue length
+TCP_INFO = struct.Struct('=8B6I')
+
+
+def accept_backlog(sockets):
+    """Connections waiting to be accepted on ``sockets``, or None if not measurable"""
+    waiting = None
+    for sock in sockets:
+        try:
+            info = sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_INFO, TCP_INFO.size)
+        except (AttributeError, OSError):
+            continue
+        waiting = (waiting or 0) + TCP_INFO.unpack_from(info)[12]
+    return waiting
+
+
+def state_size(endpoints):
+    return HEADER.size + PIDS.size + endpoints * (BUCKET.size + 2 * COUNTS.size)
+
+
+def parse_limits(spec, defaults=DEFAULT_LIMITS):
+    """``"translate=10/20/8,chatbot=50/100/16"`` (rate/burst/concurrency) over ``defaults``"""
+    limits = dict(defaults)
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        name, _, values = item.partition('=')
+        name = name.strip()
+        if name not in limits:
+            raise ValueError(f"Unknown admission endpoint: {name}; choose from {', '.join(limits)}")
+        rate, burst, concurrency = values.split('/')
+        limits[name] = Limit(float(rate), float(burst), int(concurrency))
+    return limits
+
+
+class Ticket:
+    """Outcome of ``admit``; release an admitted ticket when the request is done
+
+    ``status`` is None when admitted, else 429 or 503 with ``retry_after``
+    seconds. Usable as a context manager.
+    """
+
+    __slots__ = ('control', 'index', 'status', 'retry_after', 'degraded', 'waited', 'reason')
+
+    def __init__(self, control, index, status=None, retry_after=None, degraded=False, waited=0.0, reason=None):
+        self.control = control
+        self.index = index
+        self.status = status
+        self.retry_after = retry_after
+        self.degraded = degraded
+        self.waited = waited
+        self.reason = reason
+
+    @property
+    def admitted(self):
+        return self.status is None
+
+    def release(self):
+        if self.index is not None and self.status is None:
+            self.control._release(self.index)
+            self.index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+# What one attempt under the lock decided
+_ADMIT, _WAIT, _RATE_LIMITED, _QUEUE_FULL = range(4)
+
+
+class AdmissionControl:
+    """Token buckets and in-flight limits in a (possibly shared) memory map"""
+
+    def __init__(self, limits=None, path=None, queue_timeout=1.0, max_queue=32, max_queue_age=10.0,
+                 max_backlog=64, degrade_backlog=8, degrade_below=0.25, poll_interval=0.005, enabled=True):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.endpoints = tuple(self.limits)
+        self.path = path
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.max_queue_age = max_queue_age
+        self.max_backlog = max_backlog
+        self.degrade_backlog = degrade_backlog
+        self.listeners = []
+        self.degrade_below = degrade_below
+        self.poll_interval = poll_interval
+        self.enabled = enabled
+        self._index = {endpoint: index for index, endpoint in enumerate(self.endpoints)}
+        self._fd = None
+        self._open()
+
+    # -- shared state ---------------------------------------------------
+
+    def _open(self):
+        size = state_size(len(self.endpoints))
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self.path:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+            self._map = mmap.mmap(self._fd, size)
+        else:
+            self._map = mmap.mmap(-1, size)
+        self._lock = threading.Lock()
+        self._slot = None
+        self._slot_pid = None
+        with self._locked():
+            magic, count = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or count != len(self.endpoints):
+                self._initialize()
+
+    def after_fork(self):
+        """Reopen the state file: flock locks belong to the open file, which a fork shares
+
+        Without a state file the forked process gets fresh, private limits.
+        """
+        self._open()
+
+    def watch(self, sockets):
+        """Listening sockets whose backlog limits admission (gunicorn ``worker.sockets``)"""
+        self.listeners = [sock for sock in sockets if sock.family in (socket.AF_INET, socket.AF_INET6)]
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._fd is None:
+                yield
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _initialize(self):
+        self._map[:] = bytes(len(self._map))
+        HEADER.pack_into(self._map, 0, MAGIC, len(self.endpoints))
+        now = time.monotonic()
+        for index, endpoint in enumerate(self.endpoints):
+            BUCKET.pack_into(self._map, self._offset(index), self.limits[endpoint].burst, now)
+
+    def _offset(self, index):
+        return HEADER.size + PIDS.size + index * (BUCKET.size + 2 * COUNTS.size)
+
+    def _claim_slot(self):
+        """This process's slot in the worker table (under the lock), or None if it is full"""
+        pid = os.getpid()
+        if self._slot_pid == pid:
+            return self._slot
+        pids = list(PIDS.unpack_from(self._map, HEADER.size))
+        slot = pids.index(pid) if pid in pids else None
+        if slot is None:
+            free = [i for i, owner in enumerate(pids) if owner == 0 or not _alive(owner)]
+            if not free:
+                return None
+            slot = free[0]
+            self._clear_slot(slot)
+            struct.pack_into('=q', self._map, HEADER.size + 8 * slot, pid)
+        self._slot, self._slot_pid = slot, pid
+        return slot
+
+    def _clear_slot(self, slot):
+        for index in range(len(self.endpoints)):
+            offset = self._offset(index) + BUCKET.size
+            SLOT.pack_into(self._map, offset + 4 * slot, 0)
+            SLOT.pack_into(self._map, offset + COUNTS.size + 4 * slot, 0)
+
+    def _add(self, offset, slot, delta):
+        if slot is not None:
+            position = offset + 4 * slot
+            SLOT.pack_into(self._map, position, SLOT.unpack_from(self._map, position)[0] + delta)
+
+    def _attempt(self, index, waiting):
+        """One admission attempt; ``waiting`` if this request is already queued
+
+        Returns ``(decision, tokens left)``.
+        """
+        limit = self.limits[self.endpoints[index]]
+        offset = self._offset(index)
+        in_flight_at = offset + BUCKET.size
+        waiting_at = in_flight_at + COUNTS.size
+        with self._locked():
+            slot = self._claim_slot()
+            tokens, updated = BUCKET.unpack_from(self._map, offset)
+            now = time.monotonic()
+            tokens = min(limit.burst, tokens + max(0.0, now - updated) * limit.rate)
+            if tokens < 1:
+                BUCKET.pack_into(self._map, offset, tokens, now)
+                if waiting:
+                    self._add(waiting_at, slot, -1)
+                return _RATE_LIMITED, tokens
+            if sum(COUNTS.unpack_from(self._map, in_flight_at)) < limit.concurrency:
+                tokens -= 1
+                BUCKET.pack_into(self._map, offset, tokens, now)
+                self._add(in_flight_at, slot, 1)
+                if waiting:
+                    self._add(waiting_at, slot, -1)
+                return _ADMIT, tokens
+            BUCKET.pack_into(self._map, offset, tokens, now)
+            if not waiting:
+                if sum(COUNTS.unpack_from(self._map, waiting_at)) >= self.max_queue:
+                    return _QUEUE_FULL, tokens
+                self._add(waiting_at, slot, 1)
+            return _WAIT, tokens
+
+    def _give_up(self, index):
+        with self._locked():
+            self._add(self._offset(index) + BUCKET.size + COUNTS.size, self._claim_slot(), -1)
+
+    def _release(self, index):
+        with self._locked():
+            self._add(self._offset(index) + BUCKET.size, self._claim_slot(), -1)
+
+    # -- admission ------------------------------------------------------
+
+    def _steps(self, endpoint, queued_for):
+        """Generator behind admit/aadmit: yields seconds to sleep, returns the Ticket"""
+        index = self._index.get(endpoint)
+        if not self.enabled or index is None:
+            return Ticket(self, None)
+        if queued_for is not None and queued_for > self.max_queue_age:
+            return Ticket(self, None, 503, 1, reason='expired')
+        backlog = accept_backlog(self.listeners) if self.listeners else None
+        if backlog is not None and backlog > self.max_backlog:
+            return Ticket(self, None, 503, 1, reason='overloaded')
+
+        limit = self.limits[endpoint]
+        started = time.monotonic()
+        waiting = False
+        while True:
+            decision, tokens = self._attempt(index, waiting)
+            waited = time.monotonic() - started
+            if decision == _ADMIT:
+                degraded = (
+                    waiting or tokens < limit.burst * self.degrade_below
+                    or (backlog is not None and backlog >= self.degrade_backlog)
+                )
+                return Ticket(self, index, degraded=degraded, waited=waited, reason='queued' if waiting else None)
+            if decision == _RATE_LIMITED:
+                retry_after = max(1, math.ceil((1 - tokens) / limit.rate)) if limit.rate > 0 else 60
+                return Ticket(self, None, 429, retry_after, waited=waited, reason='rate_limited')
+            if decision == _QUEUE_FULL:
+                return Ticket(self, None, 503, 1, waited=waited, reason='overloaded')
+            waiting = True
+            if waited >= self.queue_timeout:
+                self._give_up(index)
+                return Ticket(self, None, 503, max(1, math.ceil(self.queue_timeout)), waited=waited, reason='overloaded')
+            yield min(self.poll_interval, self.queue_timeout - waited)
+
+    def admit(self, endpoint, queued_for=None):
+        """Ticket for one request to ``endpoint``, blocking while it is queued
+
+        ``queued_for`` is how long the request already waited before
+        reaching the app, if known.
+        """
+        steps = self._steps(endpoint, queued_for)
+        try:
+            while True:
+                time.sleep(next(steps))
+        except StopIteration as done:
+            return done.value
+
+    async def aadmit(self, endpoint, queued_for=None):
+        """Async variant of admit that yields to the event loop while queued"""
+        import asyncio
+
+        steps = self._steps(endpoint, queued_for)
+        try:
+            while True:
+                await asyncio.sleep(next(steps))
+        except StopIteration as done:
+            return done.value
+
+    def stats(self):
+        """Tokens, in-flight and queued requests per endpoint, across all workers"""
+        endpoints = {}
+        with self._locked():
+            now = time.monotonic()
+            for index, endpoint in enumerate(self.endpoints):
+                limit = self.limits[endpoint]
+                offset = self._offset(index)
+                tokens, updated = BUCKET.unpack_from(self._map, offset)
+                endpoints[endpoint] = {
+                    'limit': limit._asdict(),
+                    'tokens': round(min(limit.burst, tokens + max(0.0, now - updated) * limit.rate), 2),
+                    'in_flight': sum(COUNTS.unpack_from(self._map, offset + BUCKET.size)),
+                    'queued': sum(COUNTS.unpack_from(self._map, offset + BUCKET.size + COUNTS.size)),
+                }
+        return {
+            'enabled': self.enabled,
+            'shared': self.path is not None,
+            'backlog': accept_backlog(self.listeners) if self.listeners else None,
+            'endpoints': endpoints,
+        }
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def request_queue_time(header, now=None):
+    """Seconds since ``X-Request-Start`` (``t=<epoch ms or µs>`` or a bare number), or None"""
+    if not header:
+        return None
+    try:
+        value = float(header.strip().removeprefix('t='))
+    except ValueError:
+        return None
+    # Seconds (nginx ${msec}), milliseconds or microseconds since the epoch
+    started = value / 1e6 if value > 1e14 else value / 1e3 if value > 1e11 else value
+    return max(0.0, (time.time() if now is None else now) - started)
+
+
+def create_admission_control():
+    """AdmissionControl configured from the environment"""
+    return AdmissionControl(
+        parse_limits(os.getenv('ADMISSION_LIMITS')),
+        path=os.getenv('ADMISSION_STATE_PATH') or None,
+        queue_timeout=float(os.getenv('ADMISSION_QUEUE_TIMEOUT_MS', '1000')) / 1000,
+        max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', '32')),
+        max_queue_age=float(os.getenv('ADMISSION_MAX_QUEUE_AGE_MS', '10000')) / 1000,
+        max_backlog=int(os.getenv('ADMISSION_MAX_BACKLOG', '64')),
+        degrade_backlog=int(os.getenv('ADMISSION_DEGRADE_BACKLOG', '8')),
+        degrade_below=float(os.getenv('ADMISSION_DEGRADE_BELOW', '0.25')),
+        enabled=os.getenv('ADMISSION_CONTROL', 'false').lower() == 'true',
+    )
+
+
+def release_worker(pid, path=None):
+    """Forget a dead worker's in-flight and queued requests (gunicorn child_exit, in the master)"""
+    path = path or os.getenv('ADMISSION_STATE_PATH')
+    if not path or not os.path.exists(path):
+        return
+    with open(path, 'r+b') as state:
+        fcntl.flock(state, fcntl.LOCK_EX)
+        try:
+            with mmap.mmap(state.fileno(), 0) as shared:
+                magic, count = HEADER.unpack_from(shared, 0)
+                if magic != MAGIC:
+                    return
+                pids = PIDS.unpack_from(shared, HEADER.size)
+                if pid not in pids:
+                    return
+                slot = pids.index(pid)
+                for index in range(count):
+                    offset = HEADER.size + PIDS.size + index * (BUCKET.size + 2 * COUNTS.size) + BUCKET.size
+                    SLOT.pack_into(shared, offset + 4 * slot, 0)
+                    SLOT.pack_into(shared, offset + COUNTS.size + 4 * slot, 0)
+                struct.pack_into('=q', shared, HEADER.size + 8 * slot, 0)
+        finally:
+            fcntl.flock(state, fcntl.LOCK_UN)
@@ -1,30 +1,57 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory, send_file
+from flask import Flask, Response, abort, render_template, request, jsonify, g, stream_with_context
 from flask_cors import CORS
+import asyncio
+import io
 import logging
 import os
+import threading
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-import json
 import pickle
-import joblib
 import numpy as np
 from dotenv import load_dotenv
 
+import rule_engine
+from scoring_policy import policy_store
+from translation_cache import create_translation_cache
+from translation_catalog import DEFAULT_CATALOG_PATH, TranslationCatalog
+from stub_translator import StubTranslator
+from inference import compile_model
+from encoders import MODEL_COLUMNS, FeatureEncoder, vocabularies_from_label_encoders
+from microbatch import MicroBatcher
+from model_artifacts import DEFAULT_ARTIFACTS_PATH, load_artifacts, source_fingerprint
+from response_cache import CachedResponse, ResponseCache
+from result_cache import create_result_cache
+from admission import create_admission_control, request_queue_time
+from static_assets import StaticAssets
+import schemas
+from json_codec import FastJSONProvider, dumps as json_dumps
+import amortization
+from counterfactual import CounterfactualSearch
+from bulk_score import DEFAULT_CHUNK_SIZE, FORMATS, MIMETYPES, ChunkScorer, csv_header, read_records, score_stream
+from metrics import exposition, metrics
+from profiling import profiler
+import log_pipeline
+from log_pipeline import configure_logging, request_logger
+
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging: JSON lines (LOG_FORMAT=text for the classic format),
+# formatted and written by a background thread unless LOG_ASYNC=false
 log_level = os.getenv('LOG_LEVEL', 'INFO')
-logging.basicConfig(
-    level=getattr(logging, log_level),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
+configure_logging(
+    level=log_level,
+    fmt=os.getenv('LOG_FORMAT', 'json'),
+    asynchronous=os.getenv('LOG_ASYNC', 'true').lower() == 'true',
+    request_sample_rate=float(os.getenv('LOG_REQUEST_SAMPLE_RATE', '1'))
 )
 
 # Configure Flask app with static file serving
 static_folder = os.path.join('Loan_Approval', 'project', 'dist')
 app = Flask(__name__, static_folder=static_folder)
+app.json = FastJSONProvider(app)
 
 # Enable CORS for React frontend - Use environment variable for production
 allowed_origins = os.getenv('ALLOWED_ORIGINS', 'http://localhost:5173,http://localhost:3000').split(',')
@@ -52,21 +79,153 @@ try:
         
         def __init__(self):
             self.logger = logging.getLogger(__name__)
+            self.cache = create_translation_cache()
+            self.catalog = TranslationCatalog.load(os.getenv('TRANSLATION_CATALOG_PATH', DEFAULT_CATALOG_PATH))
+            self.backend_name = os.getenv('TRANSLATOR_BACKEND', 'google')
+            self.stub_latency = float(os.getenv('TRANSLATOR_STUB_LATENCY_MS', '0')) / 1000
+            # translate_dict fans out over this many threads (1 = sequential)
+            self.concurrency = int(os.getenv('TRANSLATION_CONCURRENCY', '8'))
+            # Seconds a translate_dict call may wait before falling back to English
+            self.deadline = float(os.getenv('TRANSLATION_DEADLINE', '5'))
+            self.timeouts = 0
+            self._backends = threading.local()
+            self._pool = None
+            self._pool_pid = None
         
-        def translate(self, text, target_lang="en"):
+        def _backend(self, target_lang):
+            # One translator per target language (and thread, since
+            # GoogleTranslator keeps per-call state) instead of one per call
+            backends = getattr(self._backends, 'by_lang', None)
+            if backends is None:
+                backends = self._backends.by_lang = {}
+            backend = backends.get(target_lang)
+            if backend is None:
+                if self.backend_name == 'stub':
+                    backend = StubTranslator(source="auto", target=target_lang, latency=self.stub_latency)
+                else:
+                    backend = GoogleTranslator(source="auto", target=target_lang)
+                backends[target_lang] = backend
+            return backend
+        
+        def _lookup(self, text, target_lang, record=True):
+            """Translation from the precomputed catalog or the cache, or None"""
+            # Static strings are pre-translated offline
+            translated = self.catalog.get(text, target_lang)
+            if not record:
+                return translated if translated is not None else self.cache.get(text, target_lang)
+            if translated is not None:
+                metrics.inc('translations', 'catalog')
+                return translated
+            return self._record_lookup(self.cache.get(text, target_lang))
+        
+        async def _alookup(self, text, target_lang):
+            """_lookup for the event loop: the shared SQLite tier is read in a thread"""
+            translated = self.catalog.get(text, target_lang)
+            if translated is not None:
+                metrics.inc('translations', 'catalog')
+                return translated
+            translated = self.cache.get(text, target_lang, shared=False)
+            if translated is None and self.cache.disk is not None:
+                translated = await asyncio.to_thread(self.cache.get_shared, text, target_lang)
+            return self._record_lookup(translated)
+        
+        def _record_lookup(self, translated):
+            if translated is not None:
+                metrics.inc('translations', 'cache')
+                metrics.inc('cache_requests', 'translation', 'hit')
+            else:
+                metrics.inc('cache_requests', 'translation', 'miss')
+            return translated
+        
+        def _translate_remote(self, text, target_lang):
+            """Call the translation backend and cache the result (may raise)"""
+            translated = self._backend(target_lang).translate(text)
+            metrics.inc('translations', 'remote')
+            if translated:
+                self.cache.set(text, target_lang, translated)
+            return translated
+        
+        def translate(self, text, target_lang="en", deadline=None):
             if not text or target_lang == "en" or not isinstance(text, str):
                 return text
-                
+            
+            started = perf_counter()
+            cached = self._lookup(text, target_lang)
+            if cached is not None:
+                metrics.observe('translate', 'lookup', perf_counter() - started)
+                return cached
+            
             try:
-                return GoogleTranslator(source="auto", target=target_lang).translate(text)
-            except Exception as e:
-                self.logger.error(f"Translation error: {str(e)}")
-                return text
+                if self.concurrency > 1:
+                    # Run on the pool so a slow upstream is bounded by the deadline
+                    return self._translate_pending([text], target_lang, deadline)[text]
+                    
+                try:
+                    return self._translate_remote(text, target_lang)
+                except Exception as e:
+                    metrics.inc('translations', 'error')
+                    self.logger.error(f"Translation error: {str(e)}")
+                    return text
+            finally:
+                metrics.observe('translate', 'remote', perf_counter() - started)
         
-        def translate_dict(self, data_dict, target_lang="en", keys_to_translate=None):
-            if target_lang == "en":
-                return data_dict
-                
+        def after_fork(self):
+            """Drop the thread pool and backends inherited from a forking parent"""
+            self._backends = threading.local()
+            self._pool = None
+            self._pool_pid = None
+        
+        def _executor(self):
+            # Created lazily per process: thread pools do not survive fork()
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='translate')
+                self._pool_pid = os.getpid()
+            return self._pool
+        
+        def translate_many(self, texts, target_lang, deadline=None):
+            """Translate distinct texts concurrently; returns {text: translation}
+            
+            Texts not translated within ``deadline`` seconds (or whose
+            translation fails) map to themselves, i.e. fall back to English.
+            """
+            translations = {}
+            pending = []
+            for text in dict.fromkeys(texts):
+                cached = self._lookup(text, target_lang)
+                if cached is not None:
+                    translations[text] = cached
+                else:
+                    pending.append(text)
+            if pending:
+                translations.update(self._translate_pending(pending, target_lang, deadline))
+            return translations
+        
+        def _translate_pending(self, pending, target_lang, deadline=None):
+            """Backend translations for texts already known to miss the catalog and cache"""
+            translations = {}
+            deadline = self.deadline if deadline is None else deadline
+            executor = self._executor()
+            futures = {executor.submit(self._translate_remote, text, target_lang): text for text in pending}
+            done, not_done = wait(futures, timeout=deadline)
+            
+            for future in done:
+                text = futures[future]
+                try:
+                    translations[text] = future.result()
+                except Exception as e:
+                    metrics.inc('translations', 'error')
+                    self.logger.error(f"Translation error: {str(e)}")
+                    translations[text] = text
+            if not_done:
+                # Late results still land in the cache when they complete
+                self.timeouts += len(not_done)
+                metrics.inc('translations', 'timeout', amount=len(not_done))
+                self.logger.warning(f"Translation deadline of {deadline}s exceeded for {len(not_done)} of {len(pending)} strings ({target_lang})")
+                for future in not_done:
+                    translations[futures[future]] = futures[future]
+            return translations
+        
+        def _walk(self, data_dict, translate, keys_to_translate=None):
             result = {}
             for key, value in data_dict.items():
                 if keys_to_translate and key not in keys_to_translate:
@@ -74,21 +233,108 @@ try:
                     continue
                     
                 if isinstance(value, str):
-                    result[key] = self.translate(value, target_lang)
+                    result[key] = translate(value)
                 elif isinstance(value, list):
                     result[key] = [
-                        self.translate_dict(item, target_lang) if isinstance(item, dict) 
-                        else self.translate(item, target_lang) if isinstance(item, str)
+                        self._walk(item, translate) if isinstance(item, dict) 
+                        else translate(item) if isinstance(item, str)
                         else item
                         for item in value
                     ]
                 elif isinstance(value, dict):
-                    result[key] = self.translate_dict(value, target_lang)
+                    result[key] = self._walk(value, translate)
                 else:
                     result[key] = value
                     
             return result
         
+        def translate_dict(self, data_dict, target_lang="en", keys_to_translate=None, deadline=None):
+            if target_lang == "en":
+                return data_dict
+            
+            if self.concurrency <= 1:
+                return self._walk(data_dict, lambda text: self.translate(text, target_lang), keys_to_translate)
+            
+            # Collect every translatable leaf, translate the distinct ones in
+            # parallel, then rebuild the same structure from the results
+            leaves = []
+            self._walk(data_dict, lambda text: leaves.append(text) if text else None, keys_to_translate)
+            translations = self.translate_many([text for text in leaves if text], target_lang, deadline)
+            return self._walk(data_dict, lambda text: translations.get(text, text), keys_to_translate)
+        
+        def translate_offline(self, text, target_lang="en"):
+            """Catalog or cached translation only, never waiting on the backend; English otherwise"""
+            if not text or target_lang == "en" or not isinstance(text, str):
+                return text
+            translated = self._lookup(text, target_lang)
+            return text if translated is None else translated
+        
+        def translate_dict_offline(self, data_dict, target_lang="en", keys_to_translate=None):
+            """translate_dict for overloaded workers: no backend calls, untranslated strings stay English"""
+            if target_lang == "en":
+                return data_dict
+            return self._walk(data_dict, lambda text: self.translate_offline(text, target_lang), keys_to_translate)
+        
+        async def _atranslate_remote(self, text, target_lang):
+            backend = self._backend(target_lang)
+            if hasattr(backend, 'atranslate'):
+                translated = await backend.atranslate(text)
+                metrics.inc('translations', 'remote')
+                if translated and self.cache.disk is not None:
+                    await asyncio.to_thread(self.cache.set, text, target_lang, translated)
+                elif translated:
+                    self.cache.set(text, target_lang, translated)
+                return translated
+            # Blocking HTTP client: keep it off the event loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor(), self._translate_remote, text, target_lang)
+        
+        async def atranslate(self, text, target_lang="en", deadline=None):
+            """Async translate: awaits backend I/O, bounded by the deadline"""
+            if not text or target_lang == "en" or not isinstance(text, str):
+                return text
+            
+            cached = await self._alookup(text, target_lang)
+            if cached is not None:
+                return cached
+            
+            deadline = self.deadline if deadline is None else deadline
+            try:
+                return await asyncio.wait_for(self._atranslate_remote(text, target_lang), deadline)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                metrics.inc('translations', 'timeout')
+                self.logger.warning(f"Translation deadline of {deadline}s exceeded ({target_lang})")
+                return text
+            except Exception as e:
+                metrics.inc('translations', 'error')
+                self.logger.error(f"Translation error: {str(e)}")
+                return text
+        
+        async def atranslate_dict(self, data_dict, target_lang="en", keys_to_translate=None, deadline=None):
+            """Async translate_dict: all distinct leaves are awaited concurrently"""
+            if target_lang == "en":
+                return data_dict
+            
+            leaves = []
+            self._walk(data_dict, lambda text: leaves.append(text) if text else None, keys_to_translate)
+            texts = list(dict.fromkeys(leaves))
+            translated = await asyncio.gather(*(self.atranslate(text, target_lang, deadline) for text in texts))
+            translations = dict(zip(texts, translated))
+            return self._walk(data_dict, lambda text: translations.get(text, text), keys_to_translate)
+        
+        def fully_translated(self, data_dict, target_lang, keys_to_translate=None):
+            """True if every translatable string now has a catalog or cached translation"""
+            if target_lang == "en":
+                return True
+            missing = []
+            self._walk(
+                data_dict,
+                lambda text: missing.append(text) if text and self._lookup(text, target_lang, record=False) is None else None,
+                keys_to_translate
+            )
+            return not missing
+        
         def get_languages(self):
             return self.LANGUAGES.copy()
 
@@ -114,6 +360,24 @@ except ImportError:
         def translate_dict(self, data_dict, target_lang="en", keys_to_translate=None):
             return data_dict
         
+        def translate_offline(self, text, target_lang="en"):
+            return text
+        
+        def translate_dict_offline(self, data_dict, target_lang="en", keys_to_translate=None):
+            return data_dict
+        
+        def fully_translated(self, data_dict, target_lang, keys_to_translate=None):
+            return True
+        
+        def after_fork(self):
+            pass
+        
+        async def atranslate(self, text, target_lang="en", deadline=None):
+            return text
+        
+        async def atranslate_dict(self, data_dict, target_lang="en", keys_to_translate=None, deadline=None):
+            return data_dict
+        
         def get_languages(self):
             return self.LANGUAGES
 
@@ -123,39 +387,61 @@ class LoanCalculator:
     """Advanced loan eligibility calculator with ML model integration"""
     
     def __init__(self):
+        self.model = None
+        self.label_encoders = None
+        self.encoder = None
+        self.engine = None
+        self.model_version = None
+        self.batcher = None
         try:
-            # Load the ML model and label encoders
-            self.model = joblib.load('loan_model.pkl')
-            self.label_encoders = joblib.load('label_encoders.pkl')
-            logger.info("Successfully loaded ML model and label encoders")
+            # Prefer the exported artifacts: NumPy only, coefficients shared via mmap
+            artifacts = load_artifacts(os.getenv('MODEL_ARTIFACTS_PATH', DEFAULT_ARTIFACTS_PATH))
+            if artifacts is not None:
+                self.encoder = artifacts.encoder
+                self.engine = artifacts.engine
+                self.model_version = artifacts.fingerprint
+                logger.info(f"Loaded model artifacts {self.model_version}")
+            else:
+                self._load_pickles()
+            self.approved_class = self.encoder.approved_class
+            # auto: only sklearn-backed engines have per-call overhead worth amortizing
+            microbatch = os.getenv('ML_MICROBATCH', 'auto').lower()
+            if microbatch == 'true' or (microbatch == 'auto' and self.engine.kind == 'sklearn'):
+                self.batcher = MicroBatcher(
+                    self.get_ml_predictions,
+                    self._predict_one,
+                    window=float(os.getenv('ML_BATCH_WINDOW_MS', '2')) / 1000,
+                    max_batch=int(os.getenv('ML_BATCH_MAX_SIZE', '64'))
+                )
         except Exception as e:
             logger.error(f"Error loading ML models: {str(e)}")
             self.model = None
             self.label_encoders = None
+            self.encoder = None
+            self.engine = None
+    
+    def _load_pickles(self):
+        """Fallback: unpickle the sklearn model and label encoders"""
+        import joblib
+        
+        # Load the ML model and label encoders
+        self.model = joblib.load('loan_model.pkl')
+        self.label_encoders = joblib.load('label_encoders.pkl')
+        # Encoders become dict lookups keyed by the model's own column order
+        self.encoder = FeatureEncoder(
+            vocabularies_from_label_encoders(self.label_encoders),
+            getattr(self.model, 'feature_names_in_', MODEL_COLUMNS)
+        )
+        # Coefficients are extracted once; requests skip sklearn's validation
+        self.engine = compile_model(self.model, positive_class=self.encoder.approved_class)
+        self.model_version = source_fingerprint()
+        logger.info("Successfully loaded ML model and label encoders")
     
     def preprocess_data(self, data):
         """Preprocess input data for ML model prediction"""
         try:
-            # Create a copy of the data to avoid modifying the original
-            processed_data = data.copy()
-            
-            # Apply label encoding to categorical variables
-            for column, encoder in self.label_encoders.items():
-                if column in processed_data:
-                    processed_data[column] = encoder.transform([processed_data[column]])[0]
-            
             # Convert to numpy array and reshape for prediction
-            features = np.array([[
-                processed_data.get('bank_balance', 0),
-                processed_data.get('cibil_score', 0),
-                processed_data.get('loan_amount', 0),
-                processed_data.get('monthly_income', 0),
-                processed_data.get('loan_tenure', 0),
-                processed_data.get('emi_existing', 0),
-                processed_data.get('age', 0),
-                processed_data.get('employment_type', ''),
-                processed_data.get('income_source', '')
-            ]])
+            features = np.array([self.encoder.encode_row(data)])
             
             return features
         except Exception as e:
@@ -164,229 +450,225 @@ class LoanCalculator:
     
     def get_ml_prediction(self, data):
         """Get prediction from ML model"""
+        if self.batcher is not None and self.engine is not None:
+            # Concurrent callers are coalesced into one vectorized prediction
+            try:
+                return self.batcher.submit(data)
+            except Exception as e:
+                metrics.inc('ml_fallbacks', 'predict_error')
+                logger.error(f"Error getting ML prediction: {str(e)}")
+                return None
+        return self._predict_one(data)
+    
+    def _predict_one(self, data):
+        """Predict a single application without batching"""
         try:
-            if self.model is None:
+            if self.engine is None:
+                metrics.inc('ml_fallbacks', 'no_model')
                 return None
                 
-            features = self.preprocess_data(data)
-            if features is None:
+            try:
+                row = self.encoder.encode_row(data)
+            except Exception as e:
+                metrics.inc('ml_fallbacks', 'encode_error')
+                logger.error(f"Error preprocessing data: {str(e)}")
                 return None
                 
-            # Get prediction probability
-            prediction_proba = self.model.predict_proba(features)[0]
-            prediction = self.model.predict(features)[0]
+            # Class and approval probability come from one decision value
+            label, probability = self.engine.predict_one(row)
             
             return {
-                'prediction': int(prediction),
-                'probability': float(prediction_proba[1])  # Probability of approval
+                'prediction': int(label == self.approved_class),
+                'probability': float(probability)  # Probability of approval
             }
         except Exception as e:
+            metrics.inc('ml_fallbacks', 'predict_error')
             logger.error(f"Error getting ML prediction: {str(e)}")
             return None
     
+    def get_ml_predictions(self, applications):
+        """Get predictions for many applications with a single model call"""
+        predictions = [None] * len(applications)
+        if not applications:
+            return predictions
+        if self.engine is None:
+            metrics.inc('ml_fallbacks', 'no_model', amount=len(applications))
+            return predictions
+        
+        try:
+            # Encode column by column, then one engine call for the whole batch
+            features, row_indexes = self.encoder.encode_rows(applications)
+            if len(row_indexes) < len(applications):
+                metrics.inc('ml_fallbacks', 'encode_error', amount=len(applications) - len(row_indexes))
+            if not row_indexes:
+                return predictions
+            labels, probabilities = self.engine.predict(features)
+        except Exception as e:
+            metrics.inc('ml_fallbacks', 'predict_error', amount=len(applications))
+            logger.error(f"Error getting batch ML prediction: {str(e)}")
+            return predictions
+        
+        for index, label, proba in zip(row_indexes, labels.tolist(), probabilities.tolist()):
+            predictions[index] = {
+                'prediction': int(label == self.approved_class),
+                'probability': proba
+            }
+        return predictions
+    
     def calculate_eligibility(self, data):
         """Calculate loan eligibility with ML model integration"""
         # Get ML model prediction
+        started = perf_counter()
         ml_prediction = self.get_ml_prediction(data)
+        scored = perf_counter()
+        result = self.score_application(data, ml_prediction)
+        metrics.observe('calculate_eligibility', 'ml', scored - started)
+        metrics.observe('calculate_eligibility', 'rules', perf_counter() - scored)
+        return result
+    
+    def calculate_eligibility_batch(self, applications, language=None):
+        """Calculate eligibility for many applications in one vectorized ML pass
         
-        # Original eligibility calculation
-        bank_balance = float(data.get('bank_balance', 0))
-        cibil_score = int(data.get('cibil_score', 0))
-        loan_amount = float(data.get('loan_amount', 0))
-        monthly_income = float(data.get('monthly_income', 0))
-        loan_tenure = int(data.get('loan_tenure', 0))
-        existing_loans = data.get('existing_loans', 'No')
-        emi_existing = float(data.get('emi_existing', 0))
-        age = int(data.get('age', 0))
-        employment_type = data.get('employment_type', '')
-        income_source = data.get('income_source', '')
-        
-        eligibility_score = 0
-        reasons = []
-        criteria_scores = {}
-        
-        # CIBIL Score Analysis (40 points max)
-        if cibil_score >= 800:
-            cibil_points = 40
-            criteria_scores['CIBIL Score'] = 'Excellent'
-        elif cibil_score >= 750:
-            cibil_points = 35
-            criteria_scores['CIBIL Score'] = 'Very Good'
-        elif cibil_score >= 700:
-            cibil_points = 25
-            criteria_scores['CIBIL Score'] = 'Good'
-            reasons.append("CIBIL score is good but could be improved")
-        elif cibil_score >= 650:
-            cibil_points = 15
-            criteria_scores['CIBIL Score'] = 'Fair'
-            reasons.append("CIBIL score needs improvement")
-        else:
-            cibil_points = 0
-            criteria_scores['CIBIL Score'] = 'Poor'
-            reasons.append("Low CIBIL score significantly affects approval")
-        
-        eligibility_score += cibil_points
-        
-        # Income Analysis (25 points max)
-        income_multiplier = 60  # Standard multiplier for loan amount
-        max_eligible_amount = monthly_income * income_multiplier
-        
-        if loan_amount <= max_eligible_amount * 0.7:
-            income_points = 25
-            criteria_scores['Income Analysis'] = 'Excellent'
-        elif loan_amount <= max_eligible_amount:
-            income_points = 20
-            criteria_scores['Income Analysis'] = 'Good'
-        elif loan_amount <= max_eligible_amount * 1.2:
-            income_points = 10
-            criteria_scores['Income Analysis'] = 'Moderate'
-            reasons.append("Requested amount is high relative to income")
-        else:
-            income_points = 0
-            criteria_scores['Income Analysis'] = 'Poor'
-            reasons.append("Requested amount exceeds income capacity")
-        
-        eligibility_score += income_points
-        
-        # EMI to Income Ratio (20 points max)
-        interest_rate = 0.12 / 12  # 12% annual rate
-        estimated_emi = loan_amount * interest_rate * (1 + interest_rate) ** loan_tenure / ((1 + interest_rate) ** loan_tenure - 1)
-        total_emi = estimated_emi + emi_existing
-        emi_ratio = (total_emi / monthly_income) * 100
-        
-        if emi_ratio <= 30:
-            emi_points = 20
-            criteria_scores['EMI Ratio'] = 'Excellent'
-        elif emi_ratio <= 40:
-            emi_points = 15
-            criteria_scores['EMI Ratio'] = 'Good'
-        elif emi_ratio <= 50:
-            emi_points = 10
-            criteria_scores['EMI Ratio'] = 'Moderate'
-            reasons.append("EMI to income ratio is on the higher side")
-        elif emi_ratio <= 60:
-            emi_points = 5
-            criteria_scores['EMI Ratio'] = 'High'
-            reasons.append("High EMI to income ratio affects approval")
-        else:
-            emi_points = 0
-            criteria_scores['EMI Ratio'] = 'Very High'
-            reasons.append("EMI to income ratio is too high")
-        
-        eligibility_score += emi_points
-        
-        # Bank Balance Analysis (10 points max)
-        required_balance = loan_amount * 0.1  # 10% of loan amount
-        if bank_balance >= required_balance * 2:
-            balance_points = 10
-            criteria_scores['Bank Balance'] = 'Excellent'
-        elif bank_balance >= required_balance:
-            balance_points = 8
-            criteria_scores['Bank Balance'] = 'Good'
-        elif bank_balance >= required_balance * 0.5:
-            balance_points = 5
-            criteria_scores['Bank Balance'] = 'Moderate'
-            reasons.append("Bank balance could be higher")
-        else:
-            balance_points = 0
-            criteria_scores['Bank Balance'] = 'Low'
-            reasons.append("Insufficient bank balance for loan security")
-        
-        eligibility_score += balance_points
-        
-        # Age Factor (5 points max)
-        if 25 <= age <= 35:
-            age_points = 5
-            criteria_scores['Age Factor'] = 'Optimal'
-        elif 21 <= age <= 45:
-            age_points = 4
-            criteria_scores['Age Factor'] = 'Good'
-        elif 18 <= age <= 55:
-            age_points = 3
-            criteria_scores['Age Factor'] = 'Acceptable'
-        else:
-            age_points = 1
-            criteria_scores['Age Factor'] = 'Risky'
-            reasons.append("Age factor affects loan tenure and approval")
-        
-        eligibility_score += age_points
-        
-        # Employment Stability Bonus
-        if employment_type in ['Permanent', 'Government']:
-            eligibility_score += 5
-            criteria_scores['Employment'] = 'Stable'
-        elif employment_type in ['Contract']:
-            eligibility_score += 2
-            criteria_scores['Employment'] = 'Moderate'
-        else:
-            criteria_scores['Employment'] = 'Variable'
-            reasons.append("Employment type affects stability assessment")
+        Returns one entry per application, in order. Each entry is either
+        {'success': True, 'result': {...}} or {'success': False, 'error': '...'},
+        so a bad row never fails the whole batch. With a batch ``language``,
+        successful entries also carry the row's validated 'language' (the
+        batch language when the row leaves it blank).
+        """
+        defaults = {'language': language} if language else None
+        entries = [None] * len(applications)
+        # Parse every row up front so bad values only fail their own row
+        cleaned = []
+        scored_indexes = []
+        for index, data in enumerate(applications):
+            try:
+                cleaned.append(application_schema.parse(data, defaults))
+                scored_indexes.append(index)
+            except schemas.SchemaError as e:
+                entries[index] = e.response()
         
-        # Incorporate ML model prediction into final decision
-        if ml_prediction:
-            ml_confidence = ml_prediction['probability']
-            ml_decision = ml_prediction['prediction']
-            
-            # Adjust eligibility score based on ML prediction
-            if ml_decision == 1:  # If ML model predicts approval
-                eligibility_score = min(eligibility_score + (ml_confidence * 20), 100)
-            else:  # If ML model predicts rejection
-                eligibility_score = max(eligibility_score - ((1 - ml_confidence) * 20), 0)
-            
-            criteria_scores['ML Model Prediction'] = f"{'Approved' if ml_decision == 1 else 'Rejected'} (Confidence: {ml_confidence:.2%})"
-        
-        # Determine final status
-        if eligibility_score >= 80:
-            status = "Approved"
-            status_class = "success"
-            recommendation = "Congratulations! Your loan application is approved."
-        elif eligibility_score >= 60:
-            status = "Conditionally Approved"
-            status_class = "warning"
-            recommendation = "Your loan may be approved with additional documentation or conditions."
-        elif eligibility_score >= 40:
-            status = "Under Review"
-            status_class = "info"
-            recommendation = "Your application requires manual review. Please provide additional documents."
-        else:
-            status = "Rejected"
-            status_class = "danger"
-            recommendation = "Unfortunately, your loan application doesn't meet current criteria."
-        
-        result = {
-            'status': status,
-            'status_class': status_class,
-            'eligibility_score': min(eligibility_score, 100),
-            'estimated_emi': round(estimated_emi, 2),
-            'emi_ratio': round(emi_ratio, 2),
-            'reasons': reasons,
-            'criteria_scores': criteria_scores,
-            'recommendation': recommendation,
-            'loan_details': {
-                'amount': loan_amount,
-                'tenure': loan_tenure,
-                'estimated_interest_rate': 12.0,
-                'processing_fee': round(loan_amount * 0.01, 2),  # 1% processing fee
-                'total_payable': round(estimated_emi * loan_tenure, 2)
-            }
-        }
+        rows = [rule_engine.coerce_application(data) for data in cleaned]
+        ml_predictions = self.get_ml_predictions(cleaned)
+        evaluation = rule_engine.evaluate(rule_engine.columns_from_rows(rows), ml_predictions)
         
-        # Add ML prediction details if available
-        if ml_prediction:
-            result['ml_prediction'] = {
-                'prediction': 'Approved' if ml_prediction['prediction'] == 1 else 'Rejected',
-                'confidence': ml_prediction['probability']
-            }
+        for position, index in enumerate(scored_indexes):
+            try:
+                entries[index] = {'success': True, 'result': evaluation.result(position)}
+                if language:
+                    entries[index]['language'] = cleaned[position]['language']
+            except ValueError as e:
+                logger.error(f"Validation error in batch row {index}: {str(e)}")
+                entries[index] = {'success': False, 'error': 'Invalid input data provided'}
         
-        return result
+        return entries
+    
+    def score_application(self, data, ml_prediction=None):
+        """Score one application given an (optional) precomputed ML prediction"""
+        columns = rule_engine.columns_from_rows([rule_engine.coerce_application(data)])
+        return rule_engine.evaluate(columns, [ml_prediction]).result(0)
+
+# Result fields that are translated for non-English requests
+TRANSLATEABLE_RESULT_KEYS = ['status', 'reasons', 'recommendation']
+
+# Upper bound on applications accepted by a single batch request
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '5000'))
+
+# Upper bounds on amortization grids: any request, and non-streamed schedules
+MAX_AMORTIZATION_SCENARIOS = int(os.getenv('MAX_AMORTIZATION_SCENARIOS', '20000'))
+MAX_INLINE_SCHEDULES = int(os.getenv('MAX_INLINE_SCHEDULES', '500'))
+
+JSON_FLAGS = {True: True, False: False, 'true': True, 'false': False, '1': True, '0': False, 1: True, 0: False}
+
+def json_flag(data, key, default):
+    """A boolean request option; JSON booleans, 0/1 and "true"/"false" strings"""
+    value = data.get(key, default)
+    if isinstance(value, str):
+        value = value.strip().lower()
+    try:
+        return JSON_FLAGS[value]
+    except (KeyError, TypeError):
+        raise ValueError(f'{key} must be true or false')
+
+# Request schemas: parse and coerce every field in one pass
+LANGUAGE_CODES = tuple(Translator.LANGUAGES.values())
+application_schema = schemas.application_schema(LANGUAGE_CODES)
+batch_schema = schemas.batch_schema(LANGUAGE_CODES)
+translate_schema = schemas.translate_schema(LANGUAGE_CODES)
+chatbot_schema = schemas.chatbot_schema(LANGUAGE_CODES)
+
+def validate_application(data):
+    """Return the first field error message, otherwise None"""
+    error = application_schema.errors(data)
+    return error.message if error else None
 
 # Create a single instance of LoanCalculator
 loan_calculator = LoanCalculator()
 
+# "What would get me approved" queries, batched over the same scoring path
+counterfactuals = CounterfactualSearch(
+    loan_calculator.get_ml_predictions,
+    sweep=int(os.getenv('COUNTERFACTUAL_SWEEP', '64')),
+    max_evaluations=int(os.getenv('COUNTERFACTUAL_MAX_EVALUATIONS', '4096')),
+    time_budget=float(os.getenv('COUNTERFACTUAL_TIME_BUDGET_MS', '50')) / 1000
+)
+
+# Translated results of repeated submissions (None if disabled)
+result_cache = create_result_cache()
+
+# Per-endpoint rate and concurrency limits, shared across workers (see admission.py)
+admission_control = create_admission_control()
+
+# Guarded routes -> admission control endpoint
+ADMISSION_ROUTES = {
+    '/calculate_loan': 'calculate_loan',
+    '/api/calculate_loan': 'calculate_loan',
+    '/calculate_loan/batch': 'calculate_loan_batch',
+    '/api/calculate_loan/batch': 'calculate_loan_batch',
+    '/counterfactual': 'counterfactual',
+    '/api/counterfactual': 'counterfactual',
+    '/translate': 'translate',
+    '/api/translate': 'translate',
+    '/chatbot': 'chatbot',
+    '/api/chatbot': 'chatbot',
+}
+
+ADMISSION_ERRORS = {
+    429: 'Too many requests, please retry later',
+    503: 'Service overloaded, please retry later',
+}
+
+def record_admission(endpoint, ticket):
+    """Count an admission decision; returns (body, status, Retry-After) for a rejection, else None"""
+    if ticket.admitted:
+        metrics.inc('admission', endpoint, 'admitted')
+        metrics.observe('admission', endpoint, ticket.waited)
+        if ticket.reason == 'queued':
+            metrics.inc('admission', endpoint, 'queued')
+        if ticket.degraded:
+            metrics.inc('admission', endpoint, 'degraded')
+        return None
+    metrics.inc('admission', endpoint, ticket.reason)
+    return {'success': False, 'error': ADMISSION_ERRORS[ticket.status]}, ticket.status, str(ticket.retry_after)
+
+def result_cache_key(data, target_lang):
+    """Result cache key of a validated application, or None if it is not cached"""
+    if result_cache is None:
+        return None
+    return result_cache.key(data, target_lang, loan_calculator.model_version, policy_store.current().version)
+
 # Loan-focused chatbot class
 class LoanChatbot:
     """Loan-focused chatbot for customer support"""
     
+    LOAN_KEYWORDS = [
+        "loan", "credit", "cibil", "emi", "interest", "bank", "finance", 
+        "money", "borrow", "lending", "approval", "eligible", "document",
+        "income", "salary", "amount", "tenure", "repay", "installment",
+        "mortgage", "personal", "business", "car", "home", "education"
+    ]
+    
+    GREETINGS = ["hello", "hi", "hey", "start", "help"]
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
@@ -436,87 +718,223 @@ class LoanChatbot:
             "off_topic": "I'm specialized in helping with loan-related queries only. Please ask me about loans, CIBIL scores, EMI calculations, loan eligibility, or related financial topics. How can I assist you with your loan needs?",
             "default": "I'd be happy to help with your loan questions! You can ask me about eligibility criteria, CIBIL scores, required documents, interest rates, or try our loan eligibility calculator above."
         }
+        
+        self.error_response = "I'm having trouble right now. Please try asking about loan eligibility, CIBIL scores, or use our loan calculator above."
+        
+        self._routes = self._build_routes()
+        self._keywords = self._build_keyword_table()
+        self.responses = ResponseCache()
+    
+    def static_strings(self):
+        """Every canned response this chatbot can return"""
+        strings = [data["response"] for data in self.loan_knowledge.values()]
+        strings.extend(self.general_responses.values())
+        return strings
+    
+    def _build_routes(self):
+        """Keyword tuples in routing order, for one short-circuiting scan"""
+        topics = tuple((topic, tuple(data["keywords"])) for topic, data in self.loan_knowledge.items())
+        return tuple(self.LOAN_KEYWORDS), tuple(self.GREETINGS), topics
+    
+    def _build_keyword_table(self):
+        """(keyword, kind, intent) for every keyword, for ``matches``"""
+        loan_keywords, greetings, topics = self._routes
+        table = [(keyword, 'loan', None) for keyword in loan_keywords]
+        table.extend((greeting, 'greeting', 'greeting') for greeting in greetings)
+        table.extend((keyword, 'topic', topic) for topic, keywords in topics for keyword in keywords)
+        return tuple(table)
+    
+    def match(self, message, with_matches=False):
+        """Resolve a message's intent: {'intent', 'is_loan_related'}
+        
+        Off-topic unless a loan keyword occurs, then greeting, then the first
+        topic (in knowledge-base order), then default. Each keyword is a
+        C-level substring search that stops at the first hit; on long pasted
+        messages that beats any per-character Python scan. ``with_matches``
+        adds 'matches', every keyword hit (see ``matches``).
+        """
+        if with_matches:
+            result = self.match(message)
+            result['matches'] = self.matches(message)
+            return result
+        message_lower = message.lower()
+        loan_keywords, greetings, topics = self._routes
+        for keyword in loan_keywords:
+            if keyword in message_lower:
+                break
+        else:
+            return {'intent': 'off_topic', 'is_loan_related': False}
+        for greeting in greetings:
+            if greeting in message_lower:
+                return {'intent': 'greeting', 'is_loan_related': True}
+        for topic, keywords in topics:
+            for keyword in keywords:
+                if keyword in message_lower:
+                    return {'intent': topic, 'is_loan_related': True}
+        return {'intent': 'default', 'is_loan_related': True}
+    
+    def matches(self, message):
+        """Every keyword occurrence, ordered by position
+        
+        Each hit is {'keyword', 'kind', 'intent', 'start', 'end'}: ``kind`` is
+        'loan', 'greeting' or 'topic', ``intent`` the intent the keyword routes
+        to (None for the loan keywords, which only gate routing). Positions are
+        offsets into the lowercased message.
+        """
+        message_lower = message.lower()
+        hits = []
+        for keyword, kind, intent in self._keywords:
+            start = message_lower.find(keyword)
+            while start != -1:
+                hits.append({'keyword': keyword, 'kind': kind, 'intent': intent, 'start': start, 'end': start + len(keyword)})
+                start = message_lower.find(keyword, start + 1)
+        hits.sort(key=lambda hit: (hit['start'], hit['end']))
+        return hits
     
     def is_loan_related(self, message):
         """Check if the message is loan-related"""
-        loan_keywords = [
-            "loan", "credit", "cibil", "emi", "interest", "bank", "finance", 
-            "money", "borrow", "lending", "approval", "eligible", "document",
-            "income", "salary", "amount", "tenure", "repay", "installment",
-            "mortgage", "personal", "business", "car", "home", "education"
-        ]
+        return self.match(message)['is_loan_related']
+    
+    def response_for_intent(self, intent):
+        """Canned (English) response for a resolved intent"""
+        if intent in self.loan_knowledge:
+            return self.loan_knowledge[intent]["response"]
+        return self.general_responses[intent]
+    
+    def select_response(self, message, match=None):
+        """Pick the (English) canned response for a message"""
+        if match is None:
+            match = self.match(message)
+        return self.response_for_intent(match['intent'])
+    
+    def intents(self):
+        """Every intent match() can resolve to"""
+        return list(self.loan_knowledge) + ['off_topic', 'greeting', 'default']
+    
+    def warm_up(self, languages):
+        """Precompute responses for all intents x languages without network calls
         
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in loan_keywords)
+        Only translations already available offline (catalog or cache) are
+        memoized here; the rest are filled on first use.
+        """
+        def resolve(intent, language):
+            response = self.response_for_intent(intent)
+            if language == "en":
+                return response
+            lookup = getattr(translator, '_lookup', None)
+            return lookup(response, language, record=False) if lookup else None
+        
+        warmed = self.responses.warm(self.intents(), languages, resolve)
+        self.logger.info(f"Chatbot response cache warmed with {warmed} entries")
+        return warmed
+    
+    def _remember(self, intent, language, english, translated):
+        # A translation that fell back to English is served but not memoized
+        if language != "en" and translated == english:
+            return CachedResponse(translated, None)
+        return self.responses.put(intent, language, translated)
+    
+    def respond(self, intent, language="en", offline=False):
+        """Memoized response for a resolved intent, as a CachedResponse
+        
+        ``offline`` answers a miss from the catalog or cache only (English
+        otherwise) instead of waiting on the translation backend.
+        """
+        cached = self.responses.get(intent, language)
+        if cached is not None:
+            metrics.inc('cache_requests', 'chatbot_response', 'hit')
+            return cached
+        metrics.inc('cache_requests', 'chatbot_response', 'miss')
+        response = self.response_for_intent(intent)
+        if language == "en":
+            translated = response
+        elif offline:
+            translated = translator.translate_offline(response, language)
+        else:
+            translated = translator.translate(response, language)
+        return self._remember(intent, language, response, translated)
+    
+    async def arespond(self, intent, language="en", offline=False):
+        """Async variant of respond that awaits translation I/O"""
+        if offline:
+            return self.respond(intent, language, offline=True)
+        cached = self.responses.get(intent, language)
+        if cached is not None:
+            metrics.inc('cache_requests', 'chatbot_response', 'hit')
+            return cached
+        metrics.inc('cache_requests', 'chatbot_response', 'miss')
+        response = self.response_for_intent(intent)
+        translated = await translator.atranslate(response, language) if language != "en" else response
+        return self._remember(intent, language, response, translated)
     
-    def get_response(self, message, language="en"):
+    def get_response(self, message, language="en", match=None):
         """Generate response for user message"""
         try:
-            message_lower = message.lower()
-            
-            # Check if message is loan-related
-            if not self.is_loan_related(message):
-                response = self.general_responses["off_topic"]
-                if language != "en":
-                    response = translator.translate(response, language)
-                return response
-            
-            # Check for greetings
-            greetings = ["hello", "hi", "hey", "start", "help"]
-            if any(greeting in message_lower for greeting in greetings):
-                response = self.general_responses["greeting"]
-                if language != "en":
-                    response = translator.translate(response, language)
-                return response
-            
-            # Check specific loan topics
-            for topic, data in self.loan_knowledge.items():
-                if any(keyword in message_lower for keyword in data["keywords"]):
-                    response = data["response"]
-                    if language != "en":
-                        response = translator.translate(response, language)
-                    return response
+            started = perf_counter()
+            if match is None:
+                match = self.match(message)
+            matched = perf_counter()
+            text = self.respond(match['intent'], language).text
+            metrics.observe('chatbot', 'match', matched - started)
+            metrics.observe('chatbot', 'respond', perf_counter() - matched)
+            return text
             
-            # Default loan-related response
-            response = self.general_responses["default"]
-            if language != "en":
-                response = translator.translate(response, language)
-            return response
+        except Exception as e:
+            self.logger.error(f"Chatbot error: {str(e)}")
+            return self.error_response
+    
+    async def aget_response(self, message, language="en", match=None):
+        """Async variant of get_response that awaits translation I/O"""
+        try:
+            if match is None:
+                match = self.match(message)
+            return (await self.arespond(match['intent'], language)).text
             
         except Exception as e:
             self.logger.error(f"Chatbot error: {str(e)}")
-            return "I'm having trouble right now. Please try asking about loan eligibility, CIBIL scores, or use our loan calculator above."
+            return self.error_response
 
 # Create chatbot instance
 loan_chatbot = LoanChatbot()
+if os.getenv('CHATBOT_WARMUP', 'true').lower() == 'true':
+    loan_chatbot.warm_up(Translator.LANGUAGES.values())
+
+def after_fork():
+    """Reset per-process state in a worker forked from a preloading master"""
+    log_pipeline.after_fork()
+    translator.after_fork()
+    metrics.after_fork()
+    admission_control.after_fork()
+    if loan_calculator.batcher is not None:
+        loan_calculator.batcher.after_fork()
+    logger.info(f"Worker {os.getpid()} forked with model {loan_calculator.model_version}, policy {policy_store.current().version}")
+
+# Browser/CDN cache lifetime for chatbot answers (seconds)
+CHATBOT_CACHE_MAX_AGE = int(os.getenv('CHATBOT_CACHE_MAX_AGE', '3600'))
+
+# Frontend build indexed once: compressed variants, ETags, index.html in memory
+static_assets = StaticAssets(static_folder)
+
+def frontend_not_built():
+    return jsonify({
+        'error': 'Frontend not built. Please run: cd Loan_Approval/project && npm run build',
+        'status': 404
+    }), 404
 
 # Serve React frontend (Single Page Application)
 @app.route('/')
 def serve_frontend():
     """Serve the React frontend"""
-    try:
-        return send_file(os.path.join(static_folder, 'index.html'))
-    except FileNotFoundError:
-        return jsonify({
-            'error': 'Frontend not built. Please run: cd Loan_Approval/project && npm run build',
-            'status': 404
-        }), 404
+    return static_assets.serve_index(request) or frontend_not_built()
 
 @app.route('/<path:path>')
 def serve_static_files(path):
     """Serve static files or fallback to React router"""
-    try:
-        # Try to serve the requested file
-        return send_from_directory(static_folder, path)
-    except FileNotFoundError:
-        # Fallback to React router for SPA routing
-        try:
-            return send_file(os.path.join(static_folder, 'index.html'))
-        except FileNotFoundError:
-            return jsonify({
-                'error': 'Frontend not built. Please run: cd Loan_Approval/project && npm run build',
-                'status': 404
-            }), 404
+    if path.startswith('api/'):
+        # Unknown API routes get the JSON 404, never the SPA shell
+        abort(404)
+    # Unknown paths are SPA routes: answered with index.html, no filesystem probe
+    return static_assets.serve(request, path) or static_assets.serve_index(request) or frontend_not_built()
 
 # API Routes with /api prefix for better organization
 @app.route('/api/calculate_loan', methods=['POST'])
@@ -524,6 +942,26 @@ def api_calculate_loan():
     """Calculate loan eligibility and status"""
     return calculate_loan()
 
+@app.route('/api/calculate_loan/batch', methods=['POST'])
+def api_calculate_loan_batch():
+    """Calculate loan eligibility for a batch of applications"""
+    return calculate_loan_batch()
+
+@app.route('/api/calculate_loan/stream', methods=['POST'])
+def api_calculate_loan_stream():
+    """Score an NDJSON or CSV upload, streaming results row by row"""
+    return calculate_loan_stream()
+
+@app.route('/api/counterfactual', methods=['POST'])
+def api_counterfactual():
+    """Values of loan_amount, loan_tenure or cibil_score that reach a better status"""
+    return counterfactual()
+
+@app.route('/api/amortization', methods=['POST'])
+def api_amortization():
+    """EMIs and amortization schedules for a grid of amounts, tenures and rates"""
+    return amortization_sweep()
+
 @app.route('/api/translate', methods=['POST'])
 def api_translate_text():
     """Translate text to selected language"""
@@ -539,36 +977,169 @@ def api_health_check():
     """Health check endpoint"""
     return health_check()
 
+def is_admin_request():
+    """Check the admin token header; admin endpoints are disabled without ADMIN_TOKEN"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    return bool(admin_token) and request.headers.get('X-Admin-Token') == admin_token
+
+@app.before_request
+def start_profile():
+    """Sample this request's stacks if it is picked (1 in PROFILE_SAMPLE_RATE) or an admin asks"""
+    forced = 'X-Profile' in request.headers and is_admin_request()
+    if profiler.should_profile(forced):
+        g.profile = profiler.start()
+
+@app.after_request
+def finish_profile(response):
+    session = g.pop('profile', None)
+    if session is not None:
+        profiler.finish(session, f'{request.method} {request.path}')
+        response.headers['X-Profile-Id'] = session.profile_id
+    return response
+
+@app.teardown_request
+def stop_profile(error=None):
+    # Requests that ended without a response still stop their sampler
+    session = g.pop('profile', None)
+    if session is not None:
+        session.stop()
+
+@app.before_request
+def admit_request():
+    """Fast-fail guarded endpoints with 429/503 and Retry-After when overloaded"""
+    endpoint = ADMISSION_ROUTES.get(request.path) if request.method == 'POST' else None
+    if endpoint is None:
+        return None
+    ticket = admission_control.admit(endpoint, request_queue_time(request.headers.get('X-Request-Start')))
+    rejection = record_admission(endpoint, ticket)
+    if rejection is not None:
+        body, status, retry_after = rejection
+        return jsonify(body), status, {'Retry-After': retry_after}
+    g.admission = ticket
+
+@app.teardown_request
+def release_admission(error=None):
+    ticket = g.pop('admission', None)
+    if ticket is not None:
+        ticket.release()
+
+def degraded_request():
+    """True if admission control asked this request not to wait on the translation backend"""
+    ticket = g.get('admission')
+    return ticket is not None and ticket.degraded
+
+@app.route('/api/admin/profiling', methods=['GET', 'POST'])
+def api_profiling():
+    """Show or change sampled request profiling for every worker"""
+    if not is_admin_request():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        try:
+            interval_ms = data.get('interval_ms')
+            settings = profiler.configure(data.get('sample_rate'), None if interval_ms is None else float(interval_ms) / 1000)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        logger.info(f"Profiling settings changed from {request.remote_addr}: {settings}")
+        return jsonify({'success': True, 'profiling': settings})
+    return jsonify({'success': True, 'profiling': profiler.stats()})
+
+@app.route('/api/admin/profiles/<profile_id>')
+def api_profile(profile_id):
+    """Collapsed stacks of one profile, for flamegraph.pl or speedscope"""
+    if not is_admin_request():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    collapsed = profiler.read(profile_id)
+    if collapsed is None:
+        return jsonify({'success': False, 'error': 'Profile not found'}), 404
+    return app.response_class(collapsed, mimetype='text/plain')
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus exposition, aggregated across gunicorn workers"""
+    body, content_type = exposition()
+    if body is None:
+        return app.response_class('prometheus_client is not installed\n', status=501, mimetype='text/plain')
+    return app.response_class(body, content_type=content_type)
+
+@app.route('/api/admin/policy/reload', methods=['POST'])
+def api_reload_policy():
+    """Recompile the scoring policy file in this worker"""
+    if not is_admin_request():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    previous_version = policy_store.current().version
+    policy = policy_store.maybe_reload(force=True)
+    logger.info(f"Scoring policy reload requested from {request.remote_addr}: {previous_version} -> {policy.version}")
+    return jsonify({'success': True, 'policy_version': policy.version, 'previous_version': previous_version})
+
 # Keep original routes for backward compatibility
 @app.route('/calculate_loan', methods=['POST'])
 def calculate_loan():
     """Calculate loan eligibility and status"""
     try:
-        data = request.get_json()
+        started = perf_counter()
+        data = request.get_json(silent=True)
+        parsed = perf_counter()
         
-        # Log the request (without sensitive data)
-        log_data = {k: v for k, v in data.items() if k not in ['bank_balance', 'monthly_income']}
-        logger.info(f"Loan calculation request from {request.remote_addr}: {json.dumps(log_data)}")
-        
-        # Validate required fields
-        required_fields = ['bank_balance', 'cibil_score', 'loan_amount', 'monthly_income', 
-                          'loan_tenure', 'age', 'employment_type', 'income_source', 'existing_loans']
-        for field in required_fields:
-            if field not in data or data[field] == '' or data[field] is None:
-                return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
+        # Coerce every field in one pass
+        try:
+            data = application_schema.parse(data)
+        except schemas.SchemaError as e:
+            return jsonify(e.response()), 400
+        validated = perf_counter()
         
-        # Calculate loan eligibility using the instance
-        result = loan_calculator.calculate_eligibility(data)
+        # Log the request (without sensitive data); serialized by the log writer thread
+        log_data = {k: v for k, v in data.items() if k not in ['bank_balance', 'monthly_income']}
+        request_logger.info("Loan calculation request from %s", request.remote_addr, extra={'application': log_data})
         
-        # Translate result if needed
-        target_lang = data.get('language', 'en')
-        if target_lang != 'en':
-            translateable_keys = ['status', 'reasons', 'recommendation']
-            result = translator.translate_dict(result, target_lang, translateable_keys)
+        # Identical submissions reuse the stored, translated result
+        target_lang = data['language']
+        cache_key = result_cache_key(data, target_lang)
+        result = result_cache.get(cache_key) if cache_key else None
+        looked_up = perf_counter()
+        degraded = False
+        if result is not None:
+            metrics.inc('cache_requests', 'result', 'hit')
+            translated = looked_up
+        else:
+            if cache_key:
+                metrics.inc('cache_requests', 'result', 'miss')
+            
+            # Calculate loan eligibility using the instance
+            result = english = loan_calculator.calculate_eligibility(data)
+            scored = perf_counter()
+            
+            # Translate result if needed; under overload only from the catalog and cache
+            if target_lang != 'en':
+                degraded = degraded_request()
+                if degraded:
+                    result = translator.translate_dict_offline(result, target_lang, TRANSLATEABLE_RESULT_KEYS)
+                else:
+                    result = translator.translate_dict(result, target_lang, TRANSLATEABLE_RESULT_KEYS)
+            translated = perf_counter()
+            
+            # A result that fell back to English is served but not stored
+            if cache_key and translator.fully_translated(english, target_lang, TRANSLATEABLE_RESULT_KEYS):
+                result_cache.put(cache_key, result)
+            metrics.observe('calculate_loan', 'eligibility', scored - looked_up)
+            metrics.observe('calculate_loan', 'translate', translated - scored)
         
-        logger.info(f"Loan calculation result for {request.remote_addr}: Status - {result['status']}, Score - {result['eligibility_score']}")
+        request_logger.info(
+            "Loan calculation result for %s: Status - %s, Score - %s",
+            request.remote_addr, result['status'], result['eligibility_score']
+        )
         
-        return jsonify({'success': True, 'result': result})
+        body = {'success': True, 'result': result}
+        if degraded:
+            body['degraded'] = True
+        response = jsonify(body)
+        finished = perf_counter()
+        metrics.observe('calculate_loan', 'parse', parsed - started)
+        metrics.observe('calculate_loan', 'validate', validated - parsed)
+        metrics.observe('calculate_loan', 'result_cache', looked_up - validated)
+        metrics.observe('calculate_loan', 'serialize', finished - translated)
+        metrics.observe('calculate_loan', 'total', finished - started)
+        return response
         
     except ValueError as e:
         logger.error(f"Validation error in loan calculation: {str(e)}")
@@ -577,18 +1148,182 @@ def calculate_loan():
         logger.error(f"Error in loan calculation: {str(e)}")
         return jsonify({'success': False, 'error': 'Internal server error'}), 500
 
+@app.route('/calculate_loan/batch', methods=['POST'])
+def calculate_loan_batch():
+    """Calculate loan eligibility for a batch of applications"""
+    try:
+        data = request.get_json(silent=True)
+        applications = data.get('applications') if isinstance(data, dict) else None
+        
+        if not isinstance(applications, list) or not applications:
+            return jsonify({'success': False, 'error': 'No applications provided'}), 400
+        if len(applications) > MAX_BATCH_SIZE:
+            return jsonify({'success': False, 'error': f'Batch too large (max {MAX_BATCH_SIZE} applications)'}), 400
+        try:
+            default_lang = batch_schema.parse(data)['language']
+        except schemas.SchemaError as e:
+            return jsonify(e.response()), 400
+        
+        request_logger.info("Batch loan calculation request from %s: %d applications", request.remote_addr, len(applications))
+        
+        results = loan_calculator.calculate_eligibility_batch(applications, default_lang)
+        
+        # Translate results if needed, per application language or the batch default
+        degraded = degraded_request()
+        translate_dict = translator.translate_dict_offline if degraded else translator.translate_dict
+        for entry in results:
+            if not entry['success']:
+                continue
+            target_lang = entry.pop('language')
+            if target_lang != 'en':
+                entry['result'] = translate_dict(entry['result'], target_lang, TRANSLATEABLE_RESULT_KEYS)
+        
+        failed = sum(1 for entry in results if not entry['success'])
+        request_logger.info("Batch loan calculation result for %s: %d scored, %d failed", request.remote_addr, len(results) - failed, failed)
+        
+        body = {
+            'success': True,
+            'results': results,
+            'summary': {'total': len(results), 'scored': len(results) - failed, 'failed': failed}
+        }
+        if degraded:
+            body['degraded'] = True
+        return jsonify(body)
+        
+    except Exception as e:
+        logger.error(f"Error in batch loan calculation: {str(e)}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+@app.route('/calculate_loan/stream', methods=['POST'])
+def calculate_loan_stream():
+    """Score an NDJSON or CSV upload, streaming results row by row
+    
+    The body is read and scored a chunk at a time (see bulk_score.py), so
+    memory stays flat for uploads of any size. Admin only: one request can
+    keep a worker busy for as long as the upload lasts.
+    """
+    if not is_admin_request():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    
+    input_format = request.args.get('format') or ('csv' if request.mimetype == 'text/csv' else 'ndjson')
+    output_format = request.args.get('output', input_format)
+    if input_format not in FORMATS or output_format not in FORMATS:
+        return jsonify({'success': False, 'error': f"Formats must be one of: {', '.join(FORMATS)}"}), 400
+    try:
+        chunk_size = max(1, min(int(request.args.get('chunk_size', DEFAULT_CHUNK_SIZE)), MAX_BATCH_SIZE))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'chunk_size must be an integer'}), 400
+    
+    client = request.remote_addr
+    lines = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    scorer = ChunkScorer(output_format, request.args.get('id_field', 'id'), loan_calculator)
+    
+    def generate():
+        started = perf_counter()
+        rows = failed = 0
+        if output_format == 'csv':
+            yield csv_header()
+        for text, chunk_rows, chunk_failed in score_stream(read_records(lines, input_format), scorer, chunk_size):
+            rows += chunk_rows
+            failed += chunk_failed
+            yield text
+        request_logger.info(
+            "Streamed loan calculation for %s: %d rows, %d failed in %.2fs",
+            client, rows, failed, perf_counter() - started
+        )
+    
+    request_logger.info("Streaming loan calculation request from %s (%s -> %s)", client, input_format, output_format)
+    return Response(stream_with_context(generate()), mimetype=MIMETYPES[output_format])
+
+@app.route('/counterfactual', methods=['POST'])
+def counterfactual():
+    """Values of loan_amount, loan_tenure or cibil_score that reach a better status
+    
+    Takes the application plus optional ``fields`` (default all three) and
+    ``target_status`` (default the next band above the current status).
+    """
+    try:
+        data = request.get_json(silent=True)
+        try:
+            application = application_schema.parse(data)
+        except schemas.SchemaError as e:
+            return jsonify(e.response()), 400
+        
+        request_logger.info("Counterfactual request from %s", request.remote_addr)
+        try:
+            result = counterfactuals.search(application, data.get('fields'), data.get('target_status'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        return jsonify({'success': True, 'result': result})
+        
+    except Exception as e:
+        logger.error(f"Error in counterfactual search: {str(e)}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
+@app.route('/amortization', methods=['POST'])
+def amortization_sweep():
+    """EMIs and amortization schedules for a grid of amounts, tenures and rates
+    
+    Every combination of ``amounts`` x ``tenures`` x ``rates`` (annual %,
+    default the policy rate) is one scenario. Schedules are columnar lists
+    (``interest``, ``principal``, ``balance`` per month). Large grids must be
+    streamed: ``"stream": true`` or ``Accept: application/x-ndjson`` returns one
+    scenario per line, computed a chunk at a time.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'error': 'Request must be a JSON object'}), 400
+        
+        policy = policy_store.current()
+        amounts = data.get('amounts', data.get('amount'))
+        tenures = data.get('tenures', data.get('tenure'))
+        rates = data.get('rates', data.get('rate', policy.interest_rate))
+        if amounts is None or tenures is None:
+            return jsonify({'success': False, 'error': 'amounts and tenures are required'}), 400
+        
+        try:
+            with_schedule = json_flag(data, 'schedule', True)
+            stream = json_flag(data, 'stream', False) or request.accept_mimetypes.best == 'application/x-ndjson'
+            # Validate and size the three axes before any grid is allocated
+            axes = amortization.grid_axes(amounts, tenures, rates)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        count = amortization.scenario_count(*axes)
+        if count > MAX_AMORTIZATION_SCENARIOS:
+            return jsonify({'success': False, 'error': f'Too many scenarios (max {MAX_AMORTIZATION_SCENARIOS})'}), 400
+        if with_schedule and not stream and count > MAX_INLINE_SCHEDULES:
+            return jsonify({
+                'success': False,
+                'error': f'Schedules for more than {MAX_INLINE_SCHEDULES} scenarios must be streamed ("stream": true)'
+            }), 400
+        
+        request_logger.info("Amortization request from %s: %d scenarios", request.remote_addr, count)
+        scenarios = amortization.iter_scenarios(*axes, policy.processing_fee_rate, with_schedule)
+        if stream:
+            lines = (json_dumps(scenario) + '\n' for scenario in scenarios)
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+        return jsonify({'success': True, 'count': count, 'scenarios': list(scenarios)})
+        
+    except Exception as e:
+        logger.error(f"Error in amortization: {str(e)}")
+        return jsonify({'success': False, 'error': 'Internal server error'}), 500
+
 @app.route('/translate', methods=['POST'])
 def translate_text():
     """Translate text to selected language"""
     try:
-        data = request.get_json()
-        text = data.get('text', '')
-        target_lang = data.get('target_lang', 'en')
-        
-        if not text:
-            return jsonify({'success': False, 'error': 'No text provided'}), 400
+        data = translate_schema.parse(request.get_json(silent=True))
+    except schemas.SchemaError as e:
+        return jsonify(e.response()), 400
+    
+    try:
+        if degraded_request():
+            translated_text = translator.translate_offline(data['text'], data['target_lang'])
+            return jsonify({'success': True, 'translated_text': translated_text, 'degraded': True})
         
-        translated_text = translator.translate(text, target_lang)
+        translated_text = translator.translate(data['text'], data['target_lang'])
         
         return jsonify({'success': True, 'translated_text': translated_text})
         
@@ -599,25 +1334,49 @@ def translate_text():
 @app.route('/chatbot', methods=['POST'])
 def chatbot():
     """Loan-focused chatbot endpoint"""
+    started = perf_counter()
+    try:
+        data = chatbot_schema.parse(request.get_json(silent=True))
+    except schemas.SchemaError as e:
+        return jsonify(e.response()), 400
+    message, language = data['message'], data['language']
+    
     try:
-        data = request.get_json()
-        message = data.get('message', '').strip()
-        language = data.get('language', 'en')
-        
-        if not message:
-            return jsonify({'success': False, 'error': 'No message provided'}), 400
-        
         # Log the chatbot request (for analytics)
-        logger.info(f"Chatbot query from {request.remote_addr}: {message[:50]}...")
+        request_logger.info("Chatbot query from %s: %.50s...", request.remote_addr, message)
+        parsed = perf_counter()
         
-        # Get chatbot response
-        response = loan_chatbot.get_response(message, language)
+        # Get chatbot response (one keyword scan serves both fields)
+        match = loan_chatbot.match(message)
+        matched = perf_counter()
+        try:
+            cached = loan_chatbot.respond(match['intent'], language, offline=degraded_request())
+        except Exception as e:
+            logger.error(f"Chatbot error: {str(e)}")
+            cached = CachedResponse(loan_chatbot.error_response, None)
+        responded = perf_counter()
         
-        return jsonify({
-            'success': True, 
-            'response': response,
-            'is_loan_related': loan_chatbot.is_loan_related(message)
-        })
+        # Identical (intent, language) answers share an ETag
+        if cached.etag and cached.etag in request.if_none_match:
+            response = app.response_class(status=304)
+        else:
+            response = jsonify({
+                'success': True, 
+                'response': cached.text,
+                'is_loan_related': match['is_loan_related']
+            })
+        if cached.etag:
+            response.set_etag(cached.etag)
+            response.headers['Cache-Control'] = f'public, max-age={CHATBOT_CACHE_MAX_AGE}'
+        else:
+            response.headers['Cache-Control'] = 'no-store'
+        finished = perf_counter()
+        metrics.observe('chatbot', 'parse', parsed - started)
+        metrics.observe('chatbot', 'match', matched - parsed)
+        metrics.observe('chatbot', 'respond', responded - matched)
+        metrics.observe('chatbot', 'serialize', finished - responded)
+        metrics.observe('chatbot', 'total', finished - started)
+        return response
         
     except Exception as e:
         logger.error(f"Chatbot error: {str(e)}")
@@ -630,24 +1389,30 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'version': '1.0.0',
-        'frontend_built': os.path.exists(os.path.join(static_folder, 'index.html'))
+        'policy_version': policy_store.current().version,
+        'translation_cache': translator.cache.stats() if hasattr(translator, 'cache') else None,
+        'translation_catalog': translator.catalog.stats() if hasattr(translator, 'catalog') else None,
+        'chatbot_response_cache': loan_chatbot.responses.stats(),
+        'result_cache': result_cache.stats() if result_cache else None,
+        'admission': admission_control.stats(),
+        'feature_encoder': loan_calculator.encoder.stats() if loan_calculator.encoder else None,
+        'ml_microbatch': loan_calculator.batcher.stats() if loan_calculator.batcher else None,
+        'metrics': metrics.snapshot(),
+        'profiling': profiler.stats(),
+        'logging': log_pipeline.stats(),
+        'frontend_built': static_assets.built,
+        'static_assets': static_assets.stats()
     })
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    logger.warning(f"404 error for {request.url} from {request.remote_addr}")
+    request_logger.warning("404 error for %s from %s", request.url, request.remote_addr)
     # For API routes, return JSON error
     if request.path.startswith('/api/'):
         return jsonify({'error': 'Not found', 'status': 404}), 404
     # For frontend routes, serve React app (SPA routing)
-    try:
-        return send_file(os.path.join(static_folder, 'index.html'))
-    except FileNotFoundError:
-        return jsonify({
-            'error': 'Frontend not built. Please run: cd Loan_Approval/project && npm run build',
-            'status': 404
-        }), 404
+    return static_assets.serve_index(request) or frontend_not_built()
 
 @app.errorhandler(500)
 def internal_error(error):
@@ -660,7 +1425,7 @@ if __name__ == '__main__':
     logger.info("Starting Bank Loan Approval System")
     logger.info(f"Translation service available: {hasattr(translator, 'translate')}")
     logger.info(f"Static folder: {static_folder}")
-    logger.info(f"Frontend built: {os.path.exists(os.path.join(static_folder, 'index.html'))}")
+    logger.info(f"Frontend built: {static_assets.built}")
     
     # Run the application
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
@@ -0,0 +1,305 @@
+"""ASGI entry point for the async serving mode
+
+Run with:
+    gunicorn --config gunicorn_asgi.conf.py asgi:application
+
+The translation-heavy endpoints (/api/calculate_loan, /api/translate and
+/api/chatbot, plus their legacy un-prefixed routes) are served natively
+here: eligibility scoring stays synchronous and CPU-bound, while
+translation I/O is awaited, so one event loop overlaps many slow upstream
+calls instead of pinning a sync worker per request. Every other route is
+delegated to the Flask app through asgiref's WSGI adapter.
+
+The SQLite tiers of the translation and result caches (when configured)
+are read and written in a thread, never on the event loop.
+"""
+import asyncio
+import logging
+from time import perf_counter
+
+from asgiref.wsgi import WsgiToAsgi
+
+import json_codec
+from admission import request_queue_time
+from log_pipeline import request_logger
+from schemas import SchemaError
+from metrics import metrics
+from response_cache import CachedResponse
+
+from app import (
+    ADMISSION_ROUTES,
+    CHATBOT_CACHE_MAX_AGE,
+    TRANSLATEABLE_RESULT_KEYS,
+    admission_control,
+    allowed_origins,
+    app as flask_app,
+    application_schema,
+    chatbot_schema,
+    loan_calculator,
+    loan_chatbot,
+    record_admission,
+    result_cache,
+    result_cache_key,
+    translate_schema,
+    translator,
+)
+
+logger = logging.getLogger(__name__)
+
+wsgi_application = WsgiToAsgi(flask_app)
+
+
+def disk_backed(cache):
+    """True if ``cache`` has a shared SQLite tier"""
+    return getattr(cache, 'disk', None) is not None
+
+
+TRANSLATION_DISK = disk_backed(getattr(translator, 'cache', None))
+RESULT_DISK = disk_backed(result_cache)
+
+
+async def off_loop(disk, function, *args):
+    """``function(*args)``, in a thread when it may block on a SQLite tier"""
+    if disk:
+        return await asyncio.to_thread(function, *args)
+    return function(*args)
+
+
+async def calculate_loan(data, client, degraded=False):
+    """Calculate loan eligibility and status
+
+    ``degraded`` (set by admission control under load) translates from the
+    catalog and cache only instead of awaiting the backend.
+    """
+    try:
+        started = perf_counter()
+        try:
+            data = application_schema.parse(data)
+        except SchemaError as e:
+            return e.response(), 400
+        validated = perf_counter()
+
+        # Log the request (without sensitive data)
+        log_data = {k: v for k, v in data.items() if k not in ['bank_balance', 'monthly_income']}
+        request_logger.info("Loan calculation request from %s", client, extra={'application': log_data})
+
+        # Identical submissions reuse the stored, translated result
+        target_lang = data['language']
+        cache_key = result_cache_key(data, target_lang)
+        result = await off_loop(RESULT_DISK, result_cache.get, cache_key) if cache_key else None
+        looked_up = perf_counter()
+        offline = False
+        if result is not None:
+            metrics.inc('cache_requests', 'result', 'hit')
+        else:
+            if cache_key:
+                metrics.inc('cache_requests', 'result', 'miss')
+
+            # CPU-bound scoring runs inline; it never waits on I/O
+            result = english = loan_calculator.calculate_eligibility(data)
+            scored = perf_counter()
+
+            if target_lang != 'en':
+                offline = degraded
+                if offline:
+                    result = await off_loop(
+                        TRANSLATION_DISK, translator.translate_dict_offline, result, target_lang, TRANSLATEABLE_RESULT_KEYS
+                    )
+                else:
+                    result = await translator.atranslate_dict(result, target_lang, TRANSLATEABLE_RESULT_KEYS)
+
+            # A result that fell back to English is served but not stored
+            if cache_key and await off_loop(
+                TRANSLATION_DISK, translator.fully_translated, english, target_lang, TRANSLATEABLE_RESULT_KEYS
+            ):
+                await off_loop(RESULT_DISK, result_cache.put, cache_key, result)
+            metrics.observe('calculate_loan', 'eligibility', scored - looked_up)
+            metrics.observe('calculate_loan', 'translate', perf_counter() - scored)
+
+        request_logger.info(
+            "Loan calculation result for %s: Status - %s, Score - %s", client, result['status'], result['eligibility_score']
+        )
+        finished = perf_counter()
+        metrics.observe('calculate_loan', 'validate', validated - started)
+        metrics.observe('calculate_loan', 'result_cache', looked_up - validated)
+        metrics.observe('calculate_loan', 'total', finished - started)
+
+        if offline:
+            return {'success': True, 'result': result, 'degraded': True}, 200
+        return {'success': True, 'result': result}, 200
+
+    except ValueError as e:
+        logger.error(f"Validation error in loan calculation: {str(e)}")
+        return {'success': False, 'error': 'Invalid input data provided'}, 400
+    except Exception as e:
+        logger.error(f"Error in loan calculation: {str(e)}")
+        return {'success': False, 'error': 'Internal server error'}, 500
+
+
+async def translate_text(data, client, degraded=False):
+    """Translate text to selected language"""
+    try:
+        data = translate_schema.parse(data)
+    except SchemaError as e:
+        return e.response(), 400
+
+    try:
+        if degraded:
+            translated_text = await off_loop(TRANSLATION_DISK, translator.translate_offline, data['text'], data['target_lang'])
+            return {'success': True, 'translated_text': translated_text, 'degraded': True}, 200
+
+        translated_text = await translator.atranslate(data['text'], data['target_lang'])
+
+        return {'success': True, 'translated_text': translated_text}, 200
+
+    except Exception as e:
+        logger.error(f"Translation error: {str(e)}")
+        return {'success': False, 'error': 'Translation service unavailable'}, 500
+
+
+async def chatbot(data, client, degraded=False):
+    """Loan-focused chatbot endpoint"""
+    try:
+        data = chatbot_schema.parse(data)
+    except SchemaError as e:
+        return e.response(), 400
+    message, language = data['message'], data['language']
+
+    try:
+        started = perf_counter()
+        request_logger.info("Chatbot query from %s: %.50s...", client, message)
+        parsed = perf_counter()
+
+        match = loan_chatbot.match(message)
+        matched = perf_counter()
+        try:
+            if degraded:
+                cached = await off_loop(TRANSLATION_DISK, loan_chatbot.respond, match['intent'], language, True)
+            else:
+                cached = await loan_chatbot.arespond(match['intent'], language)
+        except Exception as e:
+            logger.error(f"Chatbot error: {str(e)}")
+            cached = CachedResponse(loan_chatbot.error_response, None)
+        finished = perf_counter()
+        metrics.observe('chatbot', 'parse', parsed - started)
+        metrics.observe('chatbot', 'match', matched - parsed)
+        metrics.observe('chatbot', 'respond', finished - matched)
+        metrics.observe('chatbot', 'total', finished - started)
+
+        if cached.etag:
+            headers = [
+                (b'etag', f'"{cached.etag}"'.encode('ascii')),
+                (b'cache-control', f'public, max-age={CHATBOT_CACHE_MAX_AGE}'.encode('ascii')),
+            ]
+        else:
+            headers = [(b'cache-control', b'no-store')]
+
+        return {
+            'success': True,
+            'response': cached.text,
+            'is_loan_related': match['is_loan_related']
+        }, 200, headers
+
+    except Exception as e:
+        logger.error(f"Chatbot error: {str(e)}")
+        return {'success': False, 'error': 'Chatbot service unavailable'}, 500
+
+
+ASYNC_ROUTES = {
+    '/api/calculate_loan': calculate_loan,
+    '/calculate_loan': calculate_loan,
+    '/api/translate': translate_text,
+    '/translate': translate_text,
+    '/api/chatbot': chatbot,
+    '/chatbot': chatbot,
+}
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body', False):
+            return body
+
+
+def cors_headers(scope):
+    """Mirror the Flask-CORS policy configured in app.py"""
+    origin = request_header(scope, b'origin')
+    if origin is not None and origin.decode('latin-1') in allowed_origins:
+        return [
+            (b'access-control-allow-origin', origin),
+            (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin'),
+        ]
+    return []
+
+
+def request_header(scope, header):
+    for name, value in scope.get('headers', []):
+        if name == header:
+            return value
+    return None
+
+
+def not_modified(scope, headers):
+    """True if the request's If-None-Match covers the response ETag"""
+    etag = dict(headers).get(b'etag')
+    if_none_match = request_header(scope, b'if-none-match')
+    if not etag or not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(b',')]
+    return etag in candidates or b'*' in candidates
+
+
+async def send_json(send, scope, body, status, extra_headers=()):
+    if status == 200 and not_modified(scope, extra_headers):
+        status, payload = 304, b''
+    else:
+        payload = json_codec.dumpb(body)
+    headers = [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(payload)).encode('ascii')),
+    ] + list(extra_headers) + cors_headers(scope)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    handler = ASYNC_ROUTES.get(scope.get('path')) if scope['type'] == 'http' else None
+    if handler is None or scope['method'] != 'POST':
+        # Everything else (static files, health, CORS preflight, batch...) stays on Flask
+        return await wsgi_application(scope, receive, send)
+
+    # Overloaded endpoints answer before the body is even read
+    endpoint = ADMISSION_ROUTES[scope['path']]
+    queued_for = request_queue_time((request_header(scope, b'x-request-start') or b'').decode('latin-1'))
+    ticket = await admission_control.aadmit(endpoint, queued_for)
+    rejection = record_admission(endpoint, ticket)
+    if rejection is not None:
+        body, status, retry_after = rejection
+        return await send_json(send, scope, body, status, [(b'retry-after', retry_after.encode('ascii'))])
+
+    with ticket:
+        try:
+            data = json_codec.loads(await read_body(receive) or b'null')
+        except ValueError:
+            return await send_json(send, scope, {'success': False, 'error': 'Invalid JSON body'}, 400)
+
+        client = scope.get('client')
+        response = await handler(data, client[0] if client else None, ticket.degraded)
+        await send_json(send, scope, *response)
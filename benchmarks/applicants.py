@@ -0,0 +1,81 @@
+"""Synthetic loan applicants that exercise every scoring branch
+
+``generate`` walks each criterion through all of its bands (CIBIL, income,
+EMI ratio, bank balance, age, employment) with independent offsets, so any
+run of a few dozen applicants hits every band and, through the resulting
+scores, every status. ``band_coverage`` scores a set of applicants with the
+rule engine and reports which bands and statuses it reached.
+"""
+import random
+
+# Target values per band, best band first (see scoring_policy.json)
+CIBIL_RANGES = [(800, 900), (750, 799), (700, 749), (650, 699), (300, 649)]
+INCOME_FACTORS = [(0.3, 0.7), (0.71, 1.0), (1.01, 1.2), (1.25, 2.5)]
+EMI_RATIOS = [(5, 30), (31, 40), (41, 50), (51, 60), (65, 120)]
+BALANCE_FACTORS = [(2.0, 5.0), (1.0, 1.99), (0.5, 0.99), (0.0, 0.49)]
+AGES = [(25, 35), (36, 45), (46, 55), (56, 75)]
+EMPLOYMENT_TYPES = ['Permanent', 'Government', 'Contract', 'Self-employed', 'Business']
+INCOME_SOURCES = ['Salary', 'Business', 'Freelance', 'Investment', 'Other']
+LANGUAGES = ['en', 'hi', 'ta', 'ml', 'mr', 'bn', 'gu', 'te', 'kn']
+
+TENURES = [12, 24, 36, 60, 120, 240, 360]
+MONTHLY_RATE = 0.12 / 12
+
+
+def _emi(amount, tenure):
+    growth = (1 + MONTHLY_RATE) ** tenure
+    return amount * MONTHLY_RATE * growth / (growth - 1)
+
+
+def applicant(index, rng, languages=('en',)):
+    """The index-th applicant; each criterion cycles through its bands at its own stride"""
+    monthly_income = round(rng.uniform(15000, 250000), 2)
+    low, high = INCOME_FACTORS[index % len(INCOME_FACTORS)]
+    loan_amount = round(monthly_income * 60 * rng.uniform(low, high), 2)
+
+    # Pick a tenure whose EMI fits the target ratio, then top it up with existing EMIs
+    low, high = EMI_RATIOS[(index // 2) % len(EMI_RATIOS)]
+    target_emi = monthly_income * rng.uniform(low, high) / 100
+    fitting = [tenure for tenure in TENURES if _emi(loan_amount, tenure) <= target_emi]
+    loan_tenure = rng.choice(fitting) if fitting else TENURES[-1]
+    emi_existing = round(max(0.0, target_emi - _emi(loan_amount, loan_tenure)), 2)
+
+    low, high = BALANCE_FACTORS[(index // 3) % len(BALANCE_FACTORS)]
+    age_low, age_high = AGES[(index // 5) % len(AGES)]
+    cibil_low, cibil_high = CIBIL_RANGES[(index // 7) % len(CIBIL_RANGES)]
+    return {
+        'bank_balance': round(loan_amount * 0.1 * rng.uniform(low, high), 2),
+        'cibil_score': rng.randint(cibil_low, cibil_high),
+        'loan_amount': loan_amount,
+        'monthly_income': monthly_income,
+        'loan_tenure': loan_tenure,
+        'emi_existing': emi_existing,
+        'age': rng.randint(age_low, age_high) if index % 8 else rng.randint(18, 24),
+        'employment_type': EMPLOYMENT_TYPES[(index // 11) % len(EMPLOYMENT_TYPES)],
+        'income_source': INCOME_SOURCES[index % len(INCOME_SOURCES)],
+        'existing_loans': 'Yes' if emi_existing else 'No',
+        'language': languages[index % len(languages)],
+    }
+
+
+def generate(count, seed=0, languages=('en',)):
+    rng = random.Random(seed)
+    return [applicant(index, rng, languages) for index in range(count)]
+
+
+def band_coverage(applications):
+    """Which policy bands and statuses the applicants reach, per criterion"""
+    import rule_engine
+    from scoring_policy import policy_store
+
+    policy = policy_store.current()
+    rows = [rule_engine.coerce_application(data) for data in applications]
+    results = rule_engine.evaluate(rule_engine.columns_from_rows(rows), policy=policy).results()
+
+    coverage = {}
+    for criterion in policy.criteria:
+        seen = {result['criteria_scores'][criterion.name] for result in results}
+        coverage[criterion.name] = {'covered': len(seen & set(criterion.labels)), 'bands': len(criterion.labels)}
+    statuses = {result['status'] for result in results}
+    coverage['Status'] = {'covered': len(statuses), 'bands': len(policy.statuses)}
+    return coverage
@@ -0,0 +1,101 @@
+"""Burst behaviour of sync workers with and without admission control
+
+Starts gunicorn (sync workers) with the stub translator at a simulated
+upstream latency and fires a burst of concurrent /api/translate requests
+with distinct texts (so nothing is cached), once with ADMISSION_CONTROL=false
+and once with the default limits. Reports status codes, how many answers
+were degraded (catalog/cache or English instead of waiting on the
+translator) and latency percentiles as seen by the clients.
+
+    python benchmarks/bench_admission.py [--latency-ms 500] [--requests 200] [--workers 2]
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_async_translate import ROOT, free_port, wait_until_up
+
+
+def start_server(port, latency_ms, workers, admission):
+    env = dict(
+        os.environ,
+        WORKERS=str(workers),
+        TRANSLATOR_BACKEND='stub',
+        TRANSLATOR_STUB_LATENCY_MS=str(latency_ms),
+        TRANSLATION_CACHE_PATH='',
+        TRANSLATION_CATALOG_PATH=os.devnull,
+        ADMISSION_CONTROL='true' if admission else 'false',
+        # Empty: the gunicorn config creates a fresh state file
+        ADMISSION_STATE_PATH='',
+        LOG_LEVEL='WARNING',
+    )
+    pidfile = os.path.join(tempfile.gettempdir(), f'bench_admission_{port}.pid')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+         '--pid', pidfile, '--access-logfile', os.devnull, 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    wait_until_up(port)
+    return process
+
+
+def translate_once(port):
+    started = time.perf_counter()
+    try:
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        body = json.dumps({'text': f'hello {uuid.uuid4().hex}', 'target_lang': 'hi'})
+        connection.request('POST', '/api/translate', body, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        payload = response.read()
+        status = response.status
+        degraded = status == 200 and json.loads(payload).get('degraded', False)
+    except OSError:
+        status, degraded = 'error', False
+    return status, degraded, time.perf_counter() - started
+
+
+def burst(port, requests):
+    with ThreadPoolExecutor(max_workers=requests) as pool:
+        results = list(pool.map(lambda _: translate_once(port), range(requests)))
+    latencies = sorted(elapsed for _, _, elapsed in results)
+    translated = sorted(elapsed for status, degraded, elapsed in results if status == 200 and not degraded)
+    return {
+        'statuses': dict(Counter(str(status) for status, _, _ in results)),
+        'translated': len(translated),
+        'degraded': sum(1 for _, degraded, _ in results if degraded),
+        'p50_s': round(statistics.median(latencies), 3),
+        'p99_s': round(latencies[int(len(latencies) * 0.99) - 1], 3),
+        'max_s': round(latencies[-1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency-ms', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    report = {}
+    for admission in (False, True):
+        port = free_port()
+        server = start_server(port, args.latency_ms, args.workers, admission)
+        try:
+            report['admission' if admission else 'no_admission'] = burst(port, args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
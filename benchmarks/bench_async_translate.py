@@ -0,0 +1,120 @@
+"""Throughput of sync vs. async (ASGI) serving with a slow translator
+
+Starts gunicorn with one worker in each mode, using the local stub
+translator with a simulated upstream latency, and fires concurrent
+/api/translate requests with distinct texts (so nothing is cached).
+
+    python benchmarks/bench_async_translate.py [--latency-ms 300] [--requests 64]
+
+With the sync worker throughput stays ~1/latency regardless of
+concurrency; with the ASGI worker it grows with concurrency.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'sync': ('gunicorn.conf.py', 'app:app'),
+    'asgi': ('gunicorn_asgi.conf.py', 'asgi:application'),
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def start_server(mode, port, latency_ms, workers):
+    config, target = MODES[mode]
+    env = dict(
+        os.environ,
+        WORKERS=str(workers),
+        TRANSLATOR_BACKEND='stub',
+        TRANSLATOR_STUB_LATENCY_MS=str(latency_ms),
+        TRANSLATION_CACHE_PATH='',
+        TRANSLATION_CATALOG_PATH=os.devnull,
+        TRANSLATION_CONCURRENCY='64',
+        LOG_LEVEL='WARNING',
+    )
+    pidfile = os.path.join(tempfile.gettempdir(), f'bench_{mode}_{port}.pid')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', config, '--bind', f'127.0.0.1:{port}',
+         '--pid', pidfile, '--access-logfile', os.devnull, target],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    wait_until_up(port)
+    return process
+
+
+def translate_once(port):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    body = json.dumps({'text': f'hello {uuid.uuid4().hex}', 'target_lang': 'hi'})
+    connection.request('POST', '/api/translate', body, {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    response.read()
+    return response.status
+
+
+def run(port, requests, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        statuses = list(pool.map(lambda _: translate_once(port), range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': sum(status != 200 for status in statuses),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(requests / elapsed, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args(argv)
+
+    report = {'latency_ms': args.latency_ms, 'workers': args.workers, 'modes': {}}
+    for mode in MODES:
+        port = free_port()
+        process = start_server(mode, port, args.latency_ms, args.workers)
+        try:
+            report['modes'][mode] = [
+                run(port, max(args.requests, concurrency), concurrency) for concurrency in args.concurrency
+            ]
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
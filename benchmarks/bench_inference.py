@@ -0,0 +1,57 @@
+"""Micro-benchmark: per-call ML inference latency, sklearn vs. compiled engine
+
+Compares the previous single-application path (``predict_proba`` followed
+by ``predict``, each re-validating the input) with the compiled
+LogisticInference engine, for one row and for a 1000-row batch.
+
+    python benchmarks/bench_inference.py
+"""
+import json
+import os
+import sys
+import timeit
+import warnings
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.simplefilter('ignore')
+
+from inference import SklearnInference, compile_model  # noqa: E402
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'loan_model.pkl')
+SCALES = np.array([70, 1, 5e6, 900, 1, 5e6, 360, 5e5, 3, 1, 1, 2e5])
+
+
+def best_of(stmt, number, repeat=5):
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main():
+    model = joblib.load(MODEL_PATH)
+    engine = compile_model(model)
+    fallback = SklearnInference(model)
+    rng = np.random.default_rng(0)
+    batch = rng.random((1000, len(SCALES))) * SCALES
+    row = batch[0].tolist()
+    single = np.array([row])
+
+    def sklearn_single():
+        model.predict_proba(single)[0]
+        model.predict(single)[0]
+
+    timings = {
+        'engine': engine.kind,
+        'single_sklearn_proba_and_predict_us': best_of(sklearn_single, 2000) * 1e6,
+        'single_sklearn_one_call_us': best_of(lambda: fallback.predict_one(row), 2000) * 1e6,
+        'single_compiled_us': best_of(lambda: engine.predict_one(row), 20000) * 1e6,
+        'batch_1000_sklearn_us': best_of(lambda: fallback.predict(batch), 200) * 1e6,
+        'batch_1000_compiled_us': best_of(lambda: engine.predict(batch), 200) * 1e6,
+    }
+    timings['single_speedup'] = timings['single_sklearn_proba_and_predict_us'] / timings['single_compiled_us']
+    print(json.dumps({k: round(v, 2) if isinstance(v, float) else v for k, v in timings.items()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
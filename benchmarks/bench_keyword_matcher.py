@@ -0,0 +1,84 @@
+"""Micro-benchmark: chatbot intent routing
+
+Compares the previous routing (``any(keyword in message_lower ...)`` for
+the loan keywords, then greetings, then each topic, plus a second
+is_loan_related scan in the endpoint) with LoanChatbot.match(), which
+walks precomputed keyword tuples once and stops at the first hit, on short
+questions and long pasted messages. ``matches_us`` is the full scan that
+reports every keyword hit with its position.
+
+    python benchmarks/bench_keyword_matcher.py
+"""
+import json
+import logging
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.CRITICAL)
+
+from app import LoanChatbot  # noqa: E402
+
+chatbot = LoanChatbot()
+
+
+def substring_route(message):
+    """Routing as implemented originally (two loan-keyword scans per request)"""
+    message_lower = message.lower()
+    is_loan_related = any(keyword in message_lower for keyword in LoanChatbot.LOAN_KEYWORDS)
+    if not is_loan_related:
+        intent = 'off_topic'
+    elif any(greeting in message_lower for greeting in LoanChatbot.GREETINGS):
+        intent = 'greeting'
+    else:
+        intent = next(
+            (topic for topic, data in chatbot.loan_knowledge.items()
+             if any(keyword in message_lower for keyword in data["keywords"])),
+            'default'
+        )
+    # chatbot() called is_loan_related a second time for the response payload
+    any(keyword in message.lower() for keyword in LoanChatbot.LOAN_KEYWORDS)
+    return intent
+
+
+def match_route(message):
+    return chatbot.match(message)['intent']
+
+
+def filler(rng, length):
+    words = ['the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'lorem', 'ipsum', 'dolor', 'sit']
+    text = []
+    while sum(map(len, text)) < length:
+        text.append(rng.choice(words))
+    return ' '.join(text)
+
+
+def main():
+    rng = random.Random(0)
+    cases = {
+        'short question': 'What CIBIL score do I need for a home loan?',
+        'off-topic short': 'What is the weather like today?',
+        'pasted 2 KB (keyword at end)': filler(rng, 2000) + ' can I get a loan with low cibil',
+        'pasted 20 KB (keyword at end)': filler(rng, 20000) + ' can I get a loan with low cibil',
+        'pasted 20 KB (no keywords)': filler(rng, 20000),
+    }
+    report = {}
+    for name, message in cases.items():
+        assert substring_route(message) == match_route(message), name
+        number = max(3, int(20000 / max(len(message), 50)))
+        substring = min(timeit.repeat(lambda: substring_route(message), number=number, repeat=5)) / number
+        match = min(timeit.repeat(lambda: match_route(message), number=number, repeat=5)) / number
+        matches = min(timeit.repeat(lambda: chatbot.matches(message), number=number, repeat=5)) / number
+        report[name] = {
+            'chars': len(message),
+            'before_us': round(substring * 1e6, 2),
+            'match_us': round(match * 1e6, 2),
+            'matches_us': round(matches * 1e6, 2),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: request latency with synchronous vs queued (background) logging
+
+Runs /api/calculate_loan through the Flask test client in a child process
+whose stderr is a pipe drained by a throttled reader, as with a container
+log driver or a log shipper that falls behind. Compares writing log lines on
+the request thread (LOG_ASYNC=false) with the background writer, in text and
+JSON format, and with request-log sampling.
+
+    python benchmarks/bench_logging.py [--requests 5000] [--reader-kbps 256]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+MODES = {
+    'sync_text': {'LOG_ASYNC': 'false', 'LOG_FORMAT': 'text'},
+    'sync_json': {'LOG_ASYNC': 'false', 'LOG_FORMAT': 'json'},
+    'async_json': {'LOG_ASYNC': 'true', 'LOG_FORMAT': 'json'},
+    'async_json_sampled_10pct': {'LOG_ASYNC': 'true', 'LOG_FORMAT': 'json', 'LOG_REQUEST_SAMPLE_RATE': '0.1'},
+}
+
+
+def child(requests):
+    sys.path.insert(0, HERE)
+    sys.path.insert(0, ROOT)
+    import applicants
+    from run_suite import summarize
+
+    import log_pipeline
+    from app import app
+
+    client = app.test_client()
+    bodies = applicants.generate(requests, seed=1)
+    for body in bodies[:50]:
+        client.post('/api/calculate_loan', json=body)
+    latencies = []
+    started = time.perf_counter()
+    for body in bodies:
+        request_started = time.perf_counter()
+        client.post('/api/calculate_loan', json=body)
+        latencies.append(time.perf_counter() - request_started)
+    report = summarize(latencies, time.perf_counter() - started)
+    report['p999_ms'] = round(sorted(latencies)[int(len(latencies) * 0.999)] * 1000, 4)
+    log_pipeline.flush()
+    report['logging'] = log_pipeline.stats()
+    print(json.dumps(report), file=sys.__stdout__)
+
+
+def run(mode, args):
+    env = dict(os.environ, TRANSLATOR_BACKEND='stub', TRANSLATION_CACHE_PATH='', LOG_LEVEL='INFO', **MODES[mode])
+    process = subprocess.Popen(
+        [sys.executable, __file__, '--child', '--requests', str(args.requests)],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    logged = [0]
+
+    def drain():
+        # A slow consumer: once the pipe buffer is full, writers block
+        chunk = 4096
+        delay = chunk / (args.reader_kbps * 1024)
+        while True:
+            data = process.stderr.read1(chunk)
+            if not data:
+                return
+            logged[0] += len(data)
+            time.sleep(delay)
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    output = process.stdout.read()
+    process.wait()
+    reader.join(timeout=60)
+    report = json.loads(output)
+    report['log_bytes'] = logged[0]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--reader-kbps', type=float, default=256, help='throughput of the stderr reader')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.requests)
+        return
+
+    report = {}
+    for mode in MODES:
+        report[mode] = run(mode, args)
+        print(f'{mode}: {report[mode]}', file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
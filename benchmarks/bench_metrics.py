@@ -0,0 +1,95 @@
+"""Benchmark: per-request cost of the hot-path metrics
+
+Replays the instrumentation of one /api/calculate_loan request (the
+perf_counter reads plus eight stage observations) and reports the cost per
+request, recorded through metrics.Metrics (queued, exported in the
+background) and, for comparison, observed directly into prometheus_client
+histograms. Each mode runs in a fresh process, with and without
+PROMETHEUS_MULTIPROC_DIR (per-worker mmap'd files, as under gunicorn).
+
+    python benchmarks/bench_metrics.py [--requests 200000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGES = [('calculate_loan', stage) for stage in ('parse', 'validate', 'eligibility', 'translate', 'serialize', 'total')]
+STAGES += [('calculate_eligibility', 'ml'), ('calculate_eligibility', 'rules')]
+
+
+def measure(mode, requests):
+    sys.path.insert(0, ROOT)
+    from time import perf_counter
+
+    import prometheus_client
+    from metrics import STAGE_BUCKETS, metrics
+
+    if mode == 'local':
+        observe = metrics.observe
+    else:
+        histogram = prometheus_client.Histogram('direct_seconds', 'direct', ['endpoint', 'stage'], buckets=STAGE_BUCKETS)
+        children = {key: histogram.labels(*key) for key in STAGES}
+
+        def observe(endpoint, stage, seconds):
+            children[endpoint, stage].observe(seconds)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        timestamps = [perf_counter() for _ in range(len(STAGES) + 1)]
+        for (endpoint, stage), (begin, end) in zip(STAGES, zip(timestamps, timestamps[1:])):
+            observe(endpoint, stage, end - begin)
+    elapsed = time.perf_counter() - started
+
+    # The same loop without recording: the baseline to subtract
+    started = time.perf_counter()
+    for _ in range(requests):
+        timestamps = [perf_counter() for _ in range(len(STAGES) + 1)]
+        for (endpoint, stage), (begin, end) in zip(STAGES, zip(timestamps, timestamps[1:])):
+            pass
+    baseline = time.perf_counter() - started
+
+    flush_started = time.perf_counter()
+    metrics.flush()
+    return {
+        'us_per_request': round((elapsed - baseline) / requests * 1e6, 2),
+        'us_per_request_with_timers': round(elapsed / requests * 1e6, 2),
+        'flush_ms': round((time.perf_counter() - flush_started) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--mode', choices=['local', 'direct'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.requests)))
+        return
+
+    report = {}
+    for multiprocess in (False, True):
+        for mode in ('local', 'direct'):
+            env = dict(os.environ)
+            env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+            with tempfile.TemporaryDirectory() as directory:
+                if multiprocess:
+                    env['PROMETHEUS_MULTIPROC_DIR'] = directory
+                output = subprocess.run(
+                    [sys.executable, __file__, '--mode', mode, '--requests', str(args.requests)],
+                    env=env, check=True, capture_output=True, text=True
+                ).stdout
+            name = f"{'multiprocess' if multiprocess else 'single_process'}_{mode}"
+            report[name] = json.loads(output)
+            print(f'{name}: {report[name]}', file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark: ML prediction throughput with and without micro-batching
+
+Simulates a gthread worker: N threads each loop over "request I/O" (a short
+sleep, standing in for reading the request and translating the reply)
+followed by LoanCalculator.get_ml_prediction. Reports predictions/s and
+the latency of the prediction call itself, with the batcher disabled and
+enabled. --sklearn swaps in the sklearn fallback engine, whose per-call
+overhead is what batching amortizes.
+
+    python benchmarks/bench_microbatch.py [--threads 1 4 16 64] [--io-ms 1] [--sklearn]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.CRITICAL)
+
+from app import loan_calculator  # noqa: E402
+from inference import SklearnInference  # noqa: E402
+from microbatch import MicroBatcher  # noqa: E402
+
+
+def application(rng):
+    return {
+        'bank_balance': rng.uniform(0, 2e6), 'cibil_score': rng.randint(300, 900),
+        'loan_amount': rng.uniform(1e4, 5e6), 'monthly_income': rng.uniform(5e3, 3e5),
+        'loan_tenure': rng.randint(6, 360), 'age': rng.randint(18, 70), 'emi_existing': 0,
+        'employment_type': 'Permanent', 'income_source': 'Salary', 'existing_loans': 'No',
+    }
+
+
+def run(threads, seconds, io_seconds, batcher):
+    loan_calculator.batcher = batcher
+    latencies = []
+    stop_at = time.monotonic() + seconds
+    lock = threading.Lock()
+
+    def client(seed):
+        rng = random.Random(seed)
+        data = [application(rng) for _ in range(64)]
+        local = []
+        index = 0
+        while time.monotonic() < stop_at:
+            time.sleep(io_seconds)
+            started = time.perf_counter()
+            loan_calculator.get_ml_prediction(data[index % 64])
+            local.append(time.perf_counter() - started)
+            index += 1
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=client, args=(seed,)) for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    latencies.sort()
+    result = {
+        'predictions_per_s': round(len(latencies) / seconds),
+        'p50_us': round(statistics.median(latencies) * 1e6, 1),
+        'p99_us': round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+    }
+    if batcher is not None:
+        stats = batcher.stats()
+        result['mean_batch'] = stats['batch_size']['mean']
+        result['bypassed'] = stats['bypassed']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--io-ms', type=float, default=1.0)
+    parser.add_argument('--window-ms', type=float, default=2.0)
+    parser.add_argument('--sklearn', action='store_true', help='predict through sklearn instead of the compiled engine')
+    args = parser.parse_args()
+
+    if args.sklearn:
+        if loan_calculator.model is None:
+            parser.error('--sklearn needs the pickled model (remove model_artifacts/)')
+        loan_calculator.engine = SklearnInference(loan_calculator.model, loan_calculator.approved_class)
+
+    report = {}
+    for threads in args.threads:
+        batcher = MicroBatcher(
+            loan_calculator.get_ml_predictions, loan_calculator._predict_one, window=args.window_ms / 1000
+        )
+        report[threads] = {
+            'direct': run(threads, args.seconds, args.io_ms / 1000, None),
+            'microbatch': run(threads, args.seconds, args.io_ms / 1000, batcher),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
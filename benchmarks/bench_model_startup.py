@@ -0,0 +1,94 @@
+"""Startup benchmark: pickled model vs. exported mmap artifacts
+
+Each sample is a fresh interpreter (like a newly forked or recycled
+gunicorn worker) that imports what it needs and loads the model, then
+reports wall time and its own memory: RSS, and PSS, which splits shared
+pages across the processes mapping them.
+
+    python export_model_artifacts.py
+    python benchmarks/bench_model_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEMORY = '''
+def memory_kb():
+    usage = {}
+    for name in ('/proc/self/status', '/proc/self/smaps_rollup'):
+        try:
+            with open(name) as proc_file:
+                for line in proc_file:
+                    key, _, value = line.partition(':')
+                    if key in ('VmRSS', 'Pss'):
+                        usage[key] = int(value.split()[0])
+        except OSError:
+            pass
+    return usage
+'''
+
+LOADERS = {
+    'pickle': '''
+import joblib
+from encoders import MODEL_COLUMNS, FeatureEncoder, vocabularies_from_label_encoders
+from inference import compile_model
+model = joblib.load('loan_model.pkl')
+encoder = FeatureEncoder(vocabularies_from_label_encoders(joblib.load('label_encoders.pkl')),
+                         getattr(model, 'feature_names_in_', MODEL_COLUMNS))
+engine = compile_model(model, positive_class=encoder.approved_class)
+''',
+    'artifacts': '''
+from model_artifacts import load_artifacts
+artifacts = load_artifacts()
+assert artifacts is not None, 'run export_model_artifacts.py first'
+engine = artifacts.engine
+''',
+}
+
+BASELINE = 'import numpy'
+
+
+def sample(loader):
+    script = (
+        'import time\n'
+        f'{MEMORY}\n'
+        f'{BASELINE}\n'
+        'before = memory_kb()\n'
+        'start = time.perf_counter()\n'
+        f'{loader}\n'
+        'elapsed = time.perf_counter() - start\n'
+        'after = memory_kb()\n'
+        'import json\n'
+        "print(json.dumps({'seconds': elapsed, 'rss_kb': after.get('VmRSS'), 'pss_kb': after.get('Pss'),\n"
+        "                  'added_rss_kb': after.get('VmRSS', 0) - before.get('VmRSS', 0)}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', script], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    report = {}
+    for name, loader in LOADERS.items():
+        samples = [sample(loader) for _ in range(args.runs)]
+        report[name] = {
+            'load_ms_median': round(statistics.median(s['seconds'] for s in samples) * 1000, 1),
+            'rss_mb_median': round(statistics.median(s['rss_kb'] for s in samples) / 1024, 1),
+            'pss_mb_median': round(statistics.median(s['pss_kb'] or 0 for s in samples) / 1024, 1),
+            'added_rss_mb_median': round(statistics.median(s['added_rss_kb'] for s in samples) / 1024, 1),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
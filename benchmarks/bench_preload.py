@@ -0,0 +1,127 @@
+"""Benchmark: per-worker memory and boot time with and without preload_app
+
+Starts gunicorn (gunicorn.conf.py, sync workers) for each WORKERS count in
+three modes, waits until every worker has logged its boot time, sends
+some traffic so workers run garbage collections, then reads each worker's
+/proc/<pid>/smaps_rollup:
+
+    rss  resident pages, shared ones included
+    pss  proportional share: shared pages divided by the processes mapping them
+    uss  private (copied or never shared) pages
+
+    python export_model_artifacts.py   # optional: serve from artifacts
+    python benchmarks/bench_preload.py [--workers 2 4 8 16] [--requests 100]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'per_worker_import': {'PRELOAD_APP': 'false'},
+    'preload': {'PRELOAD_APP': 'true', 'PRELOAD_GC_FREEZE': 'false'},
+    'preload_gc_freeze': {'PRELOAD_APP': 'true', 'PRELOAD_GC_FREEZE': 'true'},
+}
+
+BOOTED = re.compile(r'Worker (\d+) booted in ([0-9.]+)s')
+
+APPLICATION = {
+    'bank_balance': 200000, 'cibil_score': 760, 'loan_amount': 500000, 'monthly_income': 60000,
+    'loan_tenure': 36, 'age': 30, 'employment_type': 'Permanent', 'income_source': 'Salary',
+    'existing_loans': 'No', 'emi_existing': 0, 'language': 'en',
+}
+
+
+def memory_kb(pid):
+    usage = {'rss': 0, 'pss': 0, 'uss': 0}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            key, _, value = line.partition(':')
+            if key == 'Rss':
+                usage['rss'] = int(value.split()[0])
+            elif key == 'Pss':
+                usage['pss'] = int(value.split()[0])
+            elif key in ('Private_Clean', 'Private_Dirty'):
+                usage['uss'] += int(value.split()[0])
+    return usage
+
+
+def post(port, path, body):
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{port}{path}', data=json.dumps(body).encode(), headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        response.read()
+
+
+def run(workers, mode, port, requests_per_worker, timeout=300):
+    env = dict(os.environ, WORKERS=str(workers), PORT=str(port), TRANSLATOR_BACKEND='stub', **MODES[mode])
+    started = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    boot_times = {}
+    try:
+        while len(boot_times) < workers:
+            line = server.stderr.readline()
+            if not line:
+                raise RuntimeError(f'gunicorn exited early ({mode}, {workers} workers)')
+            match = BOOTED.search(line)
+            if match:
+                boot_times[int(match.group(1))] = float(match.group(2))
+            if time.monotonic() - started > timeout:
+                raise RuntimeError('timed out waiting for workers')
+        all_ready = time.monotonic() - started
+        # Keep draining the log pipe so workers never block writing to it
+        threading.Thread(target=server.stderr.read, daemon=True).start()
+
+        for index in range(requests_per_worker * workers):
+            post(port, '/api/calculate_loan', APPLICATION)
+            post(port, '/api/chatbot', {'message': f'What CIBIL score do I need? #{index}', 'language': 'en'})
+        time.sleep(0.5)
+
+        usage = [memory_kb(pid) for pid in boot_times]
+        master = memory_kb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    def median_mb(key):
+        return round(statistics.median(u[key] for u in usage) / 1024, 1)
+
+    return {
+        'worker_boot_s_median': round(statistics.median(boot_times.values()), 3),
+        'all_workers_ready_s': round(all_ready, 2),
+        'worker_rss_mb': median_mb('rss'),
+        'worker_pss_mb': median_mb('pss'),
+        'worker_uss_mb': median_mb('uss'),
+        'total_pss_mb': round((sum(u['pss'] for u in usage) + master['pss']) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8, 16])
+    parser.add_argument('--requests', type=int, default=100, help='requests of each kind per worker')
+    parser.add_argument('--port', type=int, default=5099)
+    args = parser.parse_args()
+
+    report = {}
+    for workers in args.workers:
+        for mode in MODES:
+            report.setdefault(str(workers), {})[mode] = run(workers, mode, args.port, args.requests)
+            print(f'workers={workers} {mode}: {report[str(workers)][mode]}', file=sys.stderr)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
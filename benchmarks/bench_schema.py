@@ -0,0 +1,129 @@
+"""Micro-benchmark: request parsing and response serialization
+
+Parse: the previous path (stdlib ``json.loads``, the required-field loop of
+``validate_application``, then ``coerce_application``) against the schema
+path (``json_codec.loads``, ``Schema.parse`` with its per-field type checks,
+then ``coerce_application`` on already-typed values).
+
+Serialize: Flask's default provider against ``FastJSONProvider`` for the
+same response, and ``json.dumps`` against ``json_codec.dumps`` per NDJSON
+line of an amortization stream.
+
+Payloads: a typical single application and its result; a maximal 5000
+application batch and its results; 500 amortization scenarios with up to 354
+month schedules.
+
+    python benchmarks/bench_schema.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+
+import amortization  # noqa: E402
+import applicants  # noqa: E402
+import json_codec  # noqa: E402
+import rule_engine  # noqa: E402
+from json_codec import FastJSONProvider  # noqa: E402
+from schemas import application_schema  # noqa: E402
+
+LANGUAGES = tuple(applicants.LANGUAGES)
+SCHEMA = application_schema(LANGUAGES)
+REQUIRED_FIELDS = ['bank_balance', 'cibil_score', 'loan_amount', 'monthly_income',
+                   'loan_tenure', 'age', 'employment_type', 'income_source', 'existing_loans']
+
+
+def legacy_validate(data):
+    """validate_application as it was before the schema layer"""
+    if not isinstance(data, dict):
+        return 'Application must be a JSON object'
+    for field in REQUIRED_FIELDS:
+        if field not in data or data[field] == '' or data[field] is None:
+            return f'Missing required field: {field}'
+    return None
+
+
+def legacy_parse(body, key=None):
+    data = json.loads(body)
+    applications = data[key] if key else [data]
+    return [rule_engine.coerce_application(a) for a in applications if legacy_validate(a) is None]
+
+
+def schema_parse(body, key=None):
+    data = json_codec.loads(body)
+    applications = data[key] if key else [data]
+    return [rule_engine.coerce_application(SCHEMA.parse(a)) for a in applications]
+
+
+def best_of(stmt, number, repeat=7):
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def compare(old, new, number):
+    old_s, new_s = best_of(old, number), best_of(new, number)
+    return {'before_ms': round(old_s * 1000, 4), 'after_ms': round(new_s * 1000, 4), 'speedup': round(old_s / new_s, 2)}
+
+
+def main():
+    stdlib_app = Flask('stdlib')
+    fast_app = Flask('fast')
+    fast_app.json = FastJSONProvider(fast_app)
+
+    batch = applicants.generate(5000, languages=LANGUAGES)
+    rows = [rule_engine.coerce_application(a) for a in batch]
+    results = rule_engine.evaluate(rule_engine.columns_from_rows(rows))
+    entries = [{'success': True, 'result': results.result(i)} for i in range(len(batch))]
+
+    single_body = json.dumps(batch[0]).encode()
+    batch_body = json.dumps({'applications': batch}).encode()
+    assert legacy_parse(single_body) == schema_parse(single_body)
+    assert legacy_parse(batch_body, 'applications') == schema_parse(batch_body, 'applications')
+
+    single_response = {'success': True, 'result': entries[0]['result']}
+    batch_response = {'success': True, 'results': entries, 'summary': {'total': 5000, 'scored': 5000, 'failed': 0}}
+
+    def respond(app, payload):
+        with app.app_context():
+            return app.json.response(payload).get_data()
+
+    scenarios = list(amortization.iter_scenarios(
+        [float(a) for a in range(100000, 1100000, 40000)], list(range(12, 372, 18)), [12.0], 0.01
+    ))
+
+    report = {
+        'backend': json_codec.BACKEND,
+        'parse': {
+            'typical (1 application)': compare(lambda: legacy_parse(single_body), lambda: schema_parse(single_body), 2000),
+            'maximal (5000 application batch)': compare(
+                lambda: legacy_parse(batch_body, 'applications'), lambda: schema_parse(batch_body, 'applications'), 5
+            ),
+        },
+        'serialize': {
+            'typical (1 result)': compare(
+                lambda: respond(stdlib_app, single_response), lambda: respond(fast_app, single_response), 2000
+            ),
+            'maximal (5000 results)': compare(
+                lambda: respond(stdlib_app, batch_response), lambda: respond(fast_app, batch_response), 3
+            ),
+            f'amortization stream ({len(scenarios)} scenarios with schedules)': compare(
+                lambda: [json.dumps(s, separators=(',', ':')) + '\n' for s in scenarios],
+                lambda: [json_codec.dumps(s) + '\n' for s in scenarios],
+                3
+            ),
+        },
+        'bytes': {
+            'typical request': len(single_body),
+            'maximal request': len(batch_body),
+            'maximal response': len(respond(fast_app, batch_response)),
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
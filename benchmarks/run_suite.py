@@ -0,0 +1,272 @@
+"""Reproducible benchmark suite for the API endpoints
+
+Drives /api/calculate_loan, /api/chatbot and /api/translate through the
+Flask test client (in-process, no network) and through a real local
+gunicorn, with the stub translator standing in for Google Translate at a
+configurable latency, and micro-benchmarks preprocess_data,
+get_ml_prediction and LoanChatbot.get_response. Applicants come from
+applicants.py, which covers every scoring band and status.
+
+Results (throughput, p50/p95/p99 latency, environment and git commit) are
+written as JSON; compare two runs to spot regressions between commits:
+
+    python benchmarks/run_suite.py [--quick] [--output results.json]
+    python benchmarks/run_suite.py --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import applicants  # noqa: E402
+from bench_async_translate import free_port, wait_until_up  # noqa: E402
+
+CHATBOT_MESSAGES = [
+    'Hello, I need a loan',
+    'What CIBIL score do I need for a home loan?',
+    'How is EMI calculated?',
+    'Which documents are required?',
+    'What is the interest rate for a personal loan?',
+    'How much can I borrow with my income?',
+    'Can you tell me about the weather?',
+    'What is the eligibility for a loan?',
+]
+
+# Benchmark name -> route; request_bodies() builds the payloads
+ENDPOINTS = {
+    'calculate_loan': '/api/calculate_loan',
+    'chatbot': '/api/chatbot',
+    'translate': '/api/translate',
+}
+
+
+def summarize(latencies, elapsed, statuses=()):
+    """Throughput and latency percentiles (milliseconds) for one scenario
+
+    ``statuses`` are the HTTP status codes of the requests; their counts are
+    reported so a run that mostly measured 429s or 503s shows it.
+    """
+    ordered = sorted(latencies)
+    status_counts = Counter(statuses)
+
+    def percentile(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 4) if ordered else None
+
+    return {
+        'requests': len(ordered),
+        'errors': sum(count for status, count in status_counts.items() if status != 200),
+        'statuses': {str(status): count for status, count in sorted(status_counts.items())},
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(ordered) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 4) if ordered else None,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def request_bodies(endpoint, count, seed, languages):
+    if endpoint == 'calculate_loan':
+        return applicants.generate(count, seed, languages)
+    if endpoint == 'chatbot':
+        return [
+            {'message': CHATBOT_MESSAGES[i % len(CHATBOT_MESSAGES)], 'language': languages[i % len(languages)]}
+            for i in range(count)
+        ]
+    # Distinct texts, so every translation misses the caches and pays the stub latency
+    targets = [language for language in languages if language != 'en'] or ['hi']
+    return [
+        {'text': f'Your application #{seed}-{i} requires review', 'target_lang': targets[i % len(targets)]}
+        for i in range(count)
+    ]
+
+
+def configure_environment(args):
+    """Stub translator, no shared caches and no admission limits, set before the app is imported
+
+    Admission control would answer most of a sequential run with 429s (the
+    default translate bucket is 10/s), so the suite measures the endpoints
+    themselves; gunicorn inherits the same environment.
+    """
+    os.environ.update({
+        'ADMISSION_CONTROL': 'false',
+        'TRANSLATOR_BACKEND': 'stub',
+        'TRANSLATOR_STUB_LATENCY_MS': str(args.latency_ms),
+        'TRANSLATION_CACHE_PATH': '',
+        'TRANSLATION_CATALOG_PATH': os.devnull,
+        'LOG_LEVEL': 'WARNING',
+    })
+
+
+def run_client(args):
+    """Sequential requests through the Flask test client"""
+    from app import app
+
+    client = app.test_client()
+    report = {}
+    for endpoint, path in ENDPOINTS.items():
+        bodies = request_bodies(endpoint, args.requests, args.seed, args.languages)
+        client.post(path, json=bodies[0])  # warm-up
+        latencies, statuses = [], []
+        started = time.perf_counter()
+        for body in bodies:
+            request_started = time.perf_counter()
+            response = client.post(path, json=body)
+            latencies.append(time.perf_counter() - request_started)
+            statuses.append(response.status_code)
+        report[endpoint] = summarize(latencies, time.perf_counter() - started, statuses)
+    return report
+
+
+def post(port, path, body):
+    import http.client
+
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    started = time.perf_counter()
+    connection.request('POST', path, json.dumps(body), {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    return time.perf_counter() - started, response.status
+
+
+def run_gunicorn(args):
+    """Concurrent requests against a local gunicorn started from gunicorn.conf.py"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+         '--access-logfile', os.devnull, 'app:app'],
+        cwd=ROOT, env=dict(os.environ, WORKERS=str(args.workers), THREADS=str(args.threads)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    report = {'workers': args.workers, 'threads': args.threads, 'concurrency': args.concurrency}
+    try:
+        wait_until_up(port)
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            for endpoint, path in ENDPOINTS.items():
+                bodies = request_bodies(endpoint, args.requests, args.seed + 1, args.languages)
+                started = time.perf_counter()
+                results = list(pool.map(lambda body: post(port, path, body), bodies))
+                elapsed = time.perf_counter() - started
+                report[endpoint] = summarize(
+                    [latency for latency, _ in results], elapsed, [status for _, status in results]
+                )
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return report
+
+
+def time_calls(function, arguments, repeat):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for argument in arguments:
+            call_started = time.perf_counter()
+            function(argument)
+            latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def run_micro(args):
+    from app import loan_calculator, loan_chatbot
+
+    population = applicants.generate(256, args.seed)
+    language = next((lang for lang in args.languages if lang != 'en'), 'en')
+    return {
+        'preprocess_data': time_calls(loan_calculator.preprocess_data, population, args.micro_repeat),
+        'get_ml_prediction': time_calls(loan_calculator.get_ml_prediction, population, args.micro_repeat),
+        'chatbot_get_response_en': time_calls(lambda message: loan_chatbot.get_response(message, 'en'), CHATBOT_MESSAGES, args.micro_repeat * 32),
+        f'chatbot_get_response_{language}': time_calls(lambda message: loan_chatbot.get_response(message, language), CHATBOT_MESSAGES, args.micro_repeat * 32),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path):
+    """Print metric changes between two result files"""
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before, after = json.load(before_file), json.load(after_file)
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    for section in ('micro', 'client', 'gunicorn'):
+        for name, metrics in (after.get(section) or {}).items():
+            previous = (before.get(section) or {}).get(name)
+            if not isinstance(metrics, dict) or not isinstance(previous, dict):
+                continue
+            if metrics.get('errors') or previous.get('errors'):
+                print(f"{section:9} {name:28} statuses        {previous.get('statuses')} -> {metrics.get('statuses')}")
+            for metric in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+                old, new = previous.get(metric), metrics.get(metric)
+                if old and new is not None:
+                    print(f'{section:9} {name:28} {metric:15} {old:>12} -> {new:<12} {(new - old) / old:+.1%}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='requests per endpoint and mode')
+    parser.add_argument('--latency-ms', type=float, default=50, help='stub translator latency per call')
+    parser.add_argument('--languages', nargs='+', default=['en', 'hi', 'ta'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--micro-repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip', nargs='*', default=[], choices=['micro', 'client', 'gunicorn'])
+    parser.add_argument('--quick', action='store_true', help='small run for smoke-testing the suite')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    if args.quick:
+        args.requests, args.micro_repeat, args.latency_ms = 40, 2, min(args.latency_ms, 5)
+
+    configure_environment(args)
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('compare', 'output')},
+            'coverage': applicants.band_coverage(applicants.generate(args.requests, args.seed)),
+        }
+    }
+    for section, runner in (('micro', run_micro), ('client', run_client), ('gunicorn', run_gunicorn)):
+        if section not in args.skip:
+            report[section] = runner(args)
+            print(f'{section}: done', file=sys.stderr)
+
+    output = args.output or os.path.join(HERE, 'results', f'{commit or "local"}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as result_file:
+        json.dump(report, result_file, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f'Wrote {output}', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Pre-translate every static backend string into all supported languages
+
+Usage:
+    python build_translation_catalog.py            # uses Google Translate
+    python build_translation_catalog.py --stub     # offline, for tests/CI
+    python build_translation_catalog.py --check    # offline: is the file complete and current?
+
+Writes translation_catalog.json (or --output), which app.py loads once at
+startup so chatbot answers and eligibility texts need no translation calls.
+Building needs network access, so it is a release step of its own; the
+Docker build only runs ``--check``.
+"""
+import argparse
+import hashlib
+import logging
+import sys
+
+from translation_catalog import DEFAULT_CATALOG_PATH, TranslationCatalog, build_catalog, write_catalog
+from stub_translator import StubTranslator
+
+
+def collect_static_strings():
+    """Chatbot knowledge base, general responses and scoring policy texts"""
+    from app import loan_chatbot
+    from scoring_policy import policy_store
+
+    return loan_chatbot.static_strings() + policy_store.current().static_strings()
+
+
+def catalog_version(strings, stub=False):
+    """Version of a catalog for these strings: changes whenever any of them does"""
+    version = hashlib.sha256('\n'.join(sorted(set(strings))).encode('utf-8')).hexdigest()[:12]
+    return f'stub-{version}' if stub else version
+
+
+def check_catalog(path, strings, languages, version):
+    """Problems that keep the catalog at ``path`` from serving every string, or []"""
+    catalog = TranslationCatalog.load(path)
+    if not len(catalog):
+        return [f'{path} is missing or empty']
+    if catalog.version != version:
+        return [f'{path} is stale: built for {catalog.version}, current strings are {version}']
+    missing = sum(
+        catalog.entries.get(lang, {}).get(text) is None
+        for lang in languages if lang != 'en' for text in set(strings) if text
+    )
+    return [f'{path} is missing {missing} translations'] if missing else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stub', action='store_true', help='use the offline stub translator')
+    parser.add_argument('--check', action='store_true', help='verify an existing catalog instead of building one')
+    parser.add_argument('--output', default=DEFAULT_CATALOG_PATH, help='catalog file to write (or check)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    from app import Translator
+
+    strings = collect_static_strings()
+    version = catalog_version(strings, args.stub)
+    if args.check:
+        problems = check_catalog(args.output, strings, Translator.LANGUAGES.values(), version)
+        for problem in problems:
+            logging.error(problem)
+        if not problems:
+            logging.info(f"{args.output} covers all {len(set(strings))} static strings ({version})")
+        return 1 if problems else 0
+
+    if args.stub:
+        backend_factory = lambda lang: StubTranslator(source="auto", target=lang)
+    else:
+        from deep_translator import GoogleTranslator
+        backend_factory = lambda lang: GoogleTranslator(source="auto", target=lang)
+
+    document = build_catalog(strings, Translator.LANGUAGES.values(), backend_factory, version)
+    write_catalog(document, args.output)
+
+    missing = sum(translation is None for translations in document['languages'].values() for translation in translations)
+    logging.info(f"Wrote {args.output}: {len(document['source'])} strings, {len(document['languages'])} languages, {missing} failed")
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""Stream applicant files through the batch scoring path
+
+Usage:
+    python bulk_score.py applicants.csv > scores.ndjson
+    python bulk_score.py applicants.ndjson.gz --workers 0 --output-format csv -o scores.csv
+    cat applicants.ndjson | python bulk_score.py - --format ndjson
+
+Reads CSV (with a header row) or NDJSON one record at a time, scores
+fixed-size chunks with ``LoanCalculator.calculate_eligibility_batch`` (one
+vectorized model call and one rule-engine pass per chunk) and writes one
+output record per input row, in input order. Only a few chunks are in memory
+at any time, so memory use does not grow with the file.
+
+``--workers N`` shards chunks over N processes (0 = one per core); results
+are still written in input order. Progress (rows, rows/s, failures) goes to
+stderr every ``--progress`` seconds, followed by a JSON summary. The same
+reader, scorer and writer serve ``POST /api/calculate_loan/stream``.
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import json_codec
+
+FORMATS = ('csv', 'ndjson')
+DEFAULT_CHUNK_SIZE = 1000
+
+# Result fields written as CSV columns (reasons are joined with '; ')
+CSV_COLUMNS = ('row', 'id', 'success', 'error', 'status', 'eligibility_score',
+               'estimated_emi', 'emi_ratio', 'recommendation', 'reasons')
+
+MIMETYPES = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def detect_format(path):
+    """Input format from a file name (``.csv``, ``.ndjson``, ``.jsonl``, optionally ``.gz``)"""
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return None
+
+
+def open_text(path, mode='r'):
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def read_records(lines, input_format):
+    """Yield one application per CSV row or NDJSON line, lazily
+
+    Empty CSV cells are left out, so optional fields take their defaults
+    and required ones are reported missing. An NDJSON line that is not a
+    JSON object yields None, which fails validation for that row only.
+    """
+    if input_format == 'csv':
+        for row in csv.DictReader(lines):
+            yield {key: value for key, value in row.items() if key is not None and value not in ('', None)}
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json_codec.loads(line)
+        except ValueError:
+            yield None
+
+
+def chunked(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def csv_header():
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_COLUMNS)
+    return buffer.getvalue()
+
+
+def default_calculator():
+    """The app's LoanCalculator, imported on first use"""
+    from app import loan_calculator
+    return loan_calculator
+
+
+class ChunkScorer:
+    """Scores one chunk and renders its output records as a single string"""
+
+    def __init__(self, output_format='ndjson', id_field='id', calculator=None):
+        self.output_format = output_format
+        self.id_field = id_field
+        self.calculator = calculator
+
+    def __call__(self, first_row, applications):
+        """Returns ``(text, rows, failed)`` for rows numbered from ``first_row``"""
+        if self.calculator is None:
+            self.calculator = default_calculator()
+        entries = self.calculator.calculate_eligibility_batch(applications)
+        records = []
+        failed = 0
+        for row, (application, entry) in enumerate(zip(applications, entries), first_row):
+            record = {'row': row}
+            if self.id_field and isinstance(application, dict) and self.id_field in application:
+                record['id'] = application[self.id_field]
+            record.update(entry)
+            failed += not entry['success']
+            records.append(record)
+        return self.render(records), len(records), failed
+
+    def render(self, records):
+        if self.output_format == 'ndjson':
+            return ''.join(json_codec.dumps(record) + '\n' for record in records)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            result = record.get('result', {})
+            writer.writerow([
+                record['row'], record.get('id', ''), record['success'], record.get('error', ''),
+                result.get('status', ''), result.get('eligibility_score', ''), result.get('estimated_emi', ''),
+                result.get('emi_ratio', ''), result.get('recommendation', ''), '; '.join(result.get('reasons', ())),
+            ])
+        return buffer.getvalue()
+
+
+_worker_scorer = None
+
+
+def _init_worker(output_format, id_field):
+    global _worker_scorer
+    import app
+    # Threads (log writer, metrics flusher) do not survive fork()
+    app.after_fork()
+    _worker_scorer = ChunkScorer(output_format, id_field, app.loan_calculator)
+
+
+def _score_in_worker(first_row, applications):
+    return _worker_scorer(first_row, applications)
+
+
+def score_stream(records, scorer, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """Yield ``(text, rows, failed)`` per chunk, in input order
+
+    With ``workers > 1`` chunks are scored in a process pool; at most two
+    chunks per worker are in flight, which bounds memory and keeps the
+    output ordered.
+    """
+    chunks = chunked(records, chunk_size)
+    first_row = 1
+    if workers <= 1:
+        for chunk in chunks:
+            yield scorer(first_row, chunk)
+            first_row += len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(scorer.output_format, scorer.id_field)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_in_worker, first_row, chunk))
+            first_row += len(chunk)
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class Progress:
+    """Rows and throughput so far, reported every ``interval`` seconds"""
+
+    def __init__(self, stream=None, interval=5.0):
+        self.stream = stream
+        self.interval = interval
+        self.rows = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._reported = self.started
+
+    def update(self, rows, failed):
+        self.rows += rows
+        self.failed += failed
+        now = time.perf_counter()
+        if self.stream is not None and self.interval and now - self._reported >= self.interval:
+            self._reported = now
+            summary = self.summary()
+            print(f"{summary['rows']} rows, {summary['rows_per_second']} rows/s, {summary['failed']} failed", file=self.stream, flush=True)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'rows': self.rows,
+            'scored': self.rows - self.failed,
+            'failed': self.failed,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help="CSV or NDJSON file (optionally .gz), or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="output file (optionally .gz), default stdout")
+    parser.add_argument('--format', choices=FORMATS, help='input format (default: from the file name)')
+    parser.add_argument('--output-format', choices=FORMATS, default='ndjson')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='applications scored per vectorized call')
+    parser.add_argument('--workers', type=int, default=1, help='scoring processes (0 = one per core)')
+    parser.add_argument('--id-field', default='id', help='input field copied to each output record')
+    parser.add_argument('--progress', type=float, default=5.0, help='seconds between progress lines (0 = off)')
+    args = parser.parse_args(argv)
+
+    input_format = args.format or detect_format(args.input)
+    if input_format is None:
+        parser.error('cannot tell the input format from the file name; pass --format')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be positive')
+    workers = args.workers or os.cpu_count() or 1
+
+    # Scoring only: no chatbot warm-up, per-request batching or info logs
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.setdefault('CHATBOT_WARMUP', 'false')
+    os.environ.setdefault('ML_MICROBATCH', 'false')
+    scorer = ChunkScorer(args.output_format, args.id_field, default_calculator())
+
+    progress = Progress(sys.stderr, args.progress)
+    source, sink = open_text(args.input), open_text(args.output, 'w')
+    try:
+        if args.output_format == 'csv':
+            sink.write(csv_header())
+        for text, rows, failed in score_stream(read_records(source, input_format), scorer, args.chunk_size, workers):
+            sink.write(text)
+            progress.update(rows, failed)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        else:
+            sink.flush()
+
+    print(json.dumps(dict(progress.summary(), workers=workers)), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""Test environment: stub translator, no disk translation cache, no admission limits
+
+Set before any test module imports ``app``, which reads its configuration at
+import time. Values already in the environment win.
+"""
+import os
+
+os.environ.setdefault('TRANSLATOR_BACKEND', 'stub')
+os.environ.setdefault('TRANSLATION_CACHE_PATH', '')
+os.environ.setdefault('ADMISSION_CONTROL', 'false')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
@@ -0,0 +1,199 @@
+"""Counterfactual search: which value of one field reaches a better status
+
+For a scored application, find for example the largest ``loan_amount``, the
+shortest ``loan_tenure`` or the lowest ``cibil_score`` that still earns a
+target status (by default the next band above the current one), keeping
+every other field fixed. The status comes from the same rule engine and
+model as ``calculate_eligibility``.
+
+Each search is a k-ary bisection: a pass scores ``sweep`` evenly spaced
+candidates over the remaining interval, keeps the best one that reaches the
+target, and narrows the interval to the gap next to it. The candidates of all
+requested fields are scored together, one vectorized rule pass and one model
+call per pass, so a query costs a handful of passes instead of hundreds of
+``calculate_eligibility`` calls. Every reported value was itself scored, so
+it is a real witness even where the combined score is not monotone.
+
+A hard budget caps the work per request: at most ``max_evaluations``
+candidates and ``time_budget`` seconds. A search cut short reports the best
+value found so far with ``exact: false``.
+"""
+import time
+from collections import namedtuple
+
+import rule_engine
+from scoring_policy import policy_store
+
+# direction: 'max' wants the largest passing value, 'min' the smallest;
+# values are searched in multiples of ``step`` between ``low`` and ``high``
+Variable = namedtuple('Variable', ['field', 'direction', 'step', 'low', 'high'])
+
+MAX_TENURE_MONTHS = 360
+
+VARIABLES = {
+    'loan_amount': Variable('loan_amount', 'max', 100, 100, None),
+    'loan_tenure': Variable('loan_tenure', 'min', 1, 1, MAX_TENURE_MONTHS),
+    'cibil_score': Variable('cibil_score', 'min', 1, 300, 900),
+}
+
+
+class FieldSearch:
+    """Remaining interval (in steps) and best passing value for one field"""
+
+    def __init__(self, variable, low, high):
+        self.variable = variable
+        self.low = low
+        self.high = high
+        self.best = None
+        self.best_score = None
+        self.done = low > high
+        self.exact = False
+
+    def candidates(self, count):
+        span = self.high - self.low
+        if span + 1 <= count:
+            return list(range(self.low, self.high + 1))
+        return sorted({self.low + round(span * i / (count - 1)) for i in range(count)})
+
+    def update(self, units, passing, scores):
+        """Keep the best passing candidate and narrow to the gap next to it"""
+        maximize = self.variable.direction == 'max'
+        hits = [i for i, ok in enumerate(passing) if ok]
+        if not hits:
+            # Nothing in range reaches the target (or nothing better than the best so far)
+            self.done = True
+            self.exact = True
+            return
+        j = hits[-1] if maximize else hits[0]
+        self.best, self.best_score = units[j], scores[j]
+        if maximize:
+            self.low, self.high = units[j] + 1, units[j + 1] - 1 if j + 1 < len(units) else units[j]
+        else:
+            self.low, self.high = units[j - 1] + 1 if j > 0 else units[j], units[j] - 1
+        if self.low > self.high:
+            self.done = True
+            self.exact = True
+
+    def value(self, units):
+        value = units * self.variable.step
+        return float(value) if self.variable.field == 'loan_amount' else int(value)
+
+
+class CounterfactualSearch:
+    """Batched counterfactual queries against ``predict`` (LoanCalculator.get_ml_predictions)"""
+
+    def __init__(self, predict=None, sweep=64, max_evaluations=4096, time_budget=0.05):
+        self.predict = predict
+        self.sweep = max(3, sweep)
+        self.max_evaluations = max_evaluations
+        self.time_budget = time_budget
+
+    def _score(self, applications, rows, policy):
+        predictions = self.predict(applications) if self.predict else None
+        evaluation = rule_engine.evaluate(rule_engine.columns_from_rows(rows), predictions, policy)
+        status = evaluation.status.tolist()
+        scores = evaluation.scores.tolist()
+        invalid = evaluation.invalid.tolist()
+        return [(None if bad else level, score) for level, score, bad in zip(status, scores, invalid)]
+
+    def _bounds(self, variable, row, policy):
+        if variable.field == 'loan_amount':
+            # Up to twice the larger of the request and the income-based limit
+            loan_amount, monthly_income = row[2], row[3]
+            high = 2 * max(loan_amount, monthly_income * policy.income_multiplier)
+            return variable.low // variable.step, int(high // variable.step)
+        return variable.low // variable.step, variable.high // variable.step
+
+    def search(self, data, fields=None, target_status=None, policy=None):
+        """Counterfactual values of ``fields`` for one validated application
+
+        Raises ValueError for unusable field values, unknown fields or an
+        unknown ``target_status``.
+        """
+        started = time.perf_counter()
+        policy = policy or policy_store.current()
+        if isinstance(fields, str):
+            fields = [fields]
+        elif fields is None or fields == []:
+            fields = list(VARIABLES)
+        elif not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+            raise ValueError('fields must be a field name or a list of field names')
+        unknown = [field for field in fields if field not in VARIABLES]
+        if unknown:
+            raise ValueError(f"Unsupported fields: {', '.join(unknown)}; choose from {', '.join(VARIABLES)}")
+        names = [status for status, _, _ in policy.statuses]
+        if target_status is not None and target_status not in names:
+            raise ValueError(f"Unknown target_status; choose from {', '.join(names)}")
+
+        try:
+            base = rule_engine.coerce_application(data)
+        except (TypeError, OverflowError, ValueError):
+            raise ValueError('Invalid input data provided')
+        (current_level, current_score), = self._score([data], [base], policy)
+        if current_level is None:
+            raise ValueError('loan_tenure and monthly_income must be non-zero')
+        # Band 0 is the best status; by default aim one band higher
+        target = names.index(target_status) if target_status is not None else max(current_level - 1, 0)
+
+        searches = [FieldSearch(VARIABLES[field], *self._bounds(VARIABLES[field], base, policy)) for field in fields]
+        columns = rule_engine.COLUMNS
+        evaluations = 1
+        passes = 0
+        exhausted = False
+        while True:
+            active = [search for search in searches if not search.done]
+            if not active:
+                break
+            remaining = self.max_evaluations - evaluations
+            per_field = min(self.sweep, remaining // len(active))
+            if per_field < 2 or time.perf_counter() - started > self.time_budget:
+                exhausted = True
+                break
+
+            applications, rows, plan = [], [], []
+            for search in active:
+                field = search.variable.field
+                index = columns.index(field)
+                units = search.candidates(per_field)
+                for unit in units:
+                    value = search.value(unit)
+                    applications.append(dict(data, **{field: value}))
+                    rows.append(base[:index] + (value,) + base[index + 1:])
+                plan.append((search, units))
+            outcomes = self._score(applications, rows, policy)
+            evaluations += len(rows)
+            passes += 1
+
+            offset = 0
+            for search, units in plan:
+                chunk = outcomes[offset:offset + len(units)]
+                offset += len(units)
+                search.update(
+                    units,
+                    [level is not None and level <= target for level, _ in chunk],
+                    [score for _, score in chunk]
+                )
+
+        results = {}
+        for search in searches:
+            field = search.variable.field
+            found = search.best is not None
+            results[field] = {
+                'goal': 'maximum' if search.variable.direction == 'max' else 'minimum',
+                'current': data.get(field),
+                'found': found,
+                'value': search.value(search.best) if found else None,
+                'eligibility_score': round(search.best_score, 2) if found else None,
+                'exact': search.exact,
+            }
+
+        return {
+            'current_status': names[current_level],
+            'current_score': round(current_score, 2),
+            'target_status': names[target],
+            'counterfactuals': results,
+            'evaluations': evaluations,
+            'passes': passes,
+            'budget_exhausted': exhausted,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+        }
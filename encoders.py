@@ -0,0 +1,162 @@
+"""Feature encoding for the loan approval model
+
+``label_encoders.pkl`` holds one sklearn ``LabelEncoder`` per categorical
+training column (``Gender``, ``Income_Source``...). Only their vocabularies
+(the sorted ``classes_``) matter: a label's code is its index. Each
+vocabulary is compiled into a plain dict from label to code, so encoding a
+value is a single dict lookup instead of a trip through
+``LabelEncoder.transform``.
+
+The request fields (``income_source``, ``loan_amount``...) do not share names
+with the training columns, so ``FIELD_MAP`` maps every model column to its
+API field explicitly. Values the encoders never saw (or fields the API does
+not collect) are encoded as the midpoint code and counted in ``stats()``
+instead of raising.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Model column -> (API field, default when the field is absent)
+FIELD_MAP = {
+    'Age': ('age', 0),
+    'Gender': ('gender', None),
+    'Bank_Balance': ('bank_balance', 0),
+    'CIBIL_Score': ('cibil_score', 0),
+    'Existing_Loans': ('existing_loans', None),
+    'Loan_Amount_Requested': ('loan_amount', 0),
+    'Loan_Tenure_Months': ('loan_tenure', 0),
+    'Monthly_Income': ('monthly_income', 0),
+    'Income_Source': ('income_source', None),
+    'Employment_Type': ('employment_type', None),
+    'Other_Loans': ('other_loans', 0),
+    'EMI_Existing_Loans': ('emi_existing', 0),
+}
+
+# Column order the shipped model was trained with
+MODEL_COLUMNS = tuple(FIELD_MAP)
+
+# Form values that name a training category differently
+VALUE_ALIASES = {
+    'Employment_Type': {
+        'Permanent': 'Salaried',
+        'Contract': 'Salaried',
+        'Government': 'Salaried',
+        'Business': 'Self-employed',
+    },
+    'Income_Source': {
+        'Investment': 'Rental',
+    },
+}
+
+TARGET_COLUMN = 'Loan_Status'
+APPROVED_LABEL = 'Approved'
+
+
+class CategoryTable:
+    """Label -> code lookup compiled from one encoder vocabulary"""
+
+    def __init__(self, column, classes, aliases=None):
+        self.column = column
+        self.codes = {label: float(code) for code, label in enumerate(classes)}
+        for alias, label in (aliases or {}).items():
+            if label in self.codes:
+                self.codes.setdefault(alias, self.codes[label])
+        # Unknown values sit halfway between the known codes
+        self.fallback = (len(classes) - 1) / 2
+        self.unseen = 0
+        self.missing = 0
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            if value is None or value == '':
+                self.missing += 1
+            else:
+                self.unseen += 1
+            return self.fallback
+        return code
+
+    def encode_column(self, values):
+        codes = self.codes
+        encoded = [codes.get(value) for value in values]
+        if None in encoded:
+            encoded = [self.encode(value) if code is None else code for value, code in zip(values, encoded)]
+        return encoded
+
+
+def _number(value, default):
+    return float(default if value is None or value == '' else value)
+
+
+def vocabularies_from_label_encoders(label_encoders):
+    """Column -> list of labels, in code order, from fitted LabelEncoders"""
+    return {column: encoder.classes_.tolist() for column, encoder in label_encoders.items()}
+
+
+class FeatureEncoder:
+    """Turn application dicts into model feature rows"""
+
+    def __init__(self, vocabularies, columns=MODEL_COLUMNS):
+        self.columns = tuple(columns)
+        unknown = [column for column in self.columns if column not in FIELD_MAP]
+        if unknown:
+            raise ValueError(f"No API field mapped to model columns: {', '.join(unknown)}")
+
+        self.tables = {}
+        for column in self.columns:
+            vocabulary = vocabularies.get(column)
+            if vocabulary is not None:
+                self.tables[column] = CategoryTable(column, list(vocabulary), VALUE_ALIASES.get(column))
+            elif FIELD_MAP[column][1] is None:
+                raise ValueError(f"Categorical column {column} has no encoder vocabulary")
+
+        # Code of the approved outcome in the model's target encoding
+        target = vocabularies.get(TARGET_COLUMN)
+        self.approved_class = list(target).index(APPROVED_LABEL) if target is not None else 1
+
+        self._plan = [(FIELD_MAP[column][0], FIELD_MAP[column][1], self.tables.get(column)) for column in self.columns]
+
+    def encode_row(self, data):
+        """Encode one application; raises ValueError/TypeError on bad numbers"""
+        return [
+            table.encode(data.get(field)) if table is not None else _number(data.get(field), default)
+            for field, default, table in self._plan
+        ]
+
+    def encode_rows(self, applications):
+        """Encode many applications column by column
+
+        Returns ``(features, row_indexes)``: a float64 matrix and the indexes
+        of the applications it holds; rows with unusable numbers are skipped.
+        """
+        features = np.empty((len(applications), len(self._plan)), dtype=np.float64)
+        valid = np.ones(len(applications), dtype=bool)
+        for j, (field, default, table) in enumerate(self._plan):
+            values = [data.get(field) for data in applications]
+            if table is not None:
+                features[:, j] = table.encode_column(values)
+                continue
+            try:
+                features[:, j] = [default if value is None or value == '' else value for value in values]
+            except (TypeError, ValueError):
+                # Slow path only for columns holding something unconvertible
+                for i, value in enumerate(values):
+                    try:
+                        features[i, j] = _number(value, default)
+                    except (TypeError, ValueError):
+                        features[i, j] = 0.0
+                        valid[i] = False
+        row_indexes = np.flatnonzero(valid)
+        if len(row_indexes) < len(applications):
+            features = features[valid]
+        return features, row_indexes.tolist()
+
+    def stats(self):
+        return {
+            'columns': len(self.columns),
+            'unseen': {column: table.unseen for column, table in self.tables.items()},
+            'missing': {column: table.missing for column, table in self.tables.items()},
+        }
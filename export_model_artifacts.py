@@ -0,0 +1,40 @@
+"""Export the pickled model and label encoders to the flat artifact layout
+
+Usage:
+    python export_model_artifacts.py                 # writes model_artifacts/
+    python export_model_artifacts.py --output DIR
+
+Needs scikit-learn (to unpickle); the server then loads the exported
+directory with NumPy alone. Re-run whenever loan_model.pkl or
+label_encoders.pkl change: stale artifacts are ignored at startup.
+"""
+import argparse
+import logging
+import sys
+
+import joblib
+
+from model_artifacts import DEFAULT_ARTIFACTS_PATH, ENCODERS_PATH, MODEL_PATH, export_artifacts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=DEFAULT_ARTIFACTS_PATH, help='artifact directory to write')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    model = joblib.load(MODEL_PATH)
+    label_encoders = joblib.load(ENCODERS_PATH)
+
+    try:
+        manifest = export_artifacts(model, label_encoders, args.output)
+    except ValueError as e:
+        logging.error(f"Cannot export model artifacts: {str(e)}")
+        return 1
+
+    logging.info(f"Wrote {args.output}: {manifest['model_type']}, {len(manifest['columns'])} columns, fingerprint {manifest['fingerprint']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
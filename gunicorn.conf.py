@@ -1,5 +1,10 @@
 import os
 
+from gunicorn_hooks import (  # noqa: F401
+    child_exit, configure_admission, configure_metrics, configure_preload, configure_result_cache, post_fork,
+    post_worker_init, pre_fork, when_ready, worker_exit
+)
+
 # Server socket
 bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
 backlog = 2048
@@ -7,6 +12,8 @@ backlog = 2048
 # Worker processes
 workers = int(os.getenv('WORKERS', '2'))
 worker_class = "sync"
+# THREADS > 1 switches to gthread workers; concurrent ML predictions are then micro-batched
+threads = int(os.getenv('THREADS', '1'))
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -15,6 +22,23 @@ keepalive = 2
 max_requests = 1000
 max_requests_jitter = 50
 
+# Load the app (model, knowledge base, compiled tables) once in the master and
+# fork workers from it, sharing those pages copy-on-write; recycled workers are
+# re-forked from the same image. PRELOAD_APP=false imports the app per worker.
+preload_app = configure_preload()
+
+# Workers share metrics through files in PROMETHEUS_MULTIPROC_DIR (a fresh
+# temporary directory unless set); /metrics on any worker reports them all
+configure_metrics()
+
+# Admission control buckets and in-flight counts, shared by all workers
+# through a memory-mapped file in ADMISSION_STATE_PATH (fresh per start)
+configure_admission()
+
+# One HMAC key for the shared result cache in every worker (generated per
+# start unless RESULT_CACHE_SECRET or SECRET_KEY is set)
+configure_result_cache()
+
 # Logging
 accesslog = "-"  # Log to stdout
 errorlog = "-"   # Log to stderr
@@ -0,0 +1,56 @@
+import os
+
+from gunicorn_hooks import (  # noqa: F401
+    child_exit, configure_admission, configure_metrics, configure_preload, configure_result_cache, post_fork,
+    post_worker_init, pre_fork, when_ready, worker_exit
+)
+
+# Async (ASGI) serving mode: one event loop per worker overlaps slow
+# translation I/O, so throughput scales with concurrency, not workers.
+#   gunicorn --config gunicorn_asgi.conf.py asgi:application
+
+# Server socket
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+backlog = 2048
+
+# Worker processes
+workers = int(os.getenv('WORKERS', '2'))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 30
+keepalive = 2
+
+# Restart workers after this many requests, to prevent memory leaks
+max_requests = 1000
+max_requests_jitter = 50
+
+# Load the app (model, knowledge base, compiled tables) once in the master and
+# fork workers from it, sharing those pages copy-on-write; recycled workers are
+# re-forked from the same image. PRELOAD_APP=false imports the app per worker.
+preload_app = configure_preload()
+
+# Workers share metrics through files in PROMETHEUS_MULTIPROC_DIR (a fresh
+# temporary directory unless set); /metrics on any worker reports them all
+configure_metrics()
+
+# Admission control buckets and in-flight counts, shared by all workers
+# through a memory-mapped file in ADMISSION_STATE_PATH (fresh per start)
+configure_admission()
+
+# One HMAC key for the shared result cache in every worker (generated per
+# start unless RESULT_CACHE_SECRET or SECRET_KEY is set)
+configure_result_cache()
+
+# Logging
+accesslog = "-"  # Log to stdout
+errorlog = "-"   # Log to stderr
+loglevel = "info"
+
+# Process naming
+proc_name = "cibil_score_app_asgi"
+
+# Server mechanics
+daemon = False
+pidfile = "/tmp/gunicorn_asgi.pid"
+user = None
+group = None
+tmp_upload_dir = None
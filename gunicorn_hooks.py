@@ -0,0 +1,139 @@
+"""Server hooks shared by gunicorn.conf.py and gunicorn_asgi.conf.py
+
+With ``preload_app`` the master imports the application once (Flask, NumPy,
+the model artifacts, the chatbot knowledge base and keyword tables, the
+compiled scoring policy, the translation catalog...) and every worker is
+forked from it, sharing those pages copy-on-write.
+
+CPython defeats copy-on-write in two ways: reference count updates write to
+every object a worker touches, and each garbage collection pass writes GC
+headers of every tracked object. Refcount writes are unavoidable, but GC
+writes are not: the master keeps the collector disabled while it preloads
+and calls ``gc.freeze()`` once the app is loaded and again right before each
+fork, which moves all existing objects into a permanent generation that
+collections never visit. The master then collects normally again, and so do
+the workers.
+
+Metrics (metrics.py) are aggregated across workers through prometheus_client's
+multiprocess mode: every process writes its own files under
+``PROMETHEUS_MULTIPROC_DIR``, which must be set, and emptied of a previous
+run's files, before anything imports prometheus_client.
+
+Admission control (admission.py) keeps its token buckets and in-flight counts
+in one memory-mapped file, ``ADMISSION_STATE_PATH``, which is reset at every
+start; when a worker dies, the master releases the requests it held. Workers
+also watch the listen backlog of the sockets they accept from.
+
+The shared result cache (result_cache.py) keys entries with an HMAC secret
+that every worker must agree on; without ``RESULT_CACHE_SECRET`` or
+``SECRET_KEY``, the master generates one for this run.
+"""
+import gc
+import glob
+import os
+import secrets
+import tempfile
+import time
+
+PRELOAD_APP = os.getenv('PRELOAD_APP', 'true').lower() == 'true'
+GC_FREEZE = os.getenv('PRELOAD_GC_FREEZE', 'true').lower() == 'true'
+
+
+def configure_metrics():
+    """Called at config load: give this server a clean multiprocess metrics directory"""
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if not directory:
+        directory = os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='loan_app_metrics_')
+    os.makedirs(directory, exist_ok=True)
+    for stale in glob.glob(os.path.join(directory, '*.db')):
+        os.remove(stale)
+    return directory
+
+
+def configure_admission():
+    """Called at config load: give this server an empty admission control state file"""
+    path = os.getenv('ADMISSION_STATE_PATH')
+    if not path:
+        path = os.environ['ADMISSION_STATE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='loan_app_admission_'), 'state')
+    # Workers lay it out on first use
+    with open(path, 'wb'):
+        pass
+    return path
+
+
+def configure_result_cache():
+    """Called at config load: give the shared result cache one key for every worker
+
+    Workers inherit the master's environment whether or not the app is
+    preloaded. A generated key lasts for this run only: entries written
+    under a previous one are never matched and age out of the file.
+    """
+    if os.getenv('RESULT_CACHE_PATH') and not (os.getenv('RESULT_CACHE_SECRET') or os.getenv('SECRET_KEY')):
+        os.environ['RESULT_CACHE_SECRET'] = secrets.token_hex(32)
+    return os.getenv('RESULT_CACHE_SECRET')
+
+
+def configure_preload():
+    """Called at config load, before the master imports the app"""
+    if PRELOAD_APP and GC_FREEZE:
+        # Nothing allocated during preload should be scanned (and dirtied) by a collection
+        gc.disable()
+    return PRELOAD_APP
+
+
+def when_ready(server):
+    # The app is loaded: freeze it, then let the long-lived master collect its
+    # own garbage again (pre_fork freezes whatever it allocates before each fork)
+    if PRELOAD_APP and GC_FREEZE:
+        gc.freeze()
+        gc.enable()
+
+
+def pre_fork(server, worker):
+    if PRELOAD_APP and GC_FREEZE:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    worker.forked_at = time.monotonic()
+    if not PRELOAD_APP:
+        return
+    if GC_FREEZE:
+        gc.enable()
+    from app import after_fork
+
+    after_fork()
+
+
+def post_worker_init(worker):
+    # The app is loaded by now: let admission control see the listen backlog
+    from app import admission_control
+
+    admission_control.watch(worker.sockets)
+    booted_in = time.monotonic() - getattr(worker, 'forked_at', time.monotonic())
+    worker.log.info(
+        f"Worker {worker.pid} booted in {booted_in:.3f}s "
+        f"(preload={PRELOAD_APP}, gc_freeze={PRELOAD_APP and GC_FREEZE}, frozen={gc.get_freeze_count()})"
+    )
+
+
+def worker_exit(server, worker):
+    # Push counts recorded since the last periodic flush, and queued log
+    # records, before the worker goes away
+    import log_pipeline
+    from metrics import metrics
+
+    metrics.flush()
+    log_pipeline.flush()
+
+
+def child_exit(server, worker):
+    # A worker killed mid-request (e.g. by the timeout) never released its slots
+    from admission import release_worker
+
+    release_worker(worker.pid)
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,165 @@
+"""Compiled inference for the loan approval model
+
+``compile_model`` turns a fitted binary ``LogisticRegression`` into a
+``LogisticInference``: the coefficients and intercept are copied once into
+a contiguous float64 array, and a prediction is one dot product plus a
+sigmoid with the class taken from that same decision value. This skips
+sklearn's per-call input validation and feature-name checks, and the
+second pass that calling both ``predict_proba`` and ``predict`` used to
+cost.
+
+Any other model type is wrapped in ``SklearnInference``, which exposes the
+same interface on top of a single ``predict_proba`` call.
+"""
+import logging
+import math
+import warnings
+from operator import mul
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# sklearn scores a binary model either one-vs-rest, p = expit(d), or as a
+# two-class softmax over [-d, d], which is p = expit(2 * d). Which one a
+# pickled model gets depends on its multi_class setting *and* the installed
+# sklearn version, so the scale is calibrated against the model at load time.
+CANDIDATE_SCALES = (1.0, 2.0)
+
+PARITY_TOLERANCE = 1e-12
+
+
+def expit(z):
+    """Vectorized logistic function, computed as scipy.special.expit does"""
+    with np.errstate(over='ignore'):
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+def _sigmoid(z):
+    """Scalar logistic function that never overflows"""
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+class SklearnInference:
+    """Fallback engine: one predict_proba call, class from its argmax"""
+
+    kind = 'sklearn'
+
+    def __init__(self, model, positive_class=None):
+        self.model = model
+        self.classes = model.classes_
+        classes = list(self.classes)
+        self.positive_index = classes.index(positive_class) if positive_class in classes else len(classes) - 1
+
+    def predict(self, features):
+        """Return (labels, approval probabilities) for a 2-D feature matrix"""
+        probabilities = self.model.predict_proba(features)
+        labels = self.classes[probabilities.argmax(axis=1)]
+        return labels, probabilities[:, self.positive_index]
+
+    def predict_one(self, row):
+        """Return (label, approval probability) for one feature row"""
+        labels, probabilities = self.predict(np.asarray([row]))
+        return labels[0], float(probabilities[0])
+
+
+class LogisticInference:
+    """Binary logistic regression as a precompiled dot product + sigmoid"""
+
+    kind = 'logistic'
+
+    def __init__(self, coef, intercept, classes, scale=1.0, positive_class=None):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        self.scale = float(scale)
+        # The decision value favours classes[1]; flip it to score classes[0]
+        self.probability_scale = -self.scale if positive_class == self.classes[0] else self.scale
+        self.n_features = self.coef.shape[0]
+        # Plain floats for the single-row path, which avoids NumPy allocation
+        self._coef_values = tuple(self.coef.tolist())
+        self._negative, self._positive = self.classes.tolist()
+
+    def decision(self, features):
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {features.shape}")
+        return features @ self.coef + self.intercept
+
+    def predict(self, features):
+        """Return (labels, approval probabilities) for a 2-D feature matrix"""
+        decision = self.decision(features)
+        # sklearn's predict() thresholds the decision value at 0
+        labels = np.where(decision > 0, self._positive, self._negative)
+        return labels, expit(self.probability_scale * decision)
+
+    def predict_one(self, row):
+        """Return (label, approval probability) for one feature row"""
+        if len(row) != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {len(row)}")
+        decision = sum(map(mul, self._coef_values, map(float, row)), self.intercept)
+        label = self._positive if decision > 0 else self._negative
+        return label, _sigmoid(self.probability_scale * decision)
+
+
+def _probe_features(coef, rng, rows=32):
+    """Feature rows whose decision values fall in the sigmoid's sensitive range"""
+    magnitude = np.where(coef != 0, np.abs(coef), 1.0) * len(coef)
+    return rng.standard_normal((rows, len(coef))) / magnitude
+
+
+def _compile_logistic(model, positive_class):
+    classes = getattr(model, 'classes_', None)
+    coef = getattr(model, 'coef_', None)
+    intercept = getattr(model, 'intercept_', None)
+    if classes is None or coef is None or intercept is None:
+        return None
+    if len(classes) != 2 or np.asarray(coef).shape[0] != 1:
+        return None
+
+    coef = np.asarray(coef, dtype=np.float64).ravel()
+    probes = _probe_features(coef, np.random.default_rng(0))
+    with warnings.catch_warnings():
+        # Probes are unnamed arrays; the feature-name warning is irrelevant here
+        warnings.simplefilter('ignore', UserWarning)
+        expected = model.predict_proba(probes)[:, list(classes).index(positive_class)]
+        expected_labels = model.predict(probes)
+
+    # Keep the scale that reproduces the installed sklearn exactly
+    for scale in CANDIDATE_SCALES:
+        engine = LogisticInference(coef, np.ravel(intercept)[0], classes, scale, positive_class)
+        labels, probabilities = engine.predict(probes)
+        if (np.max(np.abs(probabilities - expected)) <= PARITY_TOLERANCE
+                and np.array_equal(labels, expected_labels)):
+            return engine
+    logger.warning("Compiled logistic model does not match sklearn; using sklearn inference")
+    return None
+
+
+def compile_model(model, positive_class=None):
+    """Return the fastest inference engine that reproduces ``model``
+
+    Engines report the probability of ``positive_class`` (by default the
+    last class, as sklearn's ``predict_proba(X)[:, 1]`` for binary models).
+    """
+    classes = list(getattr(model, 'classes_', []))
+    if positive_class not in classes:
+        positive_class = classes[-1] if classes else None
+
+    engine = None
+    try:
+        from sklearn.linear_model import LogisticRegression
+
+        if isinstance(model, LogisticRegression):
+            engine = _compile_logistic(model, positive_class)
+    except Exception as e:
+        logger.warning(f"Could not compile ML model: {str(e)}")
+        engine = None
+
+    if engine is None:
+        engine = SklearnInference(model, positive_class)
+    logger.info(f"ML inference engine: {engine.kind} ({type(model).__name__})")
+    return engine
@@ -0,0 +1,73 @@
+"""JSON encode/decode on orjson, with the stdlib as fallback
+
+orjson parses and serializes several times faster than the ``json`` module,
+and its output is already UTF-8 bytes. ``FastJSONProvider`` plugs it into
+Flask, so ``request.get_json()`` and ``jsonify`` use it everywhere; the ASGI
+entry point and the NDJSON streams call ``dumps``/``dumpb``/``loads``
+directly. Without orjson installed every function falls back to ``json``
+with compact separators.
+
+Values orjson cannot encode natively go through Flask's default hook
+(decimals, and dates so they keep Flask's HTTP date format). Unlike the
+stdlib, NaN and infinity are encoded as ``null``.
+"""
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumpb(obj, default=None, sort_keys=False):
+        """Serialize to UTF-8 bytes"""
+        option = _OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if default is not None:
+            # Let the hook format dates (Flask uses HTTP dates, not ISO 8601)
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(obj, default=default, option=option)
+
+    def dumps(obj, default=None, sort_keys=False):
+        return dumpb(obj, default, sort_keys).decode('utf-8')
+
+    loads = orjson.loads
+else:
+    def dumps(obj, default=None, sort_keys=False):
+        return json.dumps(obj, default=default, sort_keys=sort_keys, ensure_ascii=False, separators=(',', ':'))
+
+    def dumpb(obj, default=None, sort_keys=False):
+        """Serialize to UTF-8 bytes"""
+        return dumps(obj, default, sort_keys).encode('utf-8')
+
+    loads = json.loads
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by ``dumps``/``loads``"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Explicit stdlib options (indent, cls...) keep stdlib behaviour
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, default=self.default, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            # Pretty-printed output is for humans; leave it to the stdlib
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumpb(obj, default=self.default, sort_keys=self.sort_keys) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
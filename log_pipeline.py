@@ -0,0 +1,231 @@
+"""Structured logging written off the request thread
+
+``configure_logging`` installs a single root handler that only enqueues the
+``LogRecord``: no message formatting, JSON encoding or stream write happens on
+the thread that logged. A writer thread drains the queue, formats every record
+it finds as one JSON line (or the classic text line with ``LOG_FORMAT=text``)
+and writes the whole batch with one ``write`` call, so under load many records
+share a syscall, and a slow stderr reader (a container log driver, a pipe)
+never stalls a request.
+
+Records are formatted lazily on the writer thread, so call sites pass
+``%``-style arguments and ``extra`` fields rather than pre-built strings.
+Per-request records go through ``request_logger`` (``loan_app.requests``),
+whose records below ERROR are kept with probability ``LOG_REQUEST_SAMPLE_RATE``
+(in both modes); everything else is always kept. If the queue already holds ``max_queue``
+records, new ones are dropped and counted instead of blocking.
+
+``LOG_ASYNC=false`` writes on the calling thread instead. The writer thread
+does not survive fork(): a worker forked from a preloading master calls
+``after_fork()`` to get a fresh queue and writer.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# High-volume per-request records; sampled with LOG_REQUEST_SAMPLE_RATE
+REQUEST_LOGGER = 'loan_app.requests'
+request_logger = logging.getLogger(REQUEST_LOGGER)
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_STOP = object()
+
+
+def record_extras(record):
+    return {key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, pid plus ``extra`` fields"""
+
+    def format(self, record):
+        document = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        document.update(record_extras(record))
+        if record.exc_info:
+            document['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic text line, with ``extra`` fields appended as JSON"""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record):
+        line = super().format(record)
+        extras = record_extras(record)
+        return f'{line} {json.dumps(extras, default=str, ensure_ascii=False)}' if extras else line
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps records below ERROR with probability ``rate``"""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+        self.sampled_out = 0
+
+    def filter(self, record):
+        if self.rate >= 1.0 or record.levelno >= logging.ERROR or random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class QueueingHandler(logging.Handler):
+    """Root handler that hands records, unformatted, to a LogPipeline"""
+
+    def __init__(self, pipeline):
+        super().__init__()
+        self.pipeline = pipeline
+
+    def handle(self, record):
+        # Handler.handle would take the handler lock; enqueueing needs none
+        if not self.filter(record):
+            return False
+        self.pipeline.enqueue(record)
+        return True
+
+    def emit(self, record):
+        self.pipeline.enqueue(record)
+
+
+class LogPipeline:
+    """Queue plus a writer thread that formats and writes records in batches"""
+
+    def __init__(self, stream=None, formatter=None, max_batch=512, max_queue=100000):
+        self.stream = stream
+        self.formatter = formatter or JsonFormatter()
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.after_fork()
+
+    def after_fork(self):
+        """Start a fresh queue and writer; neither survives fork()"""
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def enqueue(self, record):
+        if self._queue.qsize() >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.put(record)
+
+    def _format(self, record):
+        try:
+            return self.formatter.format(record) + '\n'
+        except Exception as e:
+            return f'Unformattable log record from {record.name}: {str(e)}\n'
+
+    def _run(self):
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if isinstance(record, logging.LogRecord)]
+            if records:
+                self._write(''.join(self._format(record) for record in records), len(records))
+            for marker in batch:
+                if isinstance(marker, threading.Event):
+                    marker.set()
+            if batch[-1] is _STOP:
+                return
+
+    def _write(self, text, count):
+        stream = self.stream or sys.stderr
+        try:
+            stream.write(text)
+            stream.flush()
+        except Exception:
+            self.dropped += count
+            return
+        self.written += count
+        self.batches += 1
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is written"""
+        if self._thread.is_alive():
+            written = threading.Event()
+            self._queue.put(written)
+            written.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write everything queued so far and stop the writer"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            'written': self.written,
+            'batches': self.batches,
+            'queued': self._queue.qsize(),
+            'dropped': self.dropped,
+        }
+
+
+pipeline = None
+request_sampler = SamplingFilter()
+request_logger.addFilter(request_sampler)
+
+
+def configure_logging(level='INFO', fmt='json', asynchronous=True, request_sample_rate=1.0):
+    """Install the root handler; like logging.basicConfig, a no-op if the root logger has one"""
+    global pipeline
+    request_sampler.rate = request_sample_rate
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    root.setLevel(getattr(logging, level))
+    formatter = TextFormatter() if fmt == 'text' else JsonFormatter()
+    if asynchronous:
+        pipeline = LogPipeline(formatter=formatter)
+        handler = QueueingHandler(pipeline)
+        atexit.register(pipeline.close)
+    else:
+        handler = logging.StreamHandler()
+        handler.setFormatter(formatter)
+    root.addHandler(handler)
+
+
+def after_fork():
+    if pipeline is not None:
+        pipeline.after_fork()
+
+
+def flush():
+    if pipeline is not None:
+        pipeline.flush()
+
+
+def stats():
+    return dict(
+        pipeline.stats() if pipeline is not None else {},
+        asynchronous=pipeline is not None,
+        request_sample_rate=request_sampler.rate,
+        sampled_out=request_sampler.sampled_out,
+    )
@@ -0,0 +1,194 @@
+"""Hot-path latency histograms and counters, exported at /metrics
+
+Request handlers time each stage with ``time.perf_counter``; recording a
+stage only appends ``(endpoint, stage, seconds)`` to a deque and a counter
+is a dict increment, both a fraction of a microsecond. Observing straight
+into prometheus_client costs a few microseconds per stage in multiprocess
+mode (mmap'd file writes for the bucket, count and sum), so a daemon thread
+per worker drains the deque every ``METRICS_FLUSH_INTERVAL`` seconds, and on
+worker exit: each observation goes into a per-stage ``microbatch.Histogram``
+(for /health) and through prometheus_client's public ``observe``, off the
+request path. Counters push their deltas with ``inc``.
+
+Under gunicorn every worker writes its own files in
+``PROMETHEUS_MULTIPROC_DIR`` (set up by gunicorn_hooks before the app is
+imported) and /metrics merges all of them, so any worker answers for the
+whole server. Without that directory the process-local registry is served.
+Without prometheus_client everything is still counted for /health, and
+/metrics reports that the exporter is unavailable.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from admission import DEFAULT_LIMITS, OUTCOMES
+from microbatch import Histogram
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a catalog lookup (tens of µs) up to a slow translation call
+STAGE_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (endpoint, stage) pairs timed on the hot path
+STAGES = {
+    'calculate_loan': ('parse', 'validate', 'result_cache', 'eligibility', 'translate', 'serialize', 'total'),
+    'calculate_eligibility': ('ml', 'rules'),
+    'chatbot': ('parse', 'match', 'respond', 'serialize', 'total'),
+    'translate': ('lookup', 'remote'),
+    # Time spent queued for a slot, per guarded endpoint
+    'admission': tuple(DEFAULT_LIMITS),
+}
+
+# name -> (help, label names, every label value tuple)
+COUNTERS = {
+    'translations': ('Translations by where the answer came from', ('source',), (
+        ('catalog',), ('cache',), ('remote',), ('error',), ('timeout',),
+    )),
+    'cache_requests': ('Cache lookups by cache and result', ('cache', 'result'), (
+        ('translation', 'hit'), ('translation', 'miss'),
+        ('chatbot_response', 'hit'), ('chatbot_response', 'miss'),
+        ('result', 'hit'), ('result', 'miss'),
+    )),
+    'ml_fallbacks': ('Predictions that fell back to rule-only scoring, by reason', ('reason',), (
+        ('no_model',), ('encode_error',), ('predict_error',),
+    )),
+    'admission': ('Admission control decisions by endpoint and outcome', ('endpoint', 'outcome'), tuple(
+        (endpoint, outcome) for endpoint in DEFAULT_LIMITS for outcome in OUTCOMES
+    )),
+}
+
+NAMESPACE = 'loan_app'
+
+# Observations waiting for the flusher; the oldest are dropped if it falls behind
+MAX_PENDING = 100000
+
+
+class Metrics:
+    """Per-process accumulators, periodically flushed into prometheus_client"""
+
+    def __init__(self, flush_interval=1.0, registry=None):
+        self.flush_interval = flush_interval
+        self.stages = {
+            (endpoint, stage): Histogram(STAGE_BUCKETS)
+            for endpoint, stages in STAGES.items() for stage in stages
+        }
+        self.counters = {name: dict.fromkeys(labels, 0) for name, (_, _, labels) in COUNTERS.items()}
+        self._exported = None
+        if prometheus_client is not None:
+            self._exported = self._register(registry or prometheus_client.REGISTRY)
+        self.after_fork()
+
+    def _register(self, registry):
+        stage_seconds = prometheus_client.Histogram(
+            'stage_seconds', 'Hot-path latency per endpoint and stage', ['endpoint', 'stage'],
+            namespace=NAMESPACE, buckets=STAGE_BUCKETS, registry=registry
+        )
+        exported = {key: stage_seconds.labels(*key) for key in self.stages}
+        for name, (documentation, labelnames, values) in COUNTERS.items():
+            counter = prometheus_client.Counter(name, documentation, labelnames, namespace=NAMESPACE, registry=registry)
+            for labels in values:
+                exported[name, labels] = counter.labels(*labels)
+        return exported
+
+    def after_fork(self):
+        """Forget counts inherited from the parent; the flusher thread is created lazily per process"""
+        for histogram in self.stages.values():
+            histogram.counts = [0] * len(histogram.counts)
+            histogram.count = 0
+            histogram.sum = 0
+        for counts in self.counters.values():
+            for key in counts:
+                counts[key] = 0
+        self._pending = deque(maxlen=MAX_PENDING)
+        self._flushed = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def observe(self, endpoint, stage, seconds):
+        self._pending.append((endpoint, stage, seconds))
+        if self._thread is None:
+            self._start_flusher()
+
+    def inc(self, name, *labels, amount=1):
+        self.counters[name][labels] += amount
+        if self._thread is None:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush failed: {str(e)}")
+
+    def _drain(self):
+        pending, stages, exported = self._pending, self.stages, self._exported
+        while True:
+            try:
+                endpoint, stage, seconds = pending.popleft()
+            except IndexError:
+                return
+            key = endpoint, stage
+            stages[key].observe(seconds)
+            if exported is not None:
+                exported[key].observe(seconds)
+
+    def flush(self):
+        """Export pending observations and new counts into prometheus_client"""
+        with self._lock:
+            self._drain()
+            if self._exported is None:
+                return
+            for name, counts in self.counters.items():
+                for labels, count in counts.items():
+                    delta = count - self._flushed.get((name, labels), 0)
+                    if delta:
+                        self._exported[name, labels].inc(delta)
+                        self._flushed[name, labels] = count
+
+    def snapshot(self):
+        """Process-local counters and stage means, for /health"""
+        with self._lock:
+            self._drain()
+        return {
+            'counters': {
+                name: {':'.join(labels): count for labels, count in counts.items()}
+                for name, counts in self.counters.items()
+            },
+            'stages_ms': {
+                f'{endpoint}.{stage}': round(histogram.sum / histogram.count * 1000, 3)
+                for (endpoint, stage), histogram in self.stages.items() if histogram.count
+            },
+        }
+
+
+def exposition():
+    """(body, content type) for /metrics, merged across workers when multiprocess"""
+    if prometheus_client is None:
+        return None, None
+    metrics.flush()
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+metrics = Metrics(float(os.getenv('METRICS_FLUSH_INTERVAL', '1')))
@@ -0,0 +1,138 @@
+"""Micro-batching scheduler for concurrent single-item predictions
+
+Threads calling ``MicroBatcher.submit`` concurrently (gthread workers,
+``THREADS`` > 1) are coalesced: the first queued item opens a window of
+``window`` seconds, and the batch is flushed when it reaches ``max_batch``
+items, when every caller currently inside ``submit`` has queued, or when the
+window closes, whichever comes first. One dispatcher thread runs the batch
+function once and resolves each caller's future.
+
+When fewer than ``bypass_below`` callers are active (always the case with
+sync workers), ``submit`` runs the single-item function inline, so a lone
+request never waits for a window.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+QUEUE_DEPTH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class Histogram:
+    """Cumulative-style bucket counts, like a Prometheus histogram"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        labels = [f'le_{bucket}' for bucket in self.buckets] + ['le_inf']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.count,
+            'mean': round(self.sum / self.count, 3) if self.count else 0.0,
+        }
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into one batch call"""
+
+    def __init__(self, predict_batch, predict_one=None, window=0.002, max_batch=64, bypass_below=2):
+        self.predict_batch = predict_batch
+        self.predict_one = predict_one or (lambda item: predict_batch([item])[0])
+        self.window = window
+        self.max_batch = max_batch
+        self.bypass_below = bypass_below
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_depth = Histogram(QUEUE_DEPTH_BUCKETS)
+        self.bypassed = 0
+        self.errors = 0
+        self.after_fork()
+
+    def after_fork(self):
+        """Start from an empty queue; the dispatcher thread is created lazily per process"""
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = []
+        self._active = 0
+        self._thread = None
+        self._pid = None
+
+    def submit(self, item):
+        """Return predict_one(item), possibly computed as part of a batch"""
+        with self._cond:
+            self._active += 1
+            bypass = self._active < self.bypass_below and not self._pending
+            if bypass:
+                self.bypassed += 1
+            else:
+                future = Future()
+                self._ensure_dispatcher()
+                self._pending.append((item, future))
+                self.queue_depth.observe(len(self._pending))
+                self._cond.notify()
+        try:
+            if bypass:
+                return self.predict_one(item)
+            return future.result()
+        finally:
+            with self._cond:
+                self._active -= 1
+
+    def _ensure_dispatcher(self):
+        if self._thread is None or self._pid != os.getpid():
+            self._thread = threading.Thread(target=self._run, name='microbatch', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            closes_at = time.monotonic() + self.window
+            # Callers still on their way in are the only ones worth waiting for
+            while len(self._pending) < min(self.max_batch, self._active):
+                remaining = closes_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            self.batch_sizes.observe(len(batch))
+            try:
+                results = self.predict_batch([item for item, _ in batch])
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Micro-batch of {len(batch)} failed: {str(e)}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'bypassed': self.bypassed,
+            'errors': self.errors,
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_depth': self.queue_depth.snapshot(),
+        }
@@ -0,0 +1,116 @@
+"""Flat, versioned model artifacts served without scikit-learn
+
+``export_model_artifacts.py`` turns ``loan_model.pkl`` and
+``label_encoders.pkl`` into a directory holding:
+
+    manifest.json   format, fingerprint, columns, classes, intercept,
+                    link scale and every encoder vocabulary
+    coef.npy        the coefficient vector (float64, C order)
+
+Workers open ``coef.npy`` with ``np.load(mmap_mode='r')``, so the array
+pages come from the OS page cache shared by every process. Loading needs
+only NumPy and json: neither joblib nor scikit-learn is imported, which
+keeps worker boot (and every ``max_requests`` recycle) cheap. The
+manifest records a fingerprint of the source pickles; if those change
+after export, ``load_artifacts`` refuses the stale directory.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+
+from encoders import FeatureEncoder, vocabularies_from_label_encoders
+from inference import LogisticInference, compile_model
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ARTIFACTS_PATH = os.path.join(BASE_DIR, 'model_artifacts')
+MODEL_PATH = os.path.join(BASE_DIR, 'loan_model.pkl')
+ENCODERS_PATH = os.path.join(BASE_DIR, 'label_encoders.pkl')
+SOURCE_PATHS = (MODEL_PATH, ENCODERS_PATH)
+
+MANIFEST_NAME = 'manifest.json'
+COEF_NAME = 'coef.npy'
+
+
+class ModelArtifacts:
+    """A loaded artifact directory: inference engine, feature encoder and version"""
+
+    def __init__(self, manifest, coef):
+        self.manifest = manifest
+        self.fingerprint = manifest['fingerprint']
+        self.columns = tuple(manifest['columns'])
+        self.vocabularies = manifest['vocabularies']
+        self.encoder = FeatureEncoder(self.vocabularies, self.columns)
+        self.engine = LogisticInference(
+            coef, manifest['intercept'], manifest['classes'], manifest['scale'], self.encoder.approved_class
+        )
+        if self.engine.n_features != len(self.columns):
+            raise ValueError(f"coef.npy has {self.engine.n_features} values for {len(self.columns)} columns")
+
+
+def source_fingerprint(paths=SOURCE_PATHS):
+    """Short content hash of the pickles an artifact directory was built from"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+def export_artifacts(model, label_encoders, output=DEFAULT_ARTIFACTS_PATH, fingerprint=None):
+    """Write the artifact directory for a fitted binary LogisticRegression"""
+    vocabularies = vocabularies_from_label_encoders(label_encoders)
+    columns = [str(column) for column in getattr(model, 'feature_names_in_', [])]
+    encoder = FeatureEncoder(vocabularies, columns) if columns else FeatureEncoder(vocabularies)
+    engine = compile_model(model, positive_class=encoder.approved_class)
+    if not isinstance(engine, LogisticInference):
+        raise ValueError(f"Only binary LogisticRegression models can be exported, not {type(model).__name__}")
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'fingerprint': fingerprint or source_fingerprint(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'model_type': type(model).__name__,
+        'columns': list(encoder.columns),
+        'classes': engine.classes.tolist(),
+        'intercept': engine.intercept,
+        'scale': engine.scale,
+        'vocabularies': vocabularies,
+    }
+
+    os.makedirs(output, exist_ok=True)
+    np.save(os.path.join(output, COEF_NAME), np.ascontiguousarray(engine.coef, dtype=np.float64))
+    # The manifest goes last and atomically: readers never see it without its arrays
+    handle, temp_path = tempfile.mkstemp(dir=output, suffix='.tmp')
+    with os.fdopen(handle, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temp_path, os.path.join(output, MANIFEST_NAME))
+    return manifest
+
+
+def load_artifacts(path=DEFAULT_ARTIFACTS_PATH, check_sources=True):
+    """Load an artifact directory, or return None if it is missing or stale"""
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        logger.warning(f"Unsupported model artifact format {manifest.get('format')} in {path}")
+        return None
+    if check_sources and all(os.path.exists(source) for source in SOURCE_PATHS):
+        fingerprint = source_fingerprint()
+        if fingerprint != manifest['fingerprint']:
+            logger.warning(f"Model artifacts in {path} are stale ({manifest['fingerprint']} != {fingerprint}); re-run export_model_artifacts.py")
+            return None
+
+    coef = np.load(os.path.join(path, COEF_NAME), mmap_mode='r', allow_pickle=False)
+    return ModelArtifacts(manifest, coef)
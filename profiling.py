@@ -0,0 +1,245 @@
+"""Sampled per-request profiling, written as collapsed stacks for flame graphs
+
+Off by default. One request in ``sample_rate`` is profiled (0 disables it).
+The rate can be changed at runtime through /api/admin/profiling, which writes
+``settings.json`` in ``PROFILE_DIR``; every gunicorn worker re-reads it when it
+changes (checked at most every ``PROFILE_SETTINGS_INTERVAL`` seconds). An admin
+request can also profile itself by sending ``X-Profile: 1``.
+
+While a request is profiled, the stack of the thread serving it is sampled
+every ``interval`` seconds:
+
+- on the main thread (gunicorn sync workers) by an ``ITIMER_REAL`` timer
+  signal, whose handler runs on that very thread between bytecodes, so the
+  resolution does not depend on the GIL switch interval and time blocked on
+  I/O (waiting for a translation) is sampled too
+- on any other thread (gthread workers, the development server) by a helper
+  thread reading ``sys._current_frames()``
+
+Only frames below the point where profiling started are kept, so stacks begin
+at the view function rather than in the server loop. Each profile is written
+to ``PROFILE_DIR/<profile id>.folded``, one ``frame;frame;...;frame count`` line
+per distinct stack (the input format of flamegraph.pl and speedscope).
+
+When disabled, a request costs one clock read and a comparison.
+"""
+import itertools
+import json
+import logging
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = 'profiles'
+SETTINGS_NAME = 'settings.json'
+PROFILE_ID = re.compile(r'^\d+-\d+-\d+$')
+
+# Session sampled by the timer signal; the handler stays installed once set,
+# so a late SIGALRM after a session ends is ignored rather than fatal
+_signal_session = None
+
+
+def _on_alarm(signum, frame):
+    session = _signal_session
+    if session is not None:
+        session.record(frame)
+
+
+def frame_label(code, _labels={}):
+    """'function (dir/file.py:line)' for a code object, memoized"""
+    label = _labels.get(code)
+    if label is None:
+        path = os.path.join(os.path.basename(os.path.dirname(code.co_filename)), os.path.basename(code.co_filename))
+        label = _labels[code] = f'{code.co_name} ({path}:{code.co_firstlineno})'
+    return label
+
+
+class ProfileSession:
+    """Stack samples of one request"""
+
+    def __init__(self, profile_id, interval):
+        self.profile_id = profile_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._outer = set()
+        self._thread = None
+        self._stop = None
+
+    def start(self, frame):
+        """Sample the current thread from now on, keeping frames below ``frame``"""
+        global _signal_session
+        while frame is not None:
+            self._outer.add(frame)
+            frame = frame.f_back
+        self.started = time.perf_counter()
+        if threading.current_thread() is threading.main_thread() and _signal_session is None:
+            if signal.getsignal(signal.SIGALRM) is not _on_alarm:
+                signal.signal(signal.SIGALRM, _on_alarm)
+            _signal_session = self
+            signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+        else:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._sample_thread, args=(threading.get_ident(),), name='profile-sampler', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        global _signal_session
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        elif _signal_session is self:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            _signal_session = None
+        self.elapsed = time.perf_counter() - self.started
+        self._outer = set()
+
+    def _sample_thread(self, thread_id):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self.record(frame)
+
+    def record(self, frame):
+        labels = []
+        outer = self._outer
+        while frame is not None and frame not in outer:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """Decides which requests to profile and stores their collapsed stacks"""
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, sample_rate=0, interval=0.001, settings_interval=1.0, max_files=500):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.settings_interval = settings_interval
+        self.max_files = max_files
+        self.profiled = 0
+        self._requests = itertools.count(1)
+        self._ids = itertools.count(1)
+        self._settings_mtime = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    @property
+    def settings_path(self):
+        return os.path.join(self.directory, SETTINGS_NAME)
+
+    def should_profile(self, forced=False):
+        if time.monotonic() - self._checked_at >= self.settings_interval:
+            self._refresh_settings()
+        if forced:
+            return True
+        return self.sample_rate > 0 and next(self._requests) % self.sample_rate == 0
+
+    def _refresh_settings(self):
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.settings_path).st_mtime_ns
+            except OSError:
+                return
+            if mtime == self._settings_mtime:
+                return
+            try:
+                with open(self.settings_path, 'r', encoding='utf-8') as settings_file:
+                    settings = json.load(settings_file)
+                sample_rate, interval = int(settings['sample_rate']), float(settings['interval'])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Invalid profiling settings {self.settings_path}: {str(e)}")
+                return
+            self._settings_mtime = mtime
+            if (sample_rate, interval) != (self.sample_rate, self.interval):
+                logger.info(f"Profiling settings changed: 1 in {sample_rate} requests every {interval * 1000:g} ms")
+            self.sample_rate, self.interval = sample_rate, interval
+        finally:
+            self._lock.release()
+
+    def configure(self, sample_rate=None, interval=None):
+        """Change the settings for every worker sharing ``directory``"""
+        sample_rate = self.sample_rate if sample_rate is None else int(sample_rate)
+        interval = self.interval if interval is None else float(interval)
+        if sample_rate < 0 or not 0 < interval <= 1:
+            raise ValueError('sample_rate must be >= 0 and interval within (0, 1] seconds')
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f'{self.settings_path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as settings_file:
+            json.dump({'sample_rate': sample_rate, 'interval': interval}, settings_file)
+        os.replace(temporary, self.settings_path)
+        self.sample_rate, self.interval = sample_rate, interval
+        self._checked_at = float('-inf')
+        return self.settings()
+
+    def settings(self):
+        return {'sample_rate': self.sample_rate, 'interval_ms': self.interval * 1000, 'directory': self.directory}
+
+    def start(self):
+        """Start profiling the calling thread; stacks exclude the caller's caller and everything above it"""
+        session = ProfileSession(f'{int(time.time())}-{os.getpid()}-{next(self._ids)}', self.interval)
+        session.start(sys._getframe(2))
+        return session
+
+    def finish(self, session, description=''):
+        """Stop sampling and write the collapsed stacks; returns the file path"""
+        session.stop()
+        self.profiled += 1
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{session.profile_id}.folded')
+        with open(path, 'w', encoding='utf-8') as profile_file:
+            profile_file.write(session.collapsed())
+        logger.info(f"Profile {session.profile_id}: {session.samples} samples over {session.elapsed * 1000:.1f} ms {description}")
+        self._prune()
+        return path
+
+    def _prune(self):
+        profiles = [name for name in os.listdir(self.directory) if name.endswith('.folded')]
+        if len(profiles) <= self.max_files:
+            return
+        profiles.sort(key=lambda name: os.path.getmtime(os.path.join(self.directory, name)))
+        for name in profiles[:len(profiles) - self.max_files]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def read(self, profile_id):
+        """Collapsed stacks of a stored profile, or None"""
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            with open(os.path.join(self.directory, f'{profile_id}.folded'), 'r', encoding='utf-8') as profile_file:
+                return profile_file.read()
+        except OSError:
+            return None
+
+    def stats(self):
+        return dict(self.settings(), profiled=self.profiled)
+
+
+profiler = Profiler(
+    os.getenv('PROFILE_DIR', DEFAULT_PROFILE_DIR),
+    int(os.getenv('PROFILE_SAMPLE_RATE', '0')),
+    float(os.getenv('PROFILE_INTERVAL_MS', '1')) / 1000,
+    float(os.getenv('PROFILE_SETTINGS_INTERVAL', '1')),
+    int(os.getenv('PROFILE_MAX_FILES', '500')),
+)
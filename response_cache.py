@@ -0,0 +1,67 @@
+"""Memoized canned responses keyed by (intent, language)
+
+A chatbot answer depends only on the resolved intent and the requested
+language, so each pair is translated at most once per process. Entries
+carry a strong ETag so HTTP caches can revalidate repeated queries.
+"""
+import hashlib
+import threading
+from collections import namedtuple
+
+CachedResponse = namedtuple('CachedResponse', ['text', 'etag'])
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1('\x00'.join(parts).encode('utf-8')).hexdigest()
+    return digest[:20]
+
+
+class ResponseCache:
+    """Thread-safe (intent, language) -> CachedResponse table with stats"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, intent, language):
+        entry = self._entries.get((intent, language))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, intent, language, text):
+        entry = CachedResponse(text, make_etag(intent, language, text))
+        with self._lock:
+            self._entries[(intent, language)] = entry
+        return entry
+
+    def warm(self, intents, languages, resolve):
+        """Precompute entries; ``resolve(intent, language)`` returns text or None to skip"""
+        warmed = 0
+        for intent in intents:
+            for language in languages:
+                text = resolve(intent, language)
+                if text is not None:
+                    self.put(intent, language, text)
+                    warmed += 1
+        return warmed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
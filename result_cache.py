@@ -0,0 +1,145 @@
+"""Content-addressed cache of translated eligibility results
+
+Identical submissions (a user re-sending the form, the back office
+re-querying an applicant) get the stored result instead of another
+ML prediction, rule evaluation and translation. The key covers every input
+field that reaches the rules or the model, in canonical form, plus the
+language and the model and policy versions.
+
+Keys are HMAC-SHA256 digests, so no field (``bank_balance``,
+``monthly_income``, ...) is ever stored raw, and a low-entropy value such as
+an income cannot be recovered by hashing candidates without the secret
+(``RESULT_CACHE_SECRET``, else ``SECRET_KEY``). Stored values are the API result dicts, which carry no raw
+balance or income.
+
+Tier 1 is a bounded in-process LRU; tier 2, when ``RESULT_CACHE_PATH`` is set,
+is a SQLite file shared by all gunicorn workers (see translation_cache).
+The shared tier needs a secret every worker knows: the gunicorn configs
+generate one in the master when none is configured (gunicorn_hooks), and
+without one the cache stays per-process, under a random per-process key.
+Every key is prefixed with a tag of the model fingerprint and policy
+version: when either changes (new model artifacts, a policy reload), the
+LRU is cleared and the shared store drops the other generations.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+
+import rule_engine
+from encoders import FIELD_MAP
+from translation_cache import LRUCache, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# (API field, numeric default or None for categories) for every model input
+MODEL_FIELDS = tuple(sorted(FIELD_MAP.values(), key=lambda item: item[0]))
+
+
+def canonical_input(data):
+    """Canonical JSON of every value the rules and the model read
+
+    Numbers are converted the way the encoder and the rule engine convert
+    them, so ``"760"`` and ``760`` share a key; categories are kept verbatim.
+    Raises ValueError/TypeError for values scoring cannot use either.
+    """
+    model_values = [
+        data.get(field) if default is None
+        else float(default if data.get(field) is None or data.get(field) == '' else data.get(field))
+        for field, default in MODEL_FIELDS
+    ]
+    return json.dumps(
+        [rule_engine.coerce_application(data), model_values],
+        separators=(',', ':'), sort_keys=True, default=str
+    )
+
+
+class ResultCache:
+    """LRU in front of an optional shared SQLite store, keyed by keyed hashes"""
+
+    def __init__(self, maxsize=4096, ttl=None, path=None, max_entries=100000, secret=None):
+        if path and not secret:
+            # A per-process key would give every worker its own, unreadable entries
+            raise ValueError('A shared result cache needs a secret')
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.disk = SQLiteStore(path, table='results', ttl=ttl, max_entries=max_entries, label='Result cache') if path else None
+        self.secret = secret.encode('utf-8') if isinstance(secret, str) else secret or secrets.token_bytes(32)
+        self.generation = None
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def key(self, data, language, model_version, policy_version):
+        """Cache key for a validated application, or None if it cannot be canonicalized"""
+        try:
+            payload = canonical_input(data)
+        except (ValueError, TypeError, OverflowError):
+            return None
+        generation = hashlib.sha256(f'{model_version}\x00{policy_version}'.encode('utf-8')).hexdigest()[:12]
+        if generation != self.generation:
+            self._invalidate(generation)
+        digest = hmac.new(self.secret, f'{language}\x00{payload}'.encode('utf-8'), hashlib.sha256).hexdigest()
+        return f'{generation}:{digest}'
+
+    def _invalidate(self, generation):
+        with self._lock:
+            if generation == self.generation:
+                return
+            if self.generation is not None:
+                logger.info(f"Result cache invalidated: generation {self.generation} -> {generation}")
+                self.invalidations += 1
+            self.memory.clear()
+            if self.disk is not None:
+                self.disk.purge_except(f'{generation}:')
+            self.generation = generation
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            stored = self.disk.get(key)
+            if stored is not None:
+                value = json.loads(stored)
+                # Promote shared entries into this worker's LRU
+                self.memory.set(key, value)
+        return value
+
+    def put(self, key, result):
+        self.memory.set(key, result)
+        if self.disk is not None:
+            self.disk.set(key, json.dumps(result, separators=(',', ':')))
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        memory = self.memory.stats()
+        stats = {'memory': memory, 'generation': self.generation, 'invalidations': self.invalidations}
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        lookups = memory['hits'] + memory['misses']
+        hits = memory['hits'] + (self.disk.hits if self.disk is not None else 0)
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def create_result_cache():
+    """Build the result cache from environment settings (None when disabled)"""
+    maxsize = int(os.getenv('RESULT_CACHE_SIZE', '4096'))
+    path = os.getenv('RESULT_CACHE_PATH', '')
+    secret = os.getenv('RESULT_CACHE_SECRET') or os.getenv('SECRET_KEY') or None
+    if path and not secret:
+        logger.warning("RESULT_CACHE_PATH is set but neither RESULT_CACHE_SECRET nor SECRET_KEY is; results will not be shared between workers")
+        path = ''
+    if maxsize <= 0 and not path:
+        return None
+    return ResultCache(
+        maxsize=maxsize,
+        ttl=float(os.getenv('RESULT_CACHE_TTL', '3600')) or None,
+        path=path or None,
+        max_entries=int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '100000')),
+        secret=secret
+    )
@@ -0,0 +1,233 @@
+"""Columnar rule engine for loan eligibility scoring
+
+Evaluates the CIBIL, income, EMI ratio, bank balance, age and employment
+rules over whole NumPy columns at once, so a batch of applications costs a
+handful of array operations instead of a Python if/elif ladder per row.
+Thresholds, points and labels come from the compiled scoring policy (see
+scoring_policy.py); band 0 is the top score for every criterion.
+"""
+import numpy as np
+
+from scoring_policy import policy_store
+
+COLUMNS = ('bank_balance', 'cibil_score', 'loan_amount', 'monthly_income',
+           'loan_tenure', 'emi_existing', 'age', 'employment_type')
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+
+def _int(value):
+    number = int(value)
+    if abs(number) > _INT64_MAX:
+        raise OverflowError('integer field out of range')
+    return number
+
+
+def coerce_application(data):
+    """Coerce one application dict to the typed values the rules use
+
+    Raises ValueError/TypeError for values that cannot be converted, exactly
+    like the float()/int() calls of the scalar implementation.
+    """
+    return (
+        float(data.get('bank_balance', 0)),
+        _int(data.get('cibil_score', 0)),
+        float(data.get('loan_amount', 0)),
+        float(data.get('monthly_income', 0)),
+        _int(data.get('loan_tenure', 0)),
+        float(data.get('emi_existing', 0)),
+        _int(data.get('age', 0)),
+        data.get('employment_type', ''),
+    )
+
+
+def columns_from_rows(rows):
+    """Turn coerced application tuples into a dict of NumPy columns"""
+    if not rows:
+        return {name: np.empty(0) for name in COLUMNS}
+    transposed = list(zip(*rows))
+    columns = {}
+    for name, values in zip(COLUMNS, transposed):
+        if name == 'employment_type':
+            columns[name] = list(values)
+        elif name in ('cibil_score', 'loan_tenure', 'age'):
+            columns[name] = np.array(values, dtype=np.int64)
+        else:
+            columns[name] = np.array(values, dtype=np.float64)
+    return columns
+
+
+def estimated_emi(loan_amount, loan_tenure, monthly_rate):
+    """Vectorized EMI for arrays of loan amounts and tenures (months)"""
+    growth = np.power(1 + monthly_rate, loan_tenure)
+    return loan_amount * monthly_rate * growth / (growth - 1)
+
+
+def _first_match(hits, default):
+    """Index of the first True per row of a 2-D mask, or ``default``"""
+    return np.where(hits.any(axis=1), hits.argmax(axis=1), default)
+
+
+def _employment_band(employment_type, lookup, default):
+    return np.array([
+        lookup.get(value, default) if isinstance(value, str) else default
+        for value in employment_type
+    ], dtype=np.int64)
+
+
+class RuleEvaluation:
+    """Band indexes and derived values for a batch of applications"""
+
+    def __init__(self, policy, columns, bands, estimated_emi, emi_ratio, scores, status, ml_predictions, invalid):
+        self.policy = policy
+        self.columns = columns
+        self.bands = bands
+        self.estimated_emi = estimated_emi
+        self.emi_ratio = emi_ratio
+        self.scores = scores
+        self.status = status
+        self.ml_predictions = ml_predictions
+        self.invalid = invalid
+
+    def __len__(self):
+        return len(self.scores)
+
+    def result(self, index):
+        """Build the API result dict for one row"""
+        if self.invalid[index]:
+            raise ValueError('loan_tenure and monthly_income must be non-zero')
+
+        policy = self.policy
+        reasons = []
+        criteria_scores = {}
+        for criterion in policy.criteria:
+            band = self.bands[criterion.key][index]
+            criteria_scores[criterion.name] = criterion.labels[band]
+            reason = criterion.reasons[band]
+            if reason:
+                reasons.append(reason)
+
+        ml_prediction = self.ml_predictions[index]
+        if ml_prediction:
+            ml_confidence = ml_prediction['probability']
+            ml_decision = ml_prediction['prediction']
+            criteria_scores['ML Model Prediction'] = f"{'Approved' if ml_decision == 1 else 'Rejected'} (Confidence: {ml_confidence:.2%})"
+
+        status, status_class, recommendation = policy.statuses[self.status[index]]
+        score = float(self.scores[index])
+        loan_amount = float(self.columns['loan_amount'][index])
+        loan_tenure = int(self.columns['loan_tenure'][index])
+        emi = float(self.estimated_emi[index])
+
+        result = {
+            'status': status,
+            'status_class': status_class,
+            'eligibility_score': int(score) if score.is_integer() else score,
+            'estimated_emi': round(emi, 2),
+            'emi_ratio': round(float(self.emi_ratio[index]), 2),
+            'reasons': reasons,
+            'criteria_scores': criteria_scores,
+            'recommendation': recommendation,
+            'loan_details': {
+                'amount': loan_amount,
+                'tenure': loan_tenure,
+                'estimated_interest_rate': policy.interest_rate,
+                'processing_fee': round(loan_amount * policy.processing_fee_rate, 2),
+                'total_payable': round(emi * loan_tenure, 2)
+            },
+            'policy_version': policy.version
+        }
+
+        if ml_prediction:
+            result['ml_prediction'] = {
+                'prediction': 'Approved' if ml_prediction['prediction'] == 1 else 'Rejected',
+                'confidence': ml_prediction['probability']
+            }
+
+        return result
+
+    def results(self):
+        return [self.result(index) for index in range(len(self))]
+
+
+def evaluate(columns, ml_predictions=None, policy=None):
+    """Score a batch of applications given as NumPy columns
+
+    ``ml_predictions`` is an optional list (one entry per row) of
+    {'prediction', 'probability'} dicts or None where the model was unavailable.
+    ``policy`` defaults to the active policy of ``scoring_policy.policy_store``.
+    """
+    if policy is None:
+        policy = policy_store.current()
+
+    bank_balance = columns['bank_balance']
+    cibil_score = columns['cibil_score']
+    loan_amount = columns['loan_amount']
+    monthly_income = columns['monthly_income']
+    loan_tenure = columns['loan_tenure']
+    emi_existing = columns['emi_existing']
+    age = columns['age']
+    size = len(loan_amount)
+    by_key = policy.by_key
+
+    # Rows the EMI formula cannot score (division by zero)
+    invalid = (loan_tenure == 0) | (monthly_income == 0)
+
+    bands = {}
+
+    # CIBIL Score: bisect over ascending minimum scores
+    thresholds = policy.cibil_thresholds
+    bands['cibil'] = len(thresholds) - np.searchsorted(thresholds, cibil_score, side='right')
+
+    # Income Analysis: first band whose amount limit covers the loan
+    max_eligible_amount = monthly_income * policy.income_multiplier
+    bands['income'] = _first_match(
+        loan_amount[:, None] <= max_eligible_amount[:, None] * policy.income_factors,
+        by_key['income'].default_band
+    )
+
+    # EMI to Income Ratio: bisect over ascending maximum ratios
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        emi = estimated_emi(loan_amount, loan_tenure, policy.monthly_rate)
+        emi_ratio = ((emi + emi_existing) / monthly_income) * 100
+    bands['emi_ratio'] = np.searchsorted(policy.emi_ratio_thresholds, emi_ratio, side='left')
+
+    # Bank Balance: first band whose required balance is met
+    required_balance = loan_amount * policy.required_balance_ratio
+    bands['balance'] = _first_match(
+        bank_balance[:, None] >= required_balance[:, None] * policy.balance_factors,
+        by_key['balance'].default_band
+    )
+
+    # Age Factor: bisect over precompiled range edges
+    bands['age'] = policy.age_table[np.searchsorted(policy.age_edges, age, side='right')]
+
+    # Employment Stability Bonus
+    bands['employment'] = _employment_band(
+        columns['employment_type'], policy.employment_lookup, by_key['employment'].default_band
+    )
+
+    scores = np.zeros(size, dtype=np.float64)
+    for criterion in policy.criteria:
+        scores += criterion.points[bands[criterion.key]]
+
+    # Incorporate ML model prediction into final decision
+    if ml_predictions is None:
+        ml_predictions = [None] * size
+    has_ml = np.array([bool(prediction) for prediction in ml_predictions], dtype=bool)
+    if has_ml.any():
+        confidence = np.array([p['probability'] if p else 0.0 for p in ml_predictions], dtype=np.float64)
+        approved = np.array([bool(p) and p['prediction'] == 1 for p in ml_predictions], dtype=bool)
+        adjusted = np.where(
+            approved,
+            np.minimum(scores + confidence * policy.ml_weight, policy.max_score),
+            np.maximum(scores - (1 - confidence) * policy.ml_weight, 0)
+        )
+        scores = np.where(has_ml, adjusted, scores)
+    scores = np.minimum(scores, policy.max_score)
+
+    # Determine final status
+    thresholds = policy.status_thresholds
+    status = len(thresholds) - np.searchsorted(thresholds, scores, side='right')
+
+    return RuleEvaluation(policy, columns, bands, emi, emi_ratio, scores, status, ml_predictions, invalid)
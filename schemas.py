@@ -0,0 +1,230 @@
+"""Request schemas: parse and coerce every field in one pass
+
+A ``Schema`` is an ordered list of ``Field`` objects, each with a converter.
+``parse`` walks the fields once and returns a clean dict of typed values
+(floats, ints, stripped strings, defaults filled in), or raises
+``SchemaError`` carrying every failing field:
+
+    {"success": false, "error": "Missing required field: cibil_score",
+     "errors": {"cibil_score": "is required", "age": "must be a whole number"}}
+
+``error`` keeps the single message the API always returned; ``errors`` maps
+field names to messages for forms. Numbers may arrive as JSON numbers or
+numeric strings (CSV uploads, form posts); booleans, NaN and infinities are
+rejected. Only natural limits are enforced (amounts are non-negative, income
+is positive, tenures run 1-600 months); business thresholds are left to the
+scoring rules, so an applicant under 18 is scored, not refused. Downstream code (rule engine, encoder, caches) then
+only ever sees values that already have their final types.
+"""
+import math
+import sys
+
+# Integer fields become NumPy int64 columns
+_INT64_MAX = 2 ** 63 - 1
+# Larger JSON integers overflow float()
+_FLOAT_MAX = int(sys.float_info.max)
+# Longest tenure the EMI formula and amortization schedules accept
+MAX_TENURE_MONTHS = 600
+
+
+class FieldError(ValueError):
+    """A single field's value is unusable"""
+
+
+class SchemaError(ValueError):
+    """One or more fields failed; ``errors`` maps field name -> message"""
+
+    def __init__(self, errors, message):
+        self.errors = errors
+        self.message = message
+        super().__init__(message)
+
+    def response(self):
+        return {'success': False, 'error': self.message, 'errors': self.errors}
+
+
+class Number:
+    """A finite float (or a whole number with ``integer=True``) within bounds"""
+
+    def __init__(self, minimum=None, maximum=None, exclusive_minimum=False, integer=False):
+        self.low = -math.inf if minimum is None else minimum
+        self.high = math.inf if maximum is None else maximum
+        self.exclusive_minimum = exclusive_minimum
+        self.integer = integer
+        self.kind_message = 'must be a whole number' if integer else 'must be a number'
+        if minimum is not None and maximum is not None:
+            self.range_message = f'must be between {minimum:g} and {maximum:g}'
+        elif minimum is not None:
+            self.range_message = f'must be greater than {minimum:g}' if exclusive_minimum else f'must be at least {minimum:g}'
+        elif maximum is not None:
+            self.range_message = f'must be at most {maximum:g}'
+        else:
+            self.range_message = 'must be a finite number'
+
+    def check_range(self, value):
+        if not (self.low < value if self.exclusive_minimum else self.low <= value) or not value <= self.high:
+            raise FieldError(self.range_message)
+        return value
+
+    def __call__(self, value):
+        kind = type(value)
+        if kind is str:
+            try:
+                value = float(value)
+            except ValueError:
+                raise FieldError(self.kind_message)
+        elif kind is int:
+            if self.integer:
+                if abs(value) > _INT64_MAX:
+                    raise FieldError('is out of range')
+                return self.check_range(value)
+            value = float(value) if abs(value) <= _FLOAT_MAX else math.inf
+        elif kind is not float:
+            # bool is a subclass of int but never a valid amount
+            raise FieldError(self.kind_message)
+        if not math.isfinite(value):
+            raise FieldError('must be a finite number')
+        if self.integer:
+            if value != int(value):
+                raise FieldError(self.kind_message)
+            if abs(value) > _INT64_MAX:
+                raise FieldError('is out of range')
+            return self.check_range(int(value))
+        return self.check_range(value)
+
+
+class Text:
+    """A stripped string, optionally one of ``choices``"""
+
+    def __init__(self, max_length=100, choices=None):
+        self.max_length = max_length
+        self.allowed = frozenset(choices) if choices is not None else None
+
+    def __call__(self, value):
+        if type(value) is not str:
+            raise FieldError('must be a string')
+        value = value.strip()
+        if len(value) > self.max_length:
+            raise FieldError(f'must be at most {self.max_length} characters')
+        if self.allowed is not None and value and value not in self.allowed:
+            raise FieldError(f"must be one of: {', '.join(sorted(self.allowed))}")
+        return value
+
+
+def number(minimum=None, maximum=None, exclusive_minimum=False):
+    return Number(minimum, maximum, exclusive_minimum)
+
+
+def integer(minimum=None, maximum=None):
+    return Number(minimum, maximum, integer=True)
+
+
+def text(max_length=100, choices=None):
+    return Text(max_length, choices)
+
+
+class Field:
+    """``required`` fields must be present and non-blank; others fall back to ``default``
+
+    ``missing`` overrides the top-level message when this field is the first
+    one missing (the API's historical "No text provided" style messages).
+    """
+
+    __slots__ = ('name', 'convert', 'required', 'default', 'missing')
+
+    def __init__(self, name, convert, required=False, default=None, missing=None):
+        self.name = name
+        self.convert = convert
+        self.required = required
+        self.default = default
+        self.missing = missing or f'Missing required field: {name}'
+
+
+class Schema:
+    """Ordered fields parsed in one pass; unknown keys are dropped"""
+
+    def __init__(self, *fields, body_error='Request must be a JSON object'):
+        self.fields = fields
+        self.body_error = body_error
+        self._steps = tuple((f.name, f.convert, f.required, f.default, f.missing) for f in fields)
+
+    def parse(self, data, defaults=None):
+        """Clean dict of typed values, or SchemaError listing every bad field
+
+        ``defaults`` overrides field defaults for this call (a batch's
+        language for rows that leave theirs blank).
+        """
+        if type(data) is not dict:
+            raise SchemaError({'body': 'must be a JSON object'}, self.body_error)
+        get = data.get
+        clean = {}
+        failures = None
+        for name, convert, required, default, missing in self._steps:
+            value = get(name)
+            # Type checks first: comparing a number with '' is comparatively slow
+            if value is not None and (type(value) is not str or value):
+                try:
+                    value = convert(value)
+                except FieldError as e:
+                    failures = (failures or []) + [(name, str(e), f'Invalid {name}: {e}')]
+                    continue
+                if type(value) is not str or value:
+                    clean[name] = value
+                    continue
+            # Absent, null, or blank once stripped
+            if required:
+                failures = (failures or []) + [(name, 'is required', missing)]
+            elif defaults and name in defaults:
+                clean[name] = defaults[name]
+            elif default is not None:
+                clean[name] = default
+        if failures:
+            raise SchemaError({name: reason for name, reason, _ in failures}, failures[0][2])
+        return clean
+
+    def errors(self, data):
+        """The SchemaError for ``data``, or None if it is valid"""
+        try:
+            self.parse(data)
+        except SchemaError as e:
+            return e
+        return None
+
+
+def application_schema(languages):
+    """Loan application fields, in the order the API has always reported them"""
+    return Schema(
+        Field('bank_balance', number(minimum=0), required=True),
+        Field('cibil_score', integer(minimum=0), required=True),
+        Field('loan_amount', number(minimum=0), required=True),
+        Field('monthly_income', number(minimum=0, exclusive_minimum=True), required=True),
+        Field('loan_tenure', integer(1, MAX_TENURE_MONTHS), required=True),
+        Field('age', integer(minimum=0), required=True),
+        Field('employment_type', text(), required=True),
+        Field('income_source', text(), required=True),
+        Field('existing_loans', text(), required=True),
+        Field('emi_existing', number(minimum=0), default=0.0),
+        Field('other_loans', number(minimum=0), default=0.0),
+        Field('gender', text()),
+        Field('language', text(10, choices=languages), default='en'),
+        body_error='Application must be a JSON object',
+    )
+
+
+def batch_schema(languages):
+    """Batch-level options; the applications themselves use ``application_schema``"""
+    return Schema(Field('language', text(10, choices=languages), default='en'))
+
+
+def translate_schema(languages, max_length=5000):
+    return Schema(
+        Field('text', text(max_length), required=True, missing='No text provided'),
+        Field('target_lang', text(10, choices=languages), default='en'),
+    )
+
+
+def chatbot_schema(languages, max_length=1000):
+    return Schema(
+        Field('message', text(max_length), required=True, missing='No message provided'),
+        Field('language', text(10, choices=languages), default='en'),
+    )
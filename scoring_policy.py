@@ -0,0 +1,206 @@
+"""Versioned scoring policy: loading, compilation and hot reload
+
+The score bands live in ``scoring_policy.json``. At startup the file is
+compiled into sorted NumPy threshold arrays plus label/reason lookup tables
+so scoring is a series of ``np.searchsorted`` bisections over precomputed
+data. ``PolicyStore`` re-checks the file's mtime (at most every
+``POLICY_RELOAD_INTERVAL`` seconds) and swaps the compiled policy in a
+single reference assignment, so each gunicorn worker picks up edits without
+a restart and an in-flight request always sees one consistent policy.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_policy.json')
+
+# Criteria in the order they are reported in criteria_scores and reasons
+CRITERIA_ORDER = ('cibil', 'income', 'emi_ratio', 'balance', 'age', 'employment')
+
+
+class CompiledCriterion:
+    """Lookup tables for one criterion; band 0 is the best band"""
+
+    def __init__(self, key, name, bands):
+        self.key = key
+        self.name = name
+        self.points = np.array([band['points'] for band in bands], dtype=np.float64)
+        self.labels = tuple(band['label'] for band in bands)
+        self.reasons = tuple(band.get('reason') for band in bands)
+        # Index of the catch-all band used when no condition matches
+        self.default_band = len(bands) - 1
+
+
+class CompiledPolicy:
+    """Immutable, precompiled form of a scoring policy document"""
+
+    def __init__(self, document):
+        self.version = str(document['version'])
+        self.interest_rate = float(document['interest_rate'])
+        self.monthly_rate = self.interest_rate / 100 / 12
+        self.processing_fee_rate = float(document['processing_fee_rate'])
+        self.ml_weight = float(document['ml_weight'])
+        self.max_score = float(document['max_score'])
+
+        criteria = document['criteria']
+        missing = [key for key in CRITERIA_ORDER if key not in criteria]
+        if missing:
+            raise ValueError(f"Policy is missing criteria: {', '.join(missing)}")
+
+        self.criteria = []
+        for key in CRITERIA_ORDER:
+            spec = criteria[key]
+            bands = spec['bands']
+            _require_default_band(key, bands)
+            self.criteria.append(CompiledCriterion(key, spec['name'], bands))
+        self.by_key = {criterion.key: criterion for criterion in self.criteria}
+
+        cibil = criteria['cibil']['bands'][:-1]
+        # Descending minimums become an ascending array for searchsorted(side='right')
+        self.cibil_thresholds = _descending(key='cibil', values=[band['min'] for band in cibil])[::-1]
+
+        self.income_multiplier = float(criteria['income']['income_multiplier'])
+        self.income_factors = _ascending('income', [band['max_factor'] for band in criteria['income']['bands'][:-1]])
+
+        self.emi_ratio_thresholds = _ascending('emi_ratio', [band['max'] for band in criteria['emi_ratio']['bands'][:-1]])
+
+        self.required_balance_ratio = float(criteria['balance']['required_ratio'])
+        self.balance_factors = _descending('balance', [band['min_factor'] for band in criteria['balance']['bands'][:-1]])
+
+        self.age_edges, self.age_table = _compile_ranges(criteria['age']['bands'])
+
+        self.employment_lookup = {}
+        for index, band in enumerate(criteria['employment']['bands'][:-1]):
+            for value in band['values']:
+                self.employment_lookup.setdefault(value, index)
+
+        statuses = document['statuses']
+        _require_default_band('statuses', statuses)
+        self.status_thresholds = _descending('statuses', [status['min_score'] for status in statuses[:-1]])[::-1]
+        self.statuses = tuple(
+            (status['status'], status['status_class'], status['recommendation'])
+            for status in statuses
+        )
+
+    def static_strings(self):
+        """Every user-facing string the policy can produce"""
+        strings = []
+        for criterion in self.criteria:
+            strings.extend(reason for reason in criterion.reasons if reason)
+        for status, _, recommendation in self.statuses:
+            strings.extend([status, recommendation])
+        return strings
+
+
+def _require_default_band(key, bands):
+    if not bands:
+        raise ValueError(f"Policy '{key}' has no bands")
+    conditions = ('min', 'max', 'min_factor', 'max_factor', 'range', 'values', 'min_score')
+    if any(condition in bands[-1] for condition in conditions):
+        raise ValueError(f"Policy '{key}' must end with an unconditional default band")
+
+
+def _ascending(key, values):
+    array = np.array(values, dtype=np.float64)
+    if np.any(np.diff(array) <= 0):
+        raise ValueError(f"Policy '{key}' thresholds must be strictly ascending")
+    return array
+
+
+def _descending(key, values):
+    array = np.array(values, dtype=np.float64)
+    if np.any(np.diff(array) >= 0):
+        raise ValueError(f"Policy '{key}' thresholds must be strictly descending")
+    return array
+
+
+def _compile_ranges(bands):
+    """Compile first-match inclusive integer ranges into a searchsorted table
+
+    Returns ``(edges, table)`` such that the band for integer ``x`` is
+    ``table[np.searchsorted(edges, x, side='right')]``.
+    """
+    ranges = []
+    for band in bands[:-1]:
+        low, high = band['range']
+        if int(low) != low or int(high) != high or low > high:
+            raise ValueError("Policy 'age' ranges must be ascending integer pairs")
+        ranges.append((int(low), int(high)))
+
+    default = len(bands) - 1
+    edges = sorted({low for low, _ in ranges} | {high + 1 for _, high in ranges})
+    table = [default]
+    for start in edges:
+        band = next((index for index, (low, high) in enumerate(ranges) if low <= start <= high), default)
+        table.append(band)
+    return np.array(edges, dtype=np.int64), np.array(table, dtype=np.int64)
+
+
+def load_policy(path=DEFAULT_POLICY_PATH):
+    """Read and compile a policy file"""
+    with open(path, 'r', encoding='utf-8') as policy_file:
+        document = json.load(policy_file)
+    try:
+        return CompiledPolicy(document)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid scoring policy {path}: {str(e)}") from e
+
+
+class PolicyStore:
+    """Holds the active compiled policy and hot-reloads it on file changes"""
+
+    def __init__(self, path=DEFAULT_POLICY_PATH, reload_interval=5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = os.stat(path).st_mtime_ns
+        self._checked_at = time.monotonic()
+        self._policy = load_policy(path)
+        logger.info(f"Loaded scoring policy version {self._policy.version}")
+
+    def current(self):
+        """Return the active policy, reloading first if the file changed"""
+        if self.reload_interval >= 0 and time.monotonic() - self._checked_at >= self.reload_interval:
+            self.maybe_reload()
+        return self._policy
+
+    def maybe_reload(self, force=False):
+        """Recompile the policy if its file changed; returns the active policy"""
+        if not self._lock.acquire(blocking=force):
+            # Another thread is already checking
+            return self._policy
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                logger.error(f"Cannot stat scoring policy: {str(e)}")
+                return self._policy
+            if not force and mtime == self._mtime:
+                return self._policy
+            try:
+                policy = load_policy(self.path)
+            except (OSError, ValueError) as e:
+                # Keep serving with the previous policy
+                logger.error(f"Scoring policy reload failed: {str(e)}")
+                return self._policy
+            self._mtime = mtime
+            if policy.version != self._policy.version:
+                logger.info(f"Scoring policy reloaded: {self._policy.version} -> {policy.version}")
+            # Single reference assignment: readers see either the old or the new policy
+            self._policy = policy
+            return policy
+        finally:
+            self._lock.release()
+
+
+policy_store = PolicyStore(
+    os.getenv('POLICY_PATH', DEFAULT_POLICY_PATH),
+    float(os.getenv('POLICY_RELOAD_INTERVAL', '5'))
+)
@@ -0,0 +1,258 @@
+"""Indexed, precompressed serving of the built React frontend
+
+``StaticAssets`` walks the Vite build (``Loan_Approval/project/dist``) once at
+startup. Every file gets a strong ETag (a digest of its contents) and the
+``.br``/``.gz`` siblings found next to it; ``index.html`` is held in memory,
+compressed. A request path is then a dict lookup: a known file is sent,
+preferring brotli, then gzip, as allowed by ``Accept-Encoding``; anything
+else is a SPA route and gets ``index.html`` from memory. ``If-None-Match``
+is answered with 304 when it names the representation being served.
+
+Vite emits content-hashed bundles (``assets/index-3fA9c1Qb.js``); their URL
+changes whenever their contents do, so they are sent with a one-year
+``immutable`` Cache-Control. Everything else, ``index.html`` included, is
+``no-cache``: browsers revalidate it and usually get a 304.
+
+Precompress a build once after ``npm run build``:
+
+    python static_assets.py [DIST_DIR]
+
+writes ``.gz`` (and ``.br`` with the ``brotli`` package) next to every
+compressible file that shrinks. A rebuild needs a restart to be indexed.
+"""
+import argparse
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import sys
+
+from flask import Response, send_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIST_PATH = os.path.join('Loan_Approval', 'project', 'dist')
+
+# Suffix -> Content-Encoding of precompressed siblings, in order of preference
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+
+COMPRESSIBLE_EXTENSIONS = frozenset({
+    '.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.xml', '.map', '.ico', '.wasm', '.webmanifest',
+})
+MIN_COMPRESS_SIZE = 1024
+
+# Vite's default output name: assets/<name>-<8+ char content hash>.<ext>
+HASHED_ASSET = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
+
+class Asset:
+    """One servable file: its representations and their headers"""
+
+    __slots__ = ('path', 'mimetype', 'etag', 'cache_control', 'variants')
+
+    def __init__(self, path, mimetype, etag, cache_control, variants):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+        # Content-Encoding -> file path, in preference order
+        self.variants = variants
+
+
+class StaticAssets:
+    """Path -> Asset index of a frontend build, plus an in-memory index.html"""
+
+    def __init__(self, root=DEFAULT_DIST_PATH, index='index.html'):
+        self.root = root
+        self.index_name = index
+        self.assets = {}
+        self.index = None
+        self.index_etag = None
+        self.served = {'files': 0, 'index': 0, 'not_modified': 0, 'encoded': 0}
+        self.load()
+
+    def load(self):
+        """Index every file under the root (precompressed siblings are variants, not files)"""
+        assets = {}
+        if os.path.isdir(self.root):
+            for directory, _, names in os.walk(self.root):
+                present = set(names)
+                for name in names:
+                    if name.endswith(('.br', '.gz')) and name[:-3] in present:
+                        continue
+                    path = os.path.join(directory, name)
+                    relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                    assets[relative] = self._asset(relative, path, present)
+        self.assets = assets
+        self._load_index()
+        logger.info(f"Indexed {len(assets)} static assets in {self.root}" if assets else f"No frontend build in {self.root}")
+
+    def _asset(self, relative, path, present):
+        name = os.path.basename(path)
+        variants = {encoding: path + suffix for suffix, encoding in ENCODINGS if name + suffix in present}
+        return Asset(
+            path,
+            mimetypes.guess_type(name)[0] or 'application/octet-stream',
+            file_digest(path),
+            IMMUTABLE if HASHED_ASSET.match(relative) else REVALIDATE,
+            variants
+        )
+
+    def _load_index(self):
+        asset = self.assets.get(self.index_name)
+        if asset is None:
+            self.index = None
+            return
+        with open(asset.path, 'rb') as f:
+            body = f.read()
+        # Every representation of the shell, kept in memory for SPA fallbacks
+        self.index = {None: body}
+        for encoding, path in asset.variants.items():
+            with open(path, 'rb') as f:
+                self.index[encoding] = f.read()
+        if 'br' not in self.index and brotli is not None:
+            self.index['br'] = brotli.compress(body, quality=11)
+        if 'gzip' not in self.index:
+            self.index['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+        self.index_etag = asset.etag
+
+    @property
+    def built(self):
+        return self.index is not None
+
+    @staticmethod
+    def negotiate(request, available):
+        """Preferred Content-Encoding among ``available`` the client accepts, or None"""
+        accepted = request.accept_encodings
+        for _, encoding in ENCODINGS:
+            if encoding in available and accepted[encoding] > 0:
+                return encoding
+        return None
+
+    def _not_modified(self, request, etag, headers):
+        if etag in request.if_none_match:
+            self.served['not_modified'] += 1
+            return Response(status=304, headers=headers)
+        return None
+
+    @staticmethod
+    def _headers(etag, encoding, cache_control, negotiated):
+        # Each encoding is its own representation, so each gets its own strong ETag
+        headers = {'ETag': f'"{etag}-{encoding}"' if encoding else f'"{etag}"', 'Cache-Control': cache_control}
+        if negotiated:
+            headers['Vary'] = 'Accept-Encoding'
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return headers
+
+    def serve(self, request, path):
+        """Response for a built file, or None if ``path`` is not one"""
+        asset = self.assets.get(path)
+        if asset is None:
+            return None
+        if path == self.index_name:
+            return self.serve_index(request)
+        self.served['files'] += 1
+        encoding = self.negotiate(request, asset.variants)
+        etag = f'{asset.etag}-{encoding}' if encoding else asset.etag
+        headers = self._headers(asset.etag, encoding, asset.cache_control, bool(asset.variants))
+        response = self._not_modified(request, etag, headers)
+        if response is not None:
+            return response
+        if encoding:
+            self.served['encoded'] += 1
+        response = send_file(
+            asset.variants[encoding] if encoding else asset.path,
+            mimetype=asset.mimetype, etag=False, conditional=False, max_age=None
+        )
+        response.headers.update(headers)
+        return response
+
+    def serve_index(self, request):
+        """index.html from memory (SPA entry point and fallback), or None if not built"""
+        if self.index is None:
+            return None
+        self.served['index'] += 1
+        encoding = self.negotiate(request, self.index)
+        etag = f'{self.index_etag}-{encoding}' if encoding else self.index_etag
+        headers = self._headers(self.index_etag, encoding, REVALIDATE, True)
+        response = self._not_modified(request, etag, headers)
+        if response is not None:
+            return response
+        if encoding:
+            self.served['encoded'] += 1
+        return Response(self.index[encoding], mimetype='text/html', headers=headers)
+
+    def stats(self):
+        return dict(
+            self.served,
+            root=self.root,
+            built=self.built,
+            assets=len(self.assets),
+            precompressed=sum(1 for asset in self.assets.values() if asset.variants),
+        )
+
+
+def precompress(root, min_size=MIN_COMPRESS_SIZE):
+    """Write .gz (and .br if brotli is installed) siblings; returns (files, bytes in, bytes out)"""
+    files = original = compressed = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as f:
+                body = f.read()
+            encoders = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+            for suffix, compress in encoders:
+                encoded = compress(body)
+                # Not worth a variant unless it saves something
+                if len(encoded) >= len(body):
+                    continue
+                with open(path + suffix, 'wb') as f:
+                    f.write(encoded)
+                files += 1
+                original += len(body)
+                compressed += len(encoded)
+    return files, original, compressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write precompressed .gz/.br variants of a frontend build')
+    parser.add_argument('root', nargs='?', default=DEFAULT_DIST_PATH, help='build directory')
+    parser.add_argument('--min-size', type=int, default=MIN_COMPRESS_SIZE, help='skip smaller files (bytes)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    if not os.path.isdir(args.root):
+        logging.error(f"No build directory at {args.root}")
+        return 1
+    if brotli is None:
+        logging.warning("brotli is not installed; writing gzip variants only")
+    files, original, compressed = precompress(args.root, args.min_size)
+    logging.info(f"Wrote {files} variants: {original} -> {compressed} bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Local stand-in for GoogleTranslator that never touches the network
+
+Used to build the translation catalog offline, in tests and in benchmarks.
+``latency`` (seconds) simulates the upstream round-trip.
+"""
+import asyncio
+import time
+
+
+class StubTranslator:
+    """Mimics deep_translator.GoogleTranslator's translate() interface"""
+
+    def __init__(self, source="auto", target="en", latency=0.0):
+        self.source = source
+        self.target = target
+        self.latency = latency
+
+    def translate(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return f"[{self.target}] {text}"
+
+    async def atranslate(self, text):
+        """Non-blocking variant used by the ASGI serving mode"""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return f"[{self.target}] {text}"
+
+    def translate_batch(self, batch):
+        if self.latency:
+            time.sleep(self.latency)
+        return [f"[{self.target}] {text}" for text in batch]
@@ -0,0 +1,108 @@
+"""Tests: cross-worker admission control
+
+Run with:  python -m pytest test_admission.py
+"""
+import multiprocessing
+import socket
+import time
+
+import pytest
+
+from admission import AdmissionControl, Limit, create_admission_control, parse_limits, release_worker, request_queue_time
+
+
+def test_empty_bucket_is_rate_limited_and_nearly_empty_is_degraded():
+    control = AdmissionControl({'translate': Limit(rate=2, burst=4, concurrency=10)}, degrade_below=0.5)
+    tickets = [control.admit('translate') for _ in range(4)]
+    assert all(ticket.admitted for ticket in tickets)
+    assert [ticket.degraded for ticket in tickets] == [False, False, True, True]
+    for ticket in tickets:
+        ticket.release()
+
+    rejected = control.admit('translate')
+    assert (rejected.status, rejected.reason, rejected.retry_after) == (429, 'rate_limited', 1)
+    time.sleep(0.55)
+    with control.admit('translate') as ticket:
+        assert ticket.admitted
+
+    # Unguarded endpoints and a disabled controller always admit
+    assert control.admit('health').admitted
+    assert AdmissionControl({'translate': Limit(0, 0, 0)}, enabled=False).admit('translate').admitted
+
+
+def hold_slot(path, ready, done):
+    control = AdmissionControl({'calculate_loan': Limit(100, 100, 1)}, path=path)
+    ticket = control.admit('calculate_loan')
+    ready.put(ticket.admitted)
+    # Exits without releasing, like a worker killed mid-request
+    done.wait(5)
+
+
+def test_concurrency_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'admission')
+    control = AdmissionControl({'calculate_loan': Limit(100, 100, 1)}, path=path, queue_timeout=0.05, max_queue=1)
+    context = multiprocessing.get_context('fork')
+    ready, done = context.Queue(), context.Event()
+    worker = context.Process(target=hold_slot, args=(path, ready, done))
+    worker.start()
+    try:
+        assert ready.get(timeout=5)
+        # The other process holds the only slot: queue, then give up with 503
+        ticket = control.admit('calculate_loan')
+        assert (ticket.status, ticket.reason) == (503, 'overloaded')
+        assert ticket.waited >= 0.05
+        assert control.stats()['endpoints']['calculate_loan']['in_flight'] == 1
+    finally:
+        done.set()
+        worker.join(5)
+
+    # It exited without releasing; the master frees its slot
+    assert control.stats()['endpoints']['calculate_loan']['in_flight'] == 1
+    release_worker(worker.pid, path)
+    assert control.stats()['endpoints']['calculate_loan']['in_flight'] == 0
+    with control.admit('calculate_loan') as ticket:
+        assert ticket.admitted and not ticket.degraded
+
+
+def test_configuration_and_queue_age():
+    limits = parse_limits('translate=5/10/2')
+    assert limits['translate'] == Limit(5.0, 10.0, 2) and 'chatbot' in limits
+    with pytest.raises(ValueError, match='Unknown admission endpoint'):
+        parse_limits('nope=1/1/1')
+
+    now = 1700000000.0
+    assert request_queue_time(f't={int((now - 2) * 1000)}', now) == pytest.approx(2, abs=0.01)
+    assert request_queue_time(f'{(now - 0.5) * 1e6:.0f}', now) == pytest.approx(0.5, abs=0.01)
+    assert request_queue_time('garbage', now) is None
+
+    control = AdmissionControl({'chatbot': Limit(10, 10, 1)}, max_queue_age=1)
+    assert control.admit('chatbot', queued_for=3).reason == 'expired'
+
+
+def test_off_unless_enabled(monkeypatch):
+    monkeypatch.delenv('ADMISSION_CONTROL', raising=False)
+    monkeypatch.setenv('ADMISSION_STATE_PATH', '')
+    assert not create_admission_control().enabled
+    monkeypatch.setenv('ADMISSION_CONTROL', 'true')
+    assert create_admission_control().enabled
+
+
+def test_listen_backlog_degrades_then_sheds():
+    listener = socket.create_server(('127.0.0.1', 0), backlog=16)
+    clients = []
+    try:
+        control = AdmissionControl({'chatbot': Limit(100, 100, 10)}, max_backlog=3, degrade_backlog=2)
+        control.watch([listener])
+        outcomes = []
+        for _ in range(5):
+            with control.admit('chatbot') as ticket:
+                outcomes.append('degraded' if ticket.degraded else ticket.reason or 'admitted')
+            clients.append(socket.create_connection(listener.getsockname()))
+            time.sleep(0.05)
+        # 0 and 1 waiting connections, then 2 and 3, then 4
+        assert outcomes == ['admitted', 'admitted', 'degraded', 'degraded', 'overloaded']
+        assert control.stats()['backlog'] == 5
+    finally:
+        for client in clients:
+            client.close()
+        listener.close()
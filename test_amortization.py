@@ -0,0 +1,71 @@
+"""Tests: vectorized amortization schedules
+
+Run with:  python -m pytest test_amortization.py
+"""
+import numpy as np
+import pytest
+
+import rule_engine
+from amortization import amortize, grid_axes, iter_scenarios, scenario_count, scenario_grid
+
+
+def loop_schedule(amount, tenure, annual_rate, emi):
+    """Month-by-month reference implementation"""
+    rate = annual_rate / 1200
+    balance = amount
+    rows = []
+    for _ in range(tenure):
+        interest = balance * rate
+        balance -= emi - interest
+        rows.append((interest, emi - interest, max(balance, 0.0)))
+    return np.array(rows)
+
+
+def test_closed_form_matches_the_monthly_loop():
+    schedules = amortize(*scenario_grid([250000, 1200000], [12, 360], [0, 8.5, 12]))
+    assert len(schedules.emi) == 12
+
+    for index in range(12):
+        amount, tenure, rate = schedules.amount[index], schedules.tenure[index], schedules.annual_rate[index]
+        expected = loop_schedule(amount, tenure, rate, schedules.emi[index])
+        actual = np.column_stack([
+            schedules.interest[index, :tenure], schedules.principal[index, :tenure], schedules.balance[index, :tenure]
+        ])
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-6)
+        assert not schedules.interest[index, tenure:].any()
+        assert schedules.principal[index, :tenure].sum() == pytest.approx(amount)
+
+    # Same EMI as eligibility scoring at the policy rate
+    np.testing.assert_allclose(
+        amortize([500000.0], [60], [12.0]).emi, rule_engine.estimated_emi(np.array([500000.0]), np.array([60]), 0.01)
+    )
+
+
+def test_records_are_chunked_without_changing_results():
+    grid = ([100000, 300000], [6, 12, 24], [9, 12])
+    whole = list(iter_scenarios(*grid, processing_fee_rate=0.01))
+    chunked = list(iter_scenarios(*grid, processing_fee_rate=0.01, chunk_size=5))
+    assert whole == chunked and len(whole) == 12
+
+    first = whole[0]
+    assert (first['amount'], first['tenure'], first['annual_rate']) == (100000.0, 6, 9.0)
+    assert first['processing_fee'] == 1000.0
+    assert len(first['schedule']['balance']) == 6 and first['schedule']['balance'][-1] == 0.0
+    assert 'schedule' not in next(iter_scenarios(*grid, schedule=False))
+
+    # Chunks are taken in grid order, amounts varying slowest
+    amount, tenure, rate = scenario_grid(*grid)
+    assert [(r['amount'], r['tenure'], r['annual_rate']) for r in chunked] == list(zip(amount, tenure, rate))
+    assert scenario_count(*grid_axes(*grid)) == 12
+
+
+@pytest.mark.parametrize('grid, message', [
+    (([], [12], [12]), 'amounts must not be empty'),
+    (([-5], [12], [12]), 'amounts must be positive'),
+    (([1000], [12.5], [12]), 'whole months'),
+    (([1000], [0], [12]), 'tenures must be between'),
+    (([1000], [12], ['high']), 'rates must be a list of numbers'),
+])
+def test_invalid_grids_are_rejected(grid, message):
+    with pytest.raises(ValueError, match=message):
+        scenario_grid(*grid)
@@ -0,0 +1,223 @@
+"""Tests: Flask API endpoints
+
+Run with:  python -m pytest test_app.py
+"""
+import random
+import time
+
+import pytest
+
+import app as app_module
+from app import LoanChatbot, Translator
+from stub_translator import StubTranslator
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_amortization_grid_is_sized_before_it_is_built(client, monkeypatch):
+    def no_grid(*args, **kwargs):
+        raise AssertionError('grid built for an oversized request')
+
+    monkeypatch.setattr(app_module.amortization.np, 'meshgrid', no_grid)
+    response = client.post('/api/amortization', json={
+        'amounts': list(range(1, 3001)), 'tenures': list(range(1, 601)), 'rates': list(range(10)),
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Too many scenarios')
+
+
+def test_amortization_flags_are_parsed_strictly(client):
+    body = {'amounts': [100000], 'tenures': [12]}
+    response = client.post('/api/amortization', json=dict(body, schedule='false'))
+    assert response.status_code == 200
+    assert 'schedule' not in response.get_json()['scenarios'][0]
+    assert 'schedule' in client.post('/api/amortization', json=body).get_json()['scenarios'][0]
+
+    response = client.post('/api/amortization', json=dict(body, schedule='maybe'))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'schedule must be true or false'
+
+
+@pytest.mark.parametrize('body, content_type', [
+    ('{"amounts": [100000], ', 'application/json'),
+    ('amounts=100000', 'text/plain'),
+])
+def test_amortization_rejects_unparseable_bodies(client, body, content_type):
+    response = client.post('/api/amortization', data=body, content_type=content_type)
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Request must be a JSON object'}
+
+
+def keyword_loop_intent(chatbot, message):
+    """The original get_response routing ladder"""
+    message_lower = message.lower()
+    if not any(keyword in message_lower for keyword in LoanChatbot.LOAN_KEYWORDS):
+        return 'off_topic'
+    if any(greeting in message_lower for greeting in LoanChatbot.GREETINGS):
+        return 'greeting'
+    for topic, data in chatbot.loan_knowledge.items():
+        if any(keyword in message_lower for keyword in data["keywords"]):
+            return topic
+    return 'default'
+
+
+def test_chatbot_routing_matches_the_keyword_loop():
+    chatbot = app_module.loan_chatbot
+    vocabulary = list(LoanChatbot.LOAN_KEYWORDS) + list(LoanChatbot.GREETINGS) + [
+        keyword for data in chatbot.loan_knowledge.values() for keyword in data["keywords"]
+    ] + ['weather', 'the', 'ThE', 'CIBIL', 'How Long', 'x' * 3000]
+    rng = random.Random(0)
+    for _ in range(5000):
+        message = ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6)))
+        match = chatbot.match(message)
+        assert match['intent'] == keyword_loop_intent(chatbot, message), message
+        assert match['is_loan_related'] == (match['intent'] != 'off_topic')
+
+
+def test_chatbot_reports_every_keyword_hit_with_positions():
+    chatbot = app_module.loan_chatbot
+    message = 'Hi! EMI on a home loan? Loan again'
+    match = chatbot.match(message, with_matches=True)
+    assert match['intent'] == chatbot.match(message)['intent'] == 'greeting'
+    hits = {(hit['keyword'], hit['kind'], hit['intent'], hit['start'], hit['end']) for hit in match['matches']}
+    assert ('hi', 'greeting', 'greeting', 0, 2) in hits
+    assert ('emi', 'topic', 'emi_calculation', 4, 7) in hits
+    assert ('home', 'loan', None, 13, 17) in hits
+    assert {(start, end) for keyword, kind, _, start, end in hits if keyword == 'loan'} == {(18, 22), (24, 28)}
+    assert [hit['start'] for hit in match['matches']] == sorted(hit['start'] for hit in match['matches'])
+    assert chatbot.matches('What is the weather like?') == []
+
+
+APPLICATION = {
+    'bank_balance': 250000, 'cibil_score': 780, 'loan_amount': 500000, 'monthly_income': 90000,
+    'loan_tenure': 60, 'age': 35, 'employment_type': 'Salaried', 'income_source': 'Salary',
+    'existing_loans': 'No',
+}
+
+
+def test_batch_scores_valid_rows_and_reports_bad_ones(client):
+    applications = [
+        APPLICATION,
+        dict(APPLICATION, cibil_score=None),
+        'not an application',
+        dict(APPLICATION, loan_tenure=0),
+        dict(APPLICATION, language='hi'),
+    ]
+    response = client.post('/api/calculate_loan/batch', json={'applications': applications})
+    assert response.status_code == 200
+    body = response.get_json()
+    results = body['results']
+    assert body['summary'] == {'total': 5, 'scored': 2, 'failed': 3}
+    assert [entry['success'] for entry in results] == [True, False, False, False, True]
+
+    # Same decision as scoring the row alone
+    single = client.post('/api/calculate_loan', json=APPLICATION).get_json()['result']
+    for key in ('status', 'eligibility_score', 'reasons'):
+        assert results[0]['result'][key] == single[key]
+    assert results[1]['error'] == 'Missing required field: cibil_score'
+    assert results[1]['errors'] == {'cibil_score': 'is required'}
+    assert results[2]['error'] == 'Application must be a JSON object'
+    assert results[3]['error'] == 'Invalid loan_tenure: must be between 1 and 600'
+
+
+def test_batch_rejects_bad_requests(client, monkeypatch):
+    def post(body):
+        return client.post('/api/calculate_loan/batch', json=body)
+
+    assert post({'applications': []}).get_json()['error'] == 'No applications provided'
+    assert post(['not', 'an', 'object']).status_code == 400
+
+    monkeypatch.setattr(app_module, 'MAX_BATCH_SIZE', 2)
+    response = post({'applications': [APPLICATION] * 3})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Batch too large (max 2 applications)'
+
+    for language in (['x'], 'xx', 7):
+        response = post({'applications': [APPLICATION], 'language': language})
+        assert response.status_code == 400
+        assert 'language' in response.get_json()['errors']
+
+
+def test_batch_rows_use_their_normalized_language(client, monkeypatch):
+    targets = []
+
+    def record(result, target_lang, keys=None):
+        targets.append(target_lang)
+        return result
+
+    monkeypatch.setattr(app_module.translator, 'translate_dict', record)
+    monkeypatch.setattr(app_module.translator, 'translate_dict_offline', record)
+    applications = [
+        dict(APPLICATION, language=''),
+        dict(APPLICATION, language=' ta '),
+        APPLICATION,
+        dict(APPLICATION, language='en'),
+    ]
+    response = client.post('/api/calculate_loan/batch', json={'applications': applications, 'language': 'hi'})
+    assert response.status_code == 200
+    assert targets == ['hi', 'ta', 'hi']
+    assert all('language' not in entry for entry in response.get_json()['results'])
+
+
+@pytest.mark.parametrize('fields', [5, [['x']]])
+def test_counterfactual_rejects_malformed_fields(client, fields):
+    response = client.post('/api/counterfactual', json=dict(APPLICATION, fields=fields))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'fields must be a field name or a list of field names'
+
+
+def test_calculate_loan_rejects_an_unpayable_tenure(client):
+    response = client.post('/api/calculate_loan', json=dict(APPLICATION, loan_tenure=10 ** 6))
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == {'loan_tenure': 'must be between 1 and 600'}
+    assert client.post('/api/calculate_loan', json=dict(APPLICATION, age=16)).status_code == 200
+
+
+def stub_translator(monkeypatch, latency=0.0, failing=()):
+    """A fresh Translator whose stub backend sleeps ``latency`` and raises on ``failing`` texts"""
+    class Backend(StubTranslator):
+        def translate(self, text):
+            if text in failing:
+                raise RuntimeError('upstream error')
+            return super().translate(text)
+
+    translator = Translator()
+    monkeypatch.setattr(translator, '_backend', lambda lang: Backend(target=lang, latency=latency))
+    return translator
+
+
+def test_a_miss_is_looked_up_and_counted_once(monkeypatch):
+    translator = stub_translator(monkeypatch)
+    assert translator.concurrency > 1
+    misses = app_module.metrics.counters['cache_requests'][('translation', 'miss')]
+
+    assert translator.translate('Looked up once', 'hi') == '[hi] Looked up once'
+    assert translator.cache.stats()['memory']['misses'] == 1
+    assert app_module.metrics.counters['cache_requests'][('translation', 'miss')] == misses + 1
+
+
+def test_slow_backend_returns_english_within_the_deadline(monkeypatch):
+    translator = stub_translator(monkeypatch, latency=1.0)
+    result = {'status': 'Deadline status', 'reasons': ['Deadline reason 1', 'Deadline reason 2'], 'score': 70}
+
+    started = time.perf_counter()
+    translated = translator.translate_dict(result, 'hi', ['status', 'reasons'], deadline=0.1)
+    assert time.perf_counter() - started < 0.5
+    assert translated == result
+    assert translator.timeouts == 3
+
+
+def test_failed_leaves_fall_back_to_english_individually(monkeypatch):
+    translator = stub_translator(monkeypatch, failing={'Leaf that fails'})
+    result = {'status': 'Leaf that works', 'reasons': ['Leaf that fails', 'Leaf that works'], 'recommendation': None}
+
+    translated = translator.translate_dict(result, 'ta', ['status', 'reasons', 'recommendation'])
+    assert translated == {
+        'status': '[ta] Leaf that works',
+        'reasons': ['Leaf that fails', '[ta] Leaf that works'],
+        'recommendation': None,
+    }
+    assert translator.timeouts == 0
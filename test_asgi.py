@@ -0,0 +1,124 @@
+"""Tests: native ASGI routes (asgi.py)
+
+Run with:  python -m pytest test_asgi.py
+"""
+import asyncio
+import json
+import threading
+
+import asgi
+
+APPLICATION = {
+    'bank_balance': 250000, 'cibil_score': 780, 'loan_amount': 500000, 'monthly_income': 90000,
+    'loan_tenure': 60, 'age': 35, 'employment_type': 'Salaried', 'income_source': 'Salary',
+    'existing_loans': 'No',
+}
+
+
+def call(method, path, body=b'', headers=()):
+    """Run one HTTP request through asgi.application; returns (status, headers, body)"""
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'content-type', b'application/json')] + [(k.encode(), v.encode()) for k, v in headers],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(asgi.application(scope, receive, send))
+    start = messages[0]
+    payload = b''.join(message.get('body', b'') for message in messages[1:])
+    return start['status'], {k.decode(): v.decode() for k, v in start['headers']}, payload
+
+
+def test_json_error_paths():
+    status, headers, body = call('POST', '/api/calculate_loan', b'{not json')
+    assert status == 400 and json.loads(body) == {'success': False, 'error': 'Invalid JSON body'}
+    assert headers['content-type'] == 'application/json'
+
+    status, _, body = call('POST', '/api/calculate_loan', dict(APPLICATION, age='old'))
+    assert status == 400 and json.loads(body)['errors'] == {'age': 'must be a whole number'}
+
+    status, _, body = call('POST', '/api/translate', {'target_lang': 'hi'})
+    assert status == 400 and json.loads(body)['error'] == 'No text provided'
+
+    status, _, body = call('POST', '/chatbot', ['not', 'an', 'object'])
+    assert status == 400 and json.loads(body)['error'] == 'Request must be a JSON object'
+
+    status, _, body = call('POST', '/api/calculate_loan', APPLICATION)
+    assert status == 200 and json.loads(body)['result']['status']
+
+
+def test_chatbot_etag_revalidates_to_304():
+    status, headers, body = call('POST', '/api/chatbot', {'message': 'How is EMI calculated?'})
+    assert status == 200 and json.loads(body)['is_loan_related'] is True
+    etag = headers['etag']
+    assert headers['cache-control'].startswith('public, max-age=')
+
+    status, headers, body = call('POST', '/api/chatbot', {'message': 'What is the EMI formula?'},
+                                 [('if-none-match', f'"other", {etag}')])
+    assert status == 304 and body == b'' and headers['etag'] == etag
+
+
+def test_cors_mirrors_allowed_origins_only():
+    origin = asgi.allowed_origins[0]
+    _, headers, _ = call('POST', '/api/chatbot', {'message': 'hello loan'}, [('origin', origin)])
+    assert headers['access-control-allow-origin'] == origin
+    assert headers['access-control-allow-credentials'] == 'true' and headers['vary'] == 'Origin'
+
+    _, headers, _ = call('POST', '/api/chatbot', {'message': 'hello loan'}, [('origin', 'https://evil.example')])
+    assert 'access-control-allow-origin' not in headers
+
+
+def test_other_routes_fall_through_to_flask():
+    status, _, body = call('GET', '/api/health')
+    assert status == 200 and json.loads(body)['status'] == 'healthy'
+
+    # Native routes only take POST; Flask answers everything else
+    for path in ('/api/chatbot', '/api/nope'):
+        status, _, body = call('GET', path)
+        assert status == 404 and json.loads(body)['error'] == 'Not found'
+
+
+def test_disk_backed_result_cache_is_read_off_the_event_loop(monkeypatch):
+    threads = []
+    loop_thread = threading.get_ident()
+
+    def get(key):
+        threads.append(threading.get_ident())
+        return None
+
+    monkeypatch.setattr(asgi, 'RESULT_DISK', True)
+    monkeypatch.setattr(asgi.result_cache, 'get', get)
+    status, _, _ = call('POST', '/api/calculate_loan', dict(APPLICATION, cibil_score=781))
+    assert status == 200
+    assert threads and loop_thread not in threads
+
+
+def test_shared_translation_cache_is_read_off_the_event_loop(tmp_path, monkeypatch):
+    from app import Translator
+    from translation_cache import TranslationCache
+
+    translator = Translator()
+    translator.cache = TranslationCache(path=str(tmp_path / 'cache.sqlite3'))
+    TranslationCache(path=str(tmp_path / 'cache.sqlite3')).set('Shared greeting', 'hi', 'साझा')
+    threads = []
+    get_shared = translator.cache.get_shared
+
+    def recording_get_shared(text, target_lang):
+        threads.append(threading.get_ident())
+        return get_shared(text, target_lang)
+
+    monkeypatch.setattr(translator.cache, 'get_shared', recording_get_shared)
+    assert asyncio.run(translator.atranslate('Shared greeting', 'hi')) == 'साझा'
+    assert threads and threading.get_ident() not in threads
+    # Promoted: the next lookup is answered by the LRU on the loop
+    assert asyncio.run(translator.atranslate('Shared greeting', 'hi')) == 'साझा' and len(threads) == 1
@@ -0,0 +1,64 @@
+"""Tests: streaming bulk scoring
+
+Run with:  python -m pytest test_bulk_score.py
+"""
+import csv
+import io
+import json
+
+from bulk_score import ChunkScorer, Progress, chunked, csv_header, read_records, score_stream
+
+
+class FakeCalculator:
+    """Approves every application with a cibil_score, records chunk sizes"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def calculate_eligibility_batch(self, applications):
+        self.chunks.append(len(applications))
+        return [
+            {'success': True, 'result': {'status': 'Approved', 'eligibility_score': int(data['cibil_score']), 'reasons': ['a', 'b']}}
+            if isinstance(data, dict) and 'cibil_score' in data else {'success': False, 'error': 'Missing required field: cibil_score'}
+            for data in applications
+        ]
+
+
+def test_readers_are_lazy_and_tolerate_bad_rows():
+    rows = list(read_records(io.StringIO('id,cibil_score,emi_existing\nA,700,\nB,,5\n'), 'csv'))
+    assert rows == [{'id': 'A', 'cibil_score': '700'}, {'id': 'B', 'emi_existing': '5'}]
+
+    lines = io.StringIO('{"cibil_score": 700}\n\nnot json\n{"cibil_score": 650}\n')
+    records = read_records(lines, 'ndjson')
+    assert next(records) == {'cibil_score': 700}
+    assert lines.tell() < len(lines.getvalue())
+    assert list(records) == [None, {'cibil_score': 650}]
+
+
+def test_chunks_stream_in_order_with_row_numbers_and_ids():
+    calculator = FakeCalculator()
+    applications = [{'id': f'A{i}', 'cibil_score': 600 + i} for i in range(7)]
+    applications[4] = {'id': 'bad'}
+    progress = Progress()
+
+    output = []
+    for text, rows, failed in score_stream(iter(applications), ChunkScorer(calculator=calculator), chunk_size=3):
+        output.append(text)
+        progress.update(rows, failed)
+
+    records = [json.loads(line) for line in ''.join(output).splitlines()]
+    assert calculator.chunks == [3, 3, 1]
+    assert [record['row'] for record in records] == list(range(1, 8))
+    assert records[6] == {'row': 7, 'id': 'A6', 'success': True, 'result': {'status': 'Approved', 'eligibility_score': 606, 'reasons': ['a', 'b']}}
+    assert records[4] == {'row': 5, 'id': 'bad', 'success': False, 'error': 'Missing required field: cibil_score'}
+    assert progress.summary()['rows'] == 7 and progress.summary()['failed'] == 1
+
+
+def test_csv_output():
+    scorer = ChunkScorer('csv', calculator=FakeCalculator())
+    text, rows, failed = scorer(1, [{'cibil_score': 700}, None])
+    table = list(csv.DictReader(io.StringIO(csv_header() + text)))
+    assert (rows, failed) == (2, 1)
+    assert table[0]['status'] == 'Approved' and table[0]['reasons'] == 'a; b' and table[0]['id'] == ''
+    assert table[1]['success'] == 'False' and table[1]['error'].startswith('Missing')
+    assert list(chunked(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
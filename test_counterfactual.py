@@ -0,0 +1,76 @@
+"""Tests: batched counterfactual search
+
+Run with:  python -m pytest test_counterfactual.py
+"""
+import pytest
+
+import rule_engine
+from counterfactual import CounterfactualSearch
+from scoring_policy import policy_store
+
+APPLICATION = {
+    'bank_balance': 40000, 'cibil_score': 690, 'loan_amount': 1500000, 'monthly_income': 45000,
+    'loan_tenure': 60, 'age': 41, 'employment_type': 'Contract', 'income_source': 'Salary',
+    'existing_loans': 'Yes', 'emi_existing': 6000,
+}
+
+
+def status_of(application):
+    names = [status for status, _, _ in policy_store.current().statuses]
+    result = rule_engine.evaluate(rule_engine.columns_from_rows([rule_engine.coerce_application(application)])).result(0)
+    return names.index(result['status'])
+
+
+class CountingPredictor:
+    """Rule-only predictions that count model calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, applications):
+        self.calls.append(len(applications))
+        return [None] * len(applications)
+
+
+def test_values_reach_the_target_and_the_next_step_does_not():
+    predictor = CountingPredictor()
+    result = CounterfactualSearch(predictor).search(APPLICATION, target_status='Conditionally Approved')
+    target = 1
+    assert status_of(APPLICATION) > target
+
+    amount = result['counterfactuals']['loan_amount']
+    assert amount['found'] and amount['exact']
+    assert status_of(dict(APPLICATION, loan_amount=amount['value'])) <= target
+    assert status_of(dict(APPLICATION, loan_amount=amount['value'] + 100)) > target
+
+    tenure = result['counterfactuals']['loan_tenure']
+    if tenure['found'] and tenure['value'] > 1:
+        assert status_of(dict(APPLICATION, loan_tenure=tenure['value'] - 1)) > target
+
+    # Every field is searched in the same passes: one model call per pass
+    assert len(predictor.calls) == result['passes'] + 1
+    assert result['evaluations'] == sum(predictor.calls)
+    assert result['passes'] <= 4
+
+
+def test_budget_cuts_the_search_short_with_a_valid_witness():
+    result = CounterfactualSearch(CountingPredictor(), sweep=8, max_evaluations=20).search(
+        APPLICATION, fields='loan_amount', target_status='Conditionally Approved'
+    )
+    amount = result['counterfactuals']['loan_amount']
+    assert result['budget_exhausted'] and result['evaluations'] <= 20
+    assert amount['found'] and not amount['exact']
+    assert status_of(dict(APPLICATION, loan_amount=amount['value'])) <= 1
+
+
+def test_bad_requests_raise_value_error():
+    search = CounterfactualSearch()
+    with pytest.raises(ValueError, match='Unsupported fields'):
+        search.search(APPLICATION, fields=['age'])
+    for fields in (5, [['loan_amount']], {'loan_amount': 1}):
+        with pytest.raises(ValueError, match='fields must be'):
+            search.search(APPLICATION, fields=fields)
+    with pytest.raises(ValueError, match='Unknown target_status'):
+        search.search(APPLICATION, target_status='Maybe')
+    with pytest.raises(ValueError, match='Invalid input'):
+        search.search(dict(APPLICATION, cibil_score='high'))
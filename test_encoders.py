@@ -0,0 +1,73 @@
+"""Tests: compiled feature encoding vs. the pickled sklearn LabelEncoders
+
+Run with:  python -m pytest test_encoders.py
+"""
+import random
+
+import joblib
+import numpy as np
+
+from encoders import MODEL_COLUMNS, VALUE_ALIASES, FeatureEncoder, vocabularies_from_label_encoders
+
+label_encoders = joblib.load('label_encoders.pkl')
+vocabularies = vocabularies_from_label_encoders(label_encoders)
+
+
+def random_application(rng):
+    return {
+        'age': rng.randint(18, 70),
+        'gender': rng.choice(['Male', 'Female', None, 'Other']),
+        'bank_balance': rng.uniform(0, 2e6),
+        'cibil_score': rng.randint(300, 900),
+        'existing_loans': rng.choice(['Yes', 'No', '']),
+        'loan_amount': str(rng.randint(1, 500) * 10000),
+        'loan_tenure': rng.randint(6, 360),
+        'monthly_income': rng.uniform(5000, 3e5),
+        'income_source': rng.choice(['Salary', 'Business', 'Freelance', 'Investment', 'Other']),
+        'employment_type': rng.choice(['Permanent', 'Contract', 'Government', 'Self-employed', 'Business']),
+        'emi_existing': rng.choice([0, rng.uniform(0, 1e5), None]),
+    }
+
+
+def test_tables_match_label_encoders():
+    encoder = FeatureEncoder(vocabularies)
+    for column, table in encoder.tables.items():
+        sklearn_encoder = label_encoders[column]
+        for label in sklearn_encoder.classes_:
+            assert table.encode(label) == sklearn_encoder.transform([label])[0]
+        for alias, label in VALUE_ALIASES.get(column, {}).items():
+            assert table.encode(alias) == sklearn_encoder.transform([label])[0]
+    assert all(table.unseen == 0 and table.missing == 0 for table in encoder.tables.values())
+
+
+def test_every_model_column_is_mapped_in_order():
+    model = joblib.load('loan_model.pkl')
+    assert tuple(model.feature_names_in_) == MODEL_COLUMNS
+    assert label_encoders['Loan_Status'].inverse_transform([FeatureEncoder(vocabularies).approved_class])[0] == 'Approved'
+
+
+def test_unseen_and_missing_categories_are_counted():
+    encoder = FeatureEncoder(vocabularies)
+    row = encoder.encode_row({'income_source': 'Other', 'employment_type': 'Permanent'})
+    features = dict(zip(MODEL_COLUMNS, row))
+    assert features['Income_Source'] == 1.5  # midpoint of 4 codes
+    assert features['Employment_Type'] == label_encoders['Employment_Type'].transform(['Salaried'])[0]
+    stats = encoder.stats()
+    assert stats['unseen']['Income_Source'] == 1
+    assert stats['missing']['Gender'] == 1 and stats['missing']['Existing_Loans'] == 1
+    assert stats['unseen']['Employment_Type'] == 0
+
+
+def test_column_encoding_matches_row_encoding():
+    rng = random.Random(11)
+    applications = [random_application(rng) for _ in range(500)]
+    applications[7]['loan_amount'] = 'lots'
+    applications[42]['age'] = {'years': 30}
+
+    encoder = FeatureEncoder(vocabularies)
+    features, row_indexes = encoder.encode_rows(applications)
+    assert 7 not in row_indexes and 42 not in row_indexes
+    assert len(row_indexes) == len(features) == 498
+
+    expected = np.array([encoder.encode_row(applications[index]) for index in row_indexes])
+    assert np.array_equal(features, expected)
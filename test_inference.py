@@ -0,0 +1,92 @@
+"""Parity tests: compiled inference engine vs. scikit-learn
+
+Run with:  python -m pytest test_inference.py
+"""
+import warnings
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from inference import PARITY_TOLERANCE, LogisticInference, SklearnInference, compile_model
+
+# Realistic magnitudes for the 12 model columns (age, balances, CIBIL, ...)
+FEATURE_SCALES = np.array([70, 1, 5e6, 900, 1, 5e6, 360, 5e5, 3, 1, 1, 2e5])
+
+
+def fuzz_features(rng, rows, scales):
+    uniform = rng.random((rows, len(scales))) * scales
+    heavy = rng.standard_normal((rows, len(scales))) * scales * rng.choice([1e-6, 1e-3, 1, 10], size=(rows, 1))
+    return np.vstack([uniform, heavy, np.zeros((1, len(scales)))])
+
+
+def sklearn_predict(model, features):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return model.predict(features), model.predict_proba(features)[:, 1]
+
+
+def assert_parity(model, features):
+    engine = compile_model(model)
+    assert isinstance(engine, LogisticInference)
+    expected_labels, expected = sklearn_predict(model, features)
+
+    labels, probabilities = engine.predict(features)
+    assert np.max(np.abs(probabilities - expected)) <= PARITY_TOLERANCE
+    assert np.array_equal(labels, expected_labels)
+
+    for row, expected_label, expected_probability in zip(features.tolist(), expected_labels, expected):
+        label, probability = engine.predict_one(row)
+        assert abs(probability - expected_probability) <= PARITY_TOLERANCE
+        assert label == expected_label
+
+
+def test_shipped_model_parity():
+    model = joblib.load('loan_model.pkl')
+    assert_parity(model, fuzz_features(np.random.default_rng(1), 5000, FEATURE_SCALES))
+
+
+def test_fitted_model_parity():
+    rng = np.random.default_rng(2)
+    X = rng.standard_normal((400, 6))
+    y = (X @ rng.standard_normal(6) + rng.standard_normal(400) > 0).astype(int)
+    for model in (LogisticRegression(), LogisticRegression(fit_intercept=False, C=0.1)):
+        model.fit(X, y)
+        assert_parity(model, fuzz_features(rng, 2000, np.ones(6) * 4))
+
+
+def test_string_labels_keep_class_order():
+    rng = np.random.default_rng(3)
+    X = rng.standard_normal((200, 3))
+    y = np.where(X[:, 0] > 0, 'yes', 'no')
+    model = LogisticRegression().fit(X, y)
+    engine = compile_model(model)
+    labels, _ = engine.predict(X)
+    assert np.array_equal(labels, model.predict(X))
+
+
+def test_unsupported_models_fall_back_to_sklearn():
+    rng = np.random.default_rng(4)
+    X = rng.standard_normal((200, 4))
+    y = (X[:, 0] > 0).astype(int)
+    model = DecisionTreeClassifier(max_depth=3).fit(X, y)
+    engine = compile_model(model)
+    assert isinstance(engine, SklearnInference)
+    labels, probabilities = engine.predict(X)
+    assert np.array_equal(labels, model.predict(X))
+    assert np.allclose(probabilities, model.predict_proba(X)[:, 1])
+
+    multiclass = LogisticRegression().fit(X, np.digitize(X[:, 0], [-0.5, 0.5]))
+    assert isinstance(compile_model(multiclass), SklearnInference)
+
+
+def test_wrong_feature_count_is_rejected():
+    engine = compile_model(joblib.load('loan_model.pkl'))
+    for call in (engine.predict_one, lambda row: engine.predict([row])):
+        try:
+            call([1.0] * 9)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('9 features should be rejected')
@@ -0,0 +1,30 @@
+"""Tests: fast JSON provider
+
+Run with:  python -m pytest test_json_codec.py
+"""
+import json
+from datetime import date
+
+import numpy as np
+from flask import Flask, jsonify
+
+import json_codec
+from json_codec import FastJSONProvider
+
+
+def test_responses_match_the_stdlib_provider():
+    payload = {'b': [1, 2.5, None], 'a': 'हिन्दी', 'when': date(2024, 1, 2), 'score': np.float64(0.25)}
+    fast = Flask(__name__)
+    fast.json = FastJSONProvider(fast)
+
+    with fast.app_context():
+        response = jsonify(payload)
+        body = response.get_data()
+        assert response.mimetype == 'application/json'
+        assert body.endswith(b'\n')
+        assert json.loads(body) == {'a': 'हिन्दी', 'b': [1, 2.5, None], 'score': 0.25, 'when': 'Tue, 02 Jan 2024 00:00:00 GMT'}
+        # Keys sorted like Flask's default provider
+        assert body.index(b'"a"') < body.index(b'"b"')
+        assert fast.json.loads(fast.json.dumps(payload)) == json.loads(body)
+
+    assert json_codec.loads(json_codec.dumpb({'x': 1})) == {'x': 1}
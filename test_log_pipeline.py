@@ -0,0 +1,70 @@
+"""Tests: queued JSON logging pipeline
+
+Run with:  python -m pytest test_log_pipeline.py
+"""
+import io
+import json
+import logging
+import threading
+
+from log_pipeline import LogPipeline, QueueingHandler, SamplingFilter, TextFormatter
+
+
+class WriterThreadName:
+    """Formats as the name of the thread that formatted it"""
+
+    def __str__(self):
+        return threading.current_thread().name
+
+
+def pipeline_logger(name, pipeline):
+    logger = logging.getLogger(name)
+    logger.handlers = [QueueingHandler(pipeline)]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_records_are_formatted_and_written_by_the_writer_thread():
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream)
+    logger = pipeline_logger('test_log_pipeline.json', pipeline)
+
+    logger.info("formatted on %s", WriterThreadName(), extra={'application': {'age': 30}})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logger.exception("failed")
+    pipeline.close()
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first['message'] == 'formatted on log-writer'
+    assert first['application'] == {'age': 30}
+    assert first['level'] == 'INFO' and first['logger'] == 'test_log_pipeline.json'
+    assert second['level'] == 'ERROR' and 'ValueError: boom' in second['exc_info']
+    assert pipeline.stats()['written'] == 2
+
+
+def test_text_format_and_flush():
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream, TextFormatter())
+    logger = pipeline_logger('test_log_pipeline.text', pipeline)
+
+    logger.warning("404 error for %s", '/missing', extra={'client': '10.0.0.1'})
+    pipeline.flush()
+
+    assert stream.getvalue().rstrip().endswith('WARNING - 404 error for /missing {"client": "10.0.0.1"}')
+    pipeline.close()
+
+
+def test_sampling_keeps_errors_and_full_queue_drops():
+    sampler = SamplingFilter(rate=0.0)
+    info = logging.LogRecord('loan_app.requests', logging.INFO, __file__, 1, 'query', (), None)
+    error = logging.LogRecord('loan_app.requests', logging.ERROR, __file__, 1, 'failed', (), None)
+    assert not sampler.filter(info) and sampler.filter(error)
+    assert sampler.sampled_out == 1
+
+    pipeline = LogPipeline(io.StringIO(), max_queue=0)
+    pipeline.enqueue(info)
+    assert pipeline.stats()['dropped'] == 1
+    pipeline.close()
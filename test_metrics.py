@@ -0,0 +1,87 @@
+"""Tests: hot-path metrics and their Prometheus export
+
+Run with:  python -m pytest test_metrics.py
+"""
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+from metrics import STAGE_BUCKETS, Metrics  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def samples(registry, name):
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for metric in registry.collect() for sample in metric.samples
+        if sample.name.startswith(name) and not sample.name.endswith('_created')
+    }
+
+
+def test_flush_matches_direct_observations():
+    registry = prometheus_client.CollectorRegistry()
+    metrics = Metrics(registry=registry)
+    reference_registry = prometheus_client.CollectorRegistry()
+    reference = prometheus_client.Histogram(
+        'loan_app_stage_seconds', 'reference', ['endpoint', 'stage'],
+        buckets=STAGE_BUCKETS, registry=reference_registry
+    ).labels('chatbot', 'match')
+
+    values = [0.00001, 0.00005, 0.0003, 0.002, 0.002, 0.7, 30.0]
+    for value in values[:4]:
+        metrics.observe('chatbot', 'match', value)
+        reference.observe(value)
+    metrics.flush()
+    # Only the delta since the previous flush is pushed
+    for value in values[4:]:
+        metrics.observe('chatbot', 'match', value)
+        reference.observe(value)
+    metrics.flush()
+    metrics.flush()
+
+    exported = {key: value for key, value in samples(registry, 'loan_app_stage_seconds').items()
+                if ('endpoint', 'chatbot') in key[1] and ('stage', 'match') in key[1]}
+    assert exported == pytest.approx(samples(reference_registry, 'loan_app_stage_seconds'))
+
+
+def test_counters_and_after_fork():
+    registry = prometheus_client.CollectorRegistry()
+    metrics = Metrics(registry=registry)
+    metrics.inc('translations', 'catalog')
+    metrics.inc('ml_fallbacks', 'encode_error', amount=3)
+    metrics.flush()
+    assert registry.get_sample_value('loan_app_translations_total', {'source': 'catalog'}) == 1
+    assert registry.get_sample_value('loan_app_ml_fallbacks_total', {'reason': 'encode_error'}) == 3
+    assert metrics.snapshot()['counters']['ml_fallbacks']['encode_error'] == 3
+
+    metrics.after_fork()
+    assert metrics.snapshot() == {
+        'counters': {name: dict.fromkeys(counts, 0) for name, counts in metrics.snapshot()['counters'].items()},
+        'stages_ms': {},
+    }
+
+
+def test_multiprocess_aggregation(tmp_path):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), PYTHONPATH=HERE)
+    worker = textwrap.dedent("""
+        from metrics import metrics
+        for _ in range(5):
+            metrics.observe('calculate_loan', 'total', 0.003)
+        metrics.inc('cache_requests', 'translation', 'hit')
+        metrics.flush()
+    """)
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', worker], env=env, check=True)
+
+    scrape = subprocess.run(
+        [sys.executable, '-c', 'from metrics import exposition; print(exposition()[0].decode())'],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    assert 'loan_app_stage_seconds_count{endpoint="calculate_loan",stage="total"} 10.0' in scrape
+    assert 'loan_app_cache_requests_total{cache="translation",result="hit"} 2.0' in scrape
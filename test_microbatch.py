@@ -0,0 +1,90 @@
+"""Tests: micro-batching scheduler
+
+Run with:  python -m pytest test_microbatch.py
+"""
+import threading
+import time
+
+from microbatch import MicroBatcher
+
+
+class Recorder:
+    def __init__(self, delay=0.0):
+        self.batches = []
+        self.singles = 0
+        self.delay = delay
+
+    def batch(self, items):
+        self.batches.append(list(items))
+        time.sleep(self.delay)
+        return [item * 2 for item in items]
+
+    def one(self, item):
+        self.singles += 1
+        # Keeps the caller active so later arrivals see concurrent load
+        time.sleep(self.delay)
+        return item * 2
+
+
+def run_concurrently(batcher, items):
+    results = {}
+    barrier = threading.Barrier(len(items))
+
+    def call(item):
+        barrier.wait()
+        results[item] = batcher.submit(item)
+
+    threads = [threading.Thread(target=call, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_caller_bypasses_the_window():
+    recorder = Recorder()
+    batcher = MicroBatcher(recorder.batch, recorder.one, window=1.0)
+    started = time.monotonic()
+    assert [batcher.submit(item) for item in range(5)] == [0, 2, 4, 6, 8]
+    assert time.monotonic() - started < 0.5
+    assert recorder.singles == 5 and recorder.batches == []
+    assert batcher.stats()['bypassed'] == 5
+
+
+def test_concurrent_callers_are_coalesced_and_resolved_in_order():
+    recorder = Recorder(delay=0.01)
+    batcher = MicroBatcher(recorder.batch, recorder.one, window=0.05, max_batch=16)
+    results = run_concurrently(batcher, list(range(40)))
+    assert results == {item: item * 2 for item in range(40)}
+    batched = sum(len(batch) for batch in recorder.batches)
+    assert batched + recorder.singles == 40
+    assert max(len(batch) for batch in recorder.batches) > 1
+    assert max(len(batch) for batch in recorder.batches) <= 16
+    stats = batcher.stats()
+    assert stats['batch_size']['count'] == len(recorder.batches)
+    assert stats['queue_depth']['count'] == batched
+
+
+def test_batch_errors_reach_every_caller():
+    def failing(items):
+        time.sleep(0.01)
+        raise RuntimeError('model unavailable')
+
+    batcher = MicroBatcher(failing, lambda item: time.sleep(0.01), window=0.05)
+    errors = []
+
+    def call(item):
+        try:
+            batcher.submit(item)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    barrier = threading.Barrier(8)
+    threads = [threading.Thread(target=lambda i=i: (barrier.wait(), call(i))) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) >= 1 and set(errors) == {'model unavailable'}
+    assert batcher.stats()['errors'] >= 1
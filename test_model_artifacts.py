@@ -0,0 +1,65 @@
+"""Round-trip tests: exported model artifacts vs. the pickled model
+
+Run with:  python -m pytest test_model_artifacts.py
+"""
+import json
+import random
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+
+from encoders import FeatureEncoder, vocabularies_from_label_encoders
+from inference import compile_model
+from model_artifacts import MANIFEST_NAME, export_artifacts, load_artifacts
+from test_encoders import random_application
+
+model = joblib.load('loan_model.pkl')
+label_encoders = joblib.load('label_encoders.pkl')
+
+
+def test_exported_artifacts_reproduce_pickles(tmp_path):
+    export_artifacts(model, label_encoders, str(tmp_path))
+    artifacts = load_artifacts(str(tmp_path))
+    # The coefficients are a view of the mapped file, not a private copy
+    assert not artifacts.engine.coef.flags.owndata
+
+    encoder = FeatureEncoder(vocabularies_from_label_encoders(label_encoders), model.feature_names_in_)
+    engine = compile_model(model, positive_class=encoder.approved_class)
+    rng = random.Random(5)
+    applications = [random_application(rng) for _ in range(300)]
+    features, _ = encoder.encode_rows(applications)
+    exported_features, _ = artifacts.encoder.encode_rows(applications)
+    assert np.array_equal(features, exported_features)
+
+    features = np.vstack([features, np.random.default_rng(5).standard_normal((300, 12)) * 1e4])
+    labels, probabilities = artifacts.engine.predict(features)
+    expected_labels, expected = engine.predict(features)
+    assert np.array_equal(labels, expected_labels)
+    assert np.array_equal(probabilities, expected)
+
+
+def test_stale_or_unknown_artifacts_are_ignored(tmp_path):
+    export_artifacts(model, label_encoders, str(tmp_path), fingerprint='not-the-pickles')
+    assert load_artifacts(str(tmp_path)) is None
+    assert load_artifacts(str(tmp_path), check_sources=False) is not None
+
+    manifest_path = tmp_path / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text())
+    manifest['format'] = 99
+    manifest_path.write_text(json.dumps(manifest))
+    assert load_artifacts(str(tmp_path), check_sources=False) is None
+    assert load_artifacts(str(tmp_path / 'missing')) is None
+
+
+def test_serving_from_artifacts_does_not_import_sklearn(tmp_path):
+    export_artifacts(model, label_encoders, str(tmp_path))
+    script = (
+        'import sys; from model_artifacts import load_artifacts; '
+        f'a = load_artifacts({str(tmp_path)!r}); '
+        'print(a.engine.predict_one([30, 1, 1e5, 750, 0, 5e5, 36, 6e4, 3, 0, 0, 0])[0], '
+        "any(m.split('.')[0] in ('sklearn', 'scipy', 'joblib') for m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    assert output.split()[1] == 'False'
@@ -0,0 +1,60 @@
+"""Tests: sampled request profiling
+
+Run with:  python -m pytest test_profiling.py
+"""
+import threading
+import time
+
+from profiling import Profiler
+
+
+def busy_loop(seconds):
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        pass
+
+
+def handle_request(profiler):
+    """Stands in for Flask: start() leaves out this frame and everything above"""
+    session = before_request(profiler)
+    busy_loop(0.05)
+    profiler.finish(session, 'test')
+    return session
+
+
+def before_request(profiler):
+    return profiler.start()
+
+
+def test_main_thread_samples_start_below_the_caller(tmp_path):
+    profiler = Profiler(str(tmp_path), interval=0.001)
+    session = handle_request(profiler)
+
+    assert session.samples > 5
+    stacks = profiler.read(session.profile_id).splitlines()
+    assert stacks[0].startswith('busy_loop (')
+    assert not any('handle_request' in line for line in stacks)
+
+
+def test_worker_thread_is_sampled_from_a_helper_thread(tmp_path):
+    profiler = Profiler(str(tmp_path), interval=0.001)
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(handle_request(profiler)))
+    thread.start()
+    thread.join()
+
+    assert sessions[0].samples > 0
+    assert 'busy_loop (' in profiler.read(sessions[0].profile_id)
+
+
+def test_settings_are_shared_and_sampled_one_in_n(tmp_path):
+    admin, worker = Profiler(str(tmp_path), settings_interval=0), Profiler(str(tmp_path), settings_interval=0)
+    assert not any(worker.should_profile() for _ in range(10))
+    assert worker.should_profile(forced=True)
+
+    admin.configure(sample_rate=4, interval=0.002)
+    picked = [worker.should_profile() for _ in range(12)]
+    assert sum(picked) == 3
+    assert worker.settings()['interval_ms'] == 2
+
+    assert worker.read('../settings') is None
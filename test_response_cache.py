@@ -0,0 +1,65 @@
+"""Tests: memoized chatbot responses and their ETags
+
+Run with:  python -m pytest test_response_cache.py
+"""
+import pytest
+
+from response_cache import ResponseCache
+
+
+def test_entries_are_memoized_with_content_etags():
+    cache = ResponseCache()
+    assert cache.get('emi_calculation', 'hi') is None
+
+    entry = cache.put('emi_calculation', 'hi', 'EMI text')
+    assert cache.get('emi_calculation', 'hi') is entry
+    # Same (intent, language, text) -> same ETag in every worker
+    assert ResponseCache().put('emi_calculation', 'hi', 'EMI text').etag == entry.etag
+    assert cache.put('emi_calculation', 'ta', 'EMI text').etag != entry.etag
+    assert cache.put('emi_calculation', 'hi', 'New EMI text').etag != entry.etag
+
+    warmed = cache.warm(['greeting', 'default'], ['en', 'hi'], lambda intent, language: None if language == 'hi' else intent)
+    assert warmed == 2 and cache.get('greeting', 'hi') is None and cache.get('default', 'en').text == 'default'
+    assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 2
+
+
+@pytest.fixture
+def chatbot(monkeypatch):
+    import app as app_module
+
+    monkeypatch.setattr(app_module.loan_chatbot, 'responses', ResponseCache())
+    return app_module
+
+
+def test_if_none_match_gets_304(chatbot):
+    client = chatbot.app.test_client()
+    first = client.post('/api/chatbot', json={'message': 'Documents needed for a loan'})
+    assert first.status_code == 200 and first.headers['ETag']
+    assert first.headers['Cache-Control'].startswith('public, max-age=')
+
+    again = client.post(
+        '/api/chatbot', json={'message': 'loan documents please'}, headers={'If-None-Match': first.headers['ETag']}
+    )
+    assert again.status_code == 304 and again.get_data() == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+    other = client.post('/api/chatbot', json={'message': 'What is the loan interest rate?'},
+                        headers={'If-None-Match': first.headers['ETag']})
+    assert other.status_code == 200
+
+
+def test_english_fallback_is_no_store_and_not_memoized(chatbot, monkeypatch):
+    client = chatbot.app.test_client()
+    body = {'message': 'How long does loan processing take?', 'language': 'ta'}
+    monkeypatch.setattr(chatbot.translator, 'translate', lambda text, target_lang='en', deadline=None: text)
+
+    response = client.post('/api/chatbot', json=body)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-store' and 'ETag' not in response.headers
+    assert len(chatbot.loan_chatbot.responses) == 0
+
+    # Once the translation succeeds it is memoized and cacheable
+    monkeypatch.setattr(chatbot.translator, 'translate', lambda text, target_lang='en', deadline=None: f'[{target_lang}] {text}')
+    response = client.post('/api/chatbot', json=body)
+    assert response.get_json()['response'].startswith('[ta] ') and response.headers['ETag']
+    assert len(chatbot.loan_chatbot.responses) == 1
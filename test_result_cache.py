@@ -0,0 +1,76 @@
+"""Tests: content-addressed eligibility result cache
+
+Run with:  python -m pytest test_result_cache.py
+"""
+import sqlite3
+
+import pytest
+
+import gunicorn_hooks
+from result_cache import ResultCache, create_result_cache
+
+APPLICATION = {
+    'age': 35, 'gender': 'Male', 'bank_balance': 250000, 'cibil_score': 760,
+    'existing_loans': 'No', 'loan_amount': 500000, 'loan_tenure': 60,
+    'monthly_income': 91234, 'income_source': 'Salary', 'employment_type': 'Salaried',
+    'other_loans': 0, 'emi_existing': 0, 'language': 'hi',
+}
+RESULT = {'status': 'Approved', 'eligibility_score': 82.5}
+
+
+def test_keys_are_canonical_and_cover_every_scoring_input():
+    cache = ResultCache(secret='s')
+    key = cache.key(APPLICATION, 'hi', 'model-1', 'policy-1')
+
+    # Formatting differences that score identically share a key
+    assert cache.key(dict(APPLICATION, cibil_score='760', loan_amount='500000.0'), 'hi', 'model-1', 'policy-1') == key
+    # Anything that can change the result does not
+    assert cache.key(dict(APPLICATION, monthly_income=91235), 'hi', 'model-1', 'policy-1') != key
+    assert cache.key(dict(APPLICATION, gender='Female'), 'hi', 'model-1', 'policy-1') != key
+    assert cache.key(APPLICATION, 'ta', 'model-1', 'policy-1') != key
+    assert ResultCache(secret='other').key(APPLICATION, 'hi', 'model-1', 'policy-1') != key
+    assert cache.key(dict(APPLICATION, cibil_score='high'), 'hi', 'model-1', 'policy-1') is None
+
+
+def test_shared_store_never_holds_raw_inputs(tmp_path):
+    path = str(tmp_path / 'results.sqlite3')
+    writer, reader = ResultCache(path=path, secret='s'), ResultCache(path=path, secret='s')
+    key = writer.key(APPLICATION, 'hi', 'model-1', 'policy-1')
+    writer.put(key, RESULT)
+
+    assert reader.get(reader.key(APPLICATION, 'hi', 'model-1', 'policy-1')) == RESULT
+    contents = b''.join((tmp_path / name).read_bytes() for name in ('results.sqlite3', 'results.sqlite3-wal') if (tmp_path / name).exists())
+    assert b'91234' not in contents and b'250000' not in contents
+
+
+def test_model_or_policy_change_invalidates(tmp_path):
+    path = str(tmp_path / 'results.sqlite3')
+    cache = ResultCache(path=path, secret='s')
+    cache.put(cache.key(APPLICATION, 'hi', 'model-1', 'policy-1'), RESULT)
+
+    key = cache.key(APPLICATION, 'hi', 'model-2', 'policy-1')
+    assert cache.get(key) is None
+    assert cache.invalidations == 1 and len(cache.memory) == 0
+    rows = sqlite3.connect(path).execute('SELECT COUNT(*) FROM results').fetchone()[0]
+    assert rows == 0
+
+
+def test_workers_share_entries_under_one_key(tmp_path, monkeypatch):
+    path = str(tmp_path / 'results.sqlite3')
+    with pytest.raises(ValueError, match='needs a secret'):
+        ResultCache(path=path)
+
+    monkeypatch.setenv('RESULT_CACHE_PATH', path)
+    # Set (blank) rather than deleted, so the generated key is undone afterwards
+    monkeypatch.setenv('RESULT_CACHE_SECRET', '')
+    monkeypatch.setenv('SECRET_KEY', '')
+    # Without a secret the cache stays per-process
+    assert create_result_cache().disk is None
+
+    # The gunicorn master generates one key; every worker inherits it
+    assert gunicorn_hooks.configure_result_cache()
+    first, second = create_result_cache(), create_result_cache()
+    key = first.key(APPLICATION, 'hi', 'model-1', 'policy-1')
+    first.put(key, RESULT)
+    second.memory.clear()
+    assert second.get(second.key(APPLICATION, 'hi', 'model-1', 'policy-1')) == RESULT
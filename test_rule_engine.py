@@ -0,0 +1,292 @@
+"""Parity tests: vectorized rule engine vs. the original scalar if/elif ladder
+
+Run with:  python -m pytest test_rule_engine.py
+"""
+import random
+
+import rule_engine
+from scoring_policy import policy_store
+
+
+def reference_eligibility(data, ml_prediction=None):
+    """The scalar calculate_eligibility implementation the engine replaced"""
+    bank_balance = float(data.get('bank_balance', 0))
+    cibil_score = int(data.get('cibil_score', 0))
+    loan_amount = float(data.get('loan_amount', 0))
+    monthly_income = float(data.get('monthly_income', 0))
+    loan_tenure = int(data.get('loan_tenure', 0))
+    emi_existing = float(data.get('emi_existing', 0))
+    age = int(data.get('age', 0))
+    employment_type = data.get('employment_type', '')
+
+    eligibility_score = 0
+    reasons = []
+    criteria_scores = {}
+
+    if cibil_score >= 800:
+        cibil_points = 40
+        criteria_scores['CIBIL Score'] = 'Excellent'
+    elif cibil_score >= 750:
+        cibil_points = 35
+        criteria_scores['CIBIL Score'] = 'Very Good'
+    elif cibil_score >= 700:
+        cibil_points = 25
+        criteria_scores['CIBIL Score'] = 'Good'
+        reasons.append("CIBIL score is good but could be improved")
+    elif cibil_score >= 650:
+        cibil_points = 15
+        criteria_scores['CIBIL Score'] = 'Fair'
+        reasons.append("CIBIL score needs improvement")
+    else:
+        cibil_points = 0
+        criteria_scores['CIBIL Score'] = 'Poor'
+        reasons.append("Low CIBIL score significantly affects approval")
+    eligibility_score += cibil_points
+
+    income_multiplier = 60
+    max_eligible_amount = monthly_income * income_multiplier
+    if loan_amount <= max_eligible_amount * 0.7:
+        income_points = 25
+        criteria_scores['Income Analysis'] = 'Excellent'
+    elif loan_amount <= max_eligible_amount:
+        income_points = 20
+        criteria_scores['Income Analysis'] = 'Good'
+    elif loan_amount <= max_eligible_amount * 1.2:
+        income_points = 10
+        criteria_scores['Income Analysis'] = 'Moderate'
+        reasons.append("Requested amount is high relative to income")
+    else:
+        income_points = 0
+        criteria_scores['Income Analysis'] = 'Poor'
+        reasons.append("Requested amount exceeds income capacity")
+    eligibility_score += income_points
+
+    interest_rate = 0.12 / 12
+    estimated_emi = loan_amount * interest_rate * (1 + interest_rate) ** loan_tenure / ((1 + interest_rate) ** loan_tenure - 1)
+    total_emi = estimated_emi + emi_existing
+    emi_ratio = (total_emi / monthly_income) * 100
+    if emi_ratio <= 30:
+        emi_points = 20
+        criteria_scores['EMI Ratio'] = 'Excellent'
+    elif emi_ratio <= 40:
+        emi_points = 15
+        criteria_scores['EMI Ratio'] = 'Good'
+    elif emi_ratio <= 50:
+        emi_points = 10
+        criteria_scores['EMI Ratio'] = 'Moderate'
+        reasons.append("EMI to income ratio is on the higher side")
+    elif emi_ratio <= 60:
+        emi_points = 5
+        criteria_scores['EMI Ratio'] = 'High'
+        reasons.append("High EMI to income ratio affects approval")
+    else:
+        emi_points = 0
+        criteria_scores['EMI Ratio'] = 'Very High'
+        reasons.append("EMI to income ratio is too high")
+    eligibility_score += emi_points
+
+    required_balance = loan_amount * 0.1
+    if bank_balance >= required_balance * 2:
+        balance_points = 10
+        criteria_scores['Bank Balance'] = 'Excellent'
+    elif bank_balance >= required_balance:
+        balance_points = 8
+        criteria_scores['Bank Balance'] = 'Good'
+    elif bank_balance >= required_balance * 0.5:
+        balance_points = 5
+        criteria_scores['Bank Balance'] = 'Moderate'
+        reasons.append("Bank balance could be higher")
+    else:
+        balance_points = 0
+        criteria_scores['Bank Balance'] = 'Low'
+        reasons.append("Insufficient bank balance for loan security")
+    eligibility_score += balance_points
+
+    if 25 <= age <= 35:
+        age_points = 5
+        criteria_scores['Age Factor'] = 'Optimal'
+    elif 21 <= age <= 45:
+        age_points = 4
+        criteria_scores['Age Factor'] = 'Good'
+    elif 18 <= age <= 55:
+        age_points = 3
+        criteria_scores['Age Factor'] = 'Acceptable'
+    else:
+        age_points = 1
+        criteria_scores['Age Factor'] = 'Risky'
+        reasons.append("Age factor affects loan tenure and approval")
+    eligibility_score += age_points
+
+    if employment_type in ['Permanent', 'Government']:
+        eligibility_score += 5
+        criteria_scores['Employment'] = 'Stable'
+    elif employment_type in ['Contract']:
+        eligibility_score += 2
+        criteria_scores['Employment'] = 'Moderate'
+    else:
+        criteria_scores['Employment'] = 'Variable'
+        reasons.append("Employment type affects stability assessment")
+
+    if ml_prediction:
+        ml_confidence = ml_prediction['probability']
+        ml_decision = ml_prediction['prediction']
+        if ml_decision == 1:
+            eligibility_score = min(eligibility_score + (ml_confidence * 20), 100)
+        else:
+            eligibility_score = max(eligibility_score - ((1 - ml_confidence) * 20), 0)
+        criteria_scores['ML Model Prediction'] = f"{'Approved' if ml_decision == 1 else 'Rejected'} (Confidence: {ml_confidence:.2%})"
+
+    if eligibility_score >= 80:
+        status = "Approved"
+        status_class = "success"
+        recommendation = "Congratulations! Your loan application is approved."
+    elif eligibility_score >= 60:
+        status = "Conditionally Approved"
+        status_class = "warning"
+        recommendation = "Your loan may be approved with additional documentation or conditions."
+    elif eligibility_score >= 40:
+        status = "Under Review"
+        status_class = "info"
+        recommendation = "Your application requires manual review. Please provide additional documents."
+    else:
+        status = "Rejected"
+        status_class = "danger"
+        recommendation = "Unfortunately, your loan application doesn't meet current criteria."
+
+    result = {
+        'status': status,
+        'status_class': status_class,
+        'eligibility_score': min(eligibility_score, 100),
+        'estimated_emi': round(estimated_emi, 2),
+        'emi_ratio': round(emi_ratio, 2),
+        'reasons': reasons,
+        'criteria_scores': criteria_scores,
+        'recommendation': recommendation,
+        'loan_details': {
+            'amount': loan_amount,
+            'tenure': loan_tenure,
+            'estimated_interest_rate': 12.0,
+            'processing_fee': round(loan_amount * 0.01, 2),
+            'total_payable': round(estimated_emi * loan_tenure, 2)
+        }
+    }
+    if ml_prediction:
+        result['ml_prediction'] = {
+            'prediction': 'Approved' if ml_prediction['prediction'] == 1 else 'Rejected',
+            'confidence': ml_prediction['probability']
+        }
+    return result
+
+
+EMPLOYMENT_TYPES = ['Permanent', 'Government', 'Contract', 'Self-employed', 'Business', '', None]
+
+
+def random_application(rng):
+    monthly_income = rng.choice([rng.uniform(5000, 300000), rng.randint(1, 500) * 1000])
+    loan_amount = rng.choice([
+        rng.uniform(10000, 5000000),
+        monthly_income * 60 * rng.choice([0.7, 1, 1.2]),  # income band edges
+    ])
+    return {
+        'bank_balance': rng.choice([rng.uniform(0, 2000000), loan_amount * 0.1 * rng.choice([0.5, 1, 2])]),
+        'cibil_score': rng.choice([rng.randint(300, 900), rng.choice([649, 650, 699, 700, 749, 750, 799, 800])]),
+        'loan_amount': loan_amount,
+        'monthly_income': monthly_income,
+        'loan_tenure': rng.choice([rng.randint(1, 360), 12, 24, 36, 60]),
+        'emi_existing': rng.choice([0, rng.uniform(0, 100000)]),
+        'age': rng.randint(15, 75),
+        'employment_type': rng.choice(EMPLOYMENT_TYPES),
+        'income_source': 'Salary',
+        'existing_loans': 'No',
+    }
+
+
+def random_ml_prediction(rng):
+    return rng.choice([
+        None,
+        {'prediction': 1, 'probability': rng.random()},
+        {'prediction': 0, 'probability': rng.random()},
+        {'prediction': 1, 'probability': 1.0},
+        {'prediction': 0, 'probability': 0.0},
+    ])
+
+
+def without_policy_version(result):
+    assert result.pop('policy_version') == policy_store.current().version
+    return result
+
+
+def evaluate_one(data, ml_prediction=None):
+    columns = rule_engine.columns_from_rows([rule_engine.coerce_application(data)])
+    return without_policy_version(rule_engine.evaluate(columns, [ml_prediction]).result(0))
+
+
+def test_single_row_parity():
+    rng = random.Random(1234)
+    for _ in range(5000):
+        data = random_application(rng)
+        ml_prediction = random_ml_prediction(rng)
+        assert evaluate_one(data, ml_prediction) == reference_eligibility(data, ml_prediction)
+
+
+def test_batch_parity():
+    rng = random.Random(42)
+    applications = [random_application(rng) for _ in range(2000)]
+    ml_predictions = [random_ml_prediction(rng) for _ in applications]
+    rows = [rule_engine.coerce_application(data) for data in applications]
+    results = [
+        without_policy_version(result)
+        for result in rule_engine.evaluate(rule_engine.columns_from_rows(rows), ml_predictions).results()
+    ]
+    expected = [reference_eligibility(data, ml) for data, ml in zip(applications, ml_predictions)]
+    assert results == expected
+
+
+def test_emi_ratio_band_edges():
+    # Pick incomes that put the EMI ratio exactly on each threshold
+    for ratio in (30, 40, 50, 60):
+        data = random_application(random.Random(ratio))
+        data['emi_existing'] = 0
+        data['loan_tenure'] = 12
+        emi = reference_eligibility(data)['estimated_emi']
+        data['monthly_income'] = emi * 100 / ratio
+        assert evaluate_one(data) == reference_eligibility(data)
+
+
+def test_zero_tenure_or_income_is_rejected_as_invalid():
+    data = random_application(random.Random(7))
+    for field in ('loan_tenure', 'monthly_income'):
+        try:
+            evaluate_one(dict(data, **{field: 0}))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'{field}=0 should be invalid')
+
+
+def test_policy_hot_reload_swaps_compiled_table(tmp_path):
+    import json
+    import os
+    from scoring_policy import DEFAULT_POLICY_PATH, PolicyStore
+
+    with open(DEFAULT_POLICY_PATH) as policy_file:
+        document = json.load(policy_file)
+    path = tmp_path / 'policy.json'
+    path.write_text(json.dumps(document))
+    store = PolicyStore(str(path), reload_interval=0)
+    data = dict(random_application(random.Random(3)), cibil_score=720)
+    columns = rule_engine.columns_from_rows([rule_engine.coerce_application(data)])
+    assert rule_engine.evaluate(columns, policy=store.current()).result(0)['criteria_scores']['CIBIL Score'] == 'Good'
+
+    document['version'] = 'test-2'
+    document['criteria']['cibil']['bands'][2]['min'] = 725
+    path.write_text(json.dumps(document))
+    os.utime(path, ns=(1, 1))
+    result = rule_engine.evaluate(columns, policy=store.current()).result(0)
+    assert result['policy_version'] == 'test-2'
+    assert result['criteria_scores']['CIBIL Score'] == 'Fair'
+
+    # A broken policy file keeps the last good compiled policy active
+    path.write_text('{"version": "broken"}')
+    os.utime(path, ns=(2, 2))
+    assert store.current().version == 'test-2'
@@ -0,0 +1,96 @@
+"""Tests: request schemas
+
+Run with:  python -m pytest test_schemas.py
+"""
+import pytest
+
+import rule_engine
+from schemas import SchemaError, application_schema, chatbot_schema
+
+LANGUAGES = ('en', 'hi', 'ta')
+SCHEMA = application_schema(LANGUAGES)
+
+APPLICATION = {
+    'bank_balance': 40000, 'cibil_score': 690, 'loan_amount': 1500000, 'monthly_income': 45000,
+    'loan_tenure': 60, 'age': 41, 'employment_type': 'Contract', 'income_source': 'Salary',
+    'existing_loans': 'Yes',
+}
+
+
+def test_values_are_coerced_once_and_defaults_filled():
+    clean = SCHEMA.parse(dict(
+        APPLICATION, cibil_score='690', loan_tenure=60.0, bank_balance='40000.5',
+        employment_type=' Contract ', language='hi', unexpected='dropped'
+    ))
+    assert clean['cibil_score'] == 690 and type(clean['cibil_score']) is int
+    assert clean['loan_tenure'] == 60 and type(clean['loan_tenure']) is int
+    assert clean['bank_balance'] == 40000.5 and clean['employment_type'] == 'Contract'
+    assert clean['emi_existing'] == 0.0 and clean['language'] == 'hi'
+    assert 'unexpected' not in clean and 'gender' not in clean
+    # Same typed row as the rule engine's own coercion of the raw input
+    assert rule_engine.coerce_application(clean) == rule_engine.coerce_application(dict(APPLICATION, bank_balance=40000.5))
+
+
+def test_every_failing_field_is_reported():
+    with pytest.raises(SchemaError) as caught:
+        SCHEMA.parse(dict(
+            APPLICATION, bank_balance=None, cibil_score=2 ** 64, loan_amount=True, loan_tenure=12.5,
+            age='old', monthly_income=float('nan'), language='xx'
+        ))
+    error = caught.value
+    assert error.errors == {
+        'bank_balance': 'is required',
+        'cibil_score': 'is out of range',
+        'loan_amount': 'must be a number',
+        'monthly_income': 'must be a finite number',
+        'loan_tenure': 'must be a whole number',
+        'age': 'must be a whole number',
+        'language': 'must be one of: en, hi, ta',
+    }
+    # The top-level message is the one the API has always returned
+    assert error.response()['error'] == 'Missing required field: bank_balance'
+
+    with pytest.raises(SchemaError, match='Invalid loan_amount: must be a finite number'):
+        SCHEMA.parse(dict(APPLICATION, loan_amount='1e999'))
+    with pytest.raises(SchemaError, match='Application must be a JSON object'):
+        SCHEMA.parse(['not', 'an', 'object'])
+
+
+def test_business_thresholds_are_left_to_the_scoring_rules():
+    # Out-of-band applicants are scored (e.g. "Risky"), not refused
+    clean = SCHEMA.parse(dict(APPLICATION, age=16, cibil_score=120, loan_tenure=600, bank_balance=0, loan_amount=0))
+    assert (clean['age'], clean['cibil_score'], clean['loan_tenure']) == (16, 120, 600)
+    assert (clean['bank_balance'], clean['loan_amount']) == (0.0, 0.0)
+
+
+def test_natural_limits_are_enforced():
+    with pytest.raises(SchemaError) as e:
+        SCHEMA.parse(dict(
+            APPLICATION, bank_balance=-50, loan_amount='-1', monthly_income=0, loan_tenure=10 ** 6,
+            age=-1, emi_existing=-5,
+        ))
+    assert e.value.errors == {
+        'bank_balance': 'must be at least 0',
+        'loan_amount': 'must be at least 0',
+        'monthly_income': 'must be greater than 0',
+        'loan_tenure': 'must be between 1 and 600',
+        'age': 'must be at least 0',
+        'emi_existing': 'must be at least 0',
+    }
+    assert e.value.message == 'Invalid bank_balance: must be at least 0'
+    with pytest.raises(SchemaError, match='Invalid loan_tenure: must be between 1 and 600'):
+        SCHEMA.parse(dict(APPLICATION, loan_tenure=0))
+
+
+def test_blank_required_text_uses_the_endpoint_message():
+    schema = chatbot_schema(LANGUAGES, max_length=10)
+    assert schema.parse({'message': ' emi '}) == {'message': 'emi', 'language': 'en'}
+    with pytest.raises(SchemaError, match='No message provided'):
+        schema.parse({'message': '   '})
+    assert schema.errors({'message': 'x' * 11}).errors == {'message': 'must be at most 10 characters'}
+
+
+def test_per_call_defaults_fill_blank_fields():
+    assert SCHEMA.parse(dict(APPLICATION, language=' '), {'language': 'hi'})['language'] == 'hi'
+    assert SCHEMA.parse(dict(APPLICATION, language=' ta '), {'language': 'hi'})['language'] == 'ta'
+    assert SCHEMA.parse(APPLICATION)['language'] == 'en'
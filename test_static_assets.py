@@ -0,0 +1,85 @@
+"""Tests: indexed, precompressed static asset serving
+
+Run with:  python -m pytest test_static_assets.py
+"""
+import gzip
+
+from flask import Flask, request
+
+from static_assets import IMMUTABLE, REVALIDATE, StaticAssets, precompress
+
+app = Flask(__name__)
+
+BUNDLE = b'console.log("loan approval");\n' * 100
+
+
+def build(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'index.html').write_bytes(b'<!doctype html><div id="root"></div>' * 40)
+    (tmp_path / 'assets' / 'index-3fA9c1Qb.js').write_bytes(BUNDLE)
+    (tmp_path / 'robots.txt').write_bytes(b'User-agent: *\n')
+    precompress(str(tmp_path))
+    return StaticAssets(str(tmp_path))
+
+
+def get(assets, path, **headers):
+    with app.test_request_context(f'/{path}', headers=headers):
+        return assets.serve(request, path) or assets.serve_index(request)
+
+
+def test_hashed_bundles_are_immutable_and_precompressed(tmp_path):
+    assets = build(tmp_path)
+    assert 'assets/index-3fA9c1Qb.js.gz' not in assets.assets
+
+    response = get(assets, 'assets/index-3fA9c1Qb.js', **{'Accept-Encoding': 'gzip, deflate'})
+    response.direct_passthrough = False
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Cache-Control'] == IMMUTABLE
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(response.get_data()) == BUNDLE
+
+    identity = get(assets, 'assets/index-3fA9c1Qb.js', **{'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in identity.headers
+    assert identity.headers['ETag'] != response.headers['ETag']
+
+    small = get(assets, 'robots.txt', **{'Accept-Encoding': 'gzip'})
+    assert small.headers['Cache-Control'] == REVALIDATE and 'Vary' not in small.headers
+
+
+def test_conditional_requests_get_304(tmp_path):
+    assets = build(tmp_path)
+    first = get(assets, 'assets/index-3fA9c1Qb.js', **{'Accept-Encoding': 'gzip'})
+    again = get(assets, 'assets/index-3fA9c1Qb.js', **{'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304 and again.get_data() == b''
+
+    # Another encoding is another representation
+    other = get(assets, 'assets/index-3fA9c1Qb.js', **{'If-None-Match': first.headers['ETag']})
+    assert other.status_code == 200
+
+
+def test_unknown_paths_fall_back_to_index_from_memory(tmp_path):
+    assets = build(tmp_path)
+    (tmp_path / 'index.html').unlink()
+
+    response = get(assets, 'apply/step-2', **{'Accept-Encoding': 'br, gzip'})
+    assert response.status_code == 200 and response.mimetype == 'text/html'
+    assert response.headers['Cache-Control'] == REVALIDATE
+    assert assets.stats()['index'] == 1
+
+    assert not StaticAssets(str(tmp_path / 'missing')).built
+
+
+def test_unknown_api_paths_are_json_404s(tmp_path, monkeypatch):
+    import app as app_module
+
+    client = app_module.app.test_client()
+    built = build(tmp_path)
+    for assets in (built, StaticAssets(str(tmp_path / 'missing'))):
+        monkeypatch.setattr(app_module, 'static_assets', assets)
+        response = client.get('/api/nope')
+        assert response.status_code == 404
+        assert response.get_json() == {'error': 'Not found', 'status': 404}
+
+    # Other unknown paths are still SPA routes
+    monkeypatch.setattr(app_module, 'static_assets', built)
+    assert client.get('/apply/step-2').mimetype == 'text/html'
@@ -0,0 +1,81 @@
+"""Tests: two-tier (LRU + SQLite) translation cache
+
+Run with:  python -m pytest test_translation_cache.py
+"""
+import pytest
+
+import translation_cache
+from translation_cache import LRUCache, SQLiteStore, TranslationCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(translation_cache.time, 'monotonic', clock)
+    monkeypatch.setattr(translation_cache.time, 'time', clock)
+    return clock
+
+
+def test_lru_evicts_least_recently_used_and_expires(clock):
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    # 'a' was used after 'b', so 'b' goes
+    assert cache.get('b') is None and cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+    clock.now += 10
+    assert cache.get('a') is None and len(cache) == 1
+    assert LRUCache(maxsize=0).set('a', 1) is None and len(LRUCache(maxsize=0)) == 0
+
+
+def test_sqlite_expiry_and_trim(tmp_path, clock):
+    store = SQLiteStore(str(tmp_path / 'cache.sqlite3'), ttl=100, max_entries=3, trim_every=1000)
+    for index in range(5):
+        clock.now += 1
+        store.set(f'k{index}', f'v{index}')
+    store.trim()
+    # Only the newest max_entries rows survive
+    assert [store.get(f'k{index}') for index in range(5)] == [None, None, 'v2', 'v3', 'v4']
+
+    clock.now += 99
+    assert store.get('k2') is None and store.get('k4') == 'v4'
+    store.trim()
+    count = store._connection().execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+    assert count == 2
+
+
+def test_sqlite_errors_are_counted_not_raised(tmp_path):
+    # A directory cannot be opened as a database
+    store = SQLiteStore(str(tmp_path))
+    store.set('k', 'v')
+    assert store.get('k') is None
+    store.purge_except('x')
+    assert store.stats()['errors'] == 3
+
+    cache = TranslationCache(path=str(tmp_path))
+    cache.set('Hello', 'hi', 'नमस्ते')
+    assert cache.get('Hello', 'hi') == 'नमस्ते'
+
+
+def test_disk_entries_are_promoted_into_memory(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    first, second = TranslationCache(path=path), TranslationCache(path=path)
+    first.set('Approved', 'hi', 'स्वीकृत')
+
+    # Another worker finds it on disk once, then in its own LRU
+    assert second.get('Approved', 'hi') == 'स्वीकृत'
+    assert second.get('Approved', 'hi') == 'स्वीकृत'
+    assert second.disk.hits == 1 and second.memory.hits == 1
+    assert second.get('Approved', 'ta') is None
+    assert second.stats()['hit_rate'] == round(2 / 3, 4)
@@ -0,0 +1,69 @@
+"""Tests: precomputed translation catalog, built offline with the stub translator
+
+Run with:  python -m pytest test_translation_catalog.py
+"""
+import json
+
+import build_translation_catalog
+from stub_translator import StubTranslator
+from translation_catalog import TranslationCatalog, build_catalog, write_catalog
+
+
+def test_stub_built_catalog_serves_static_strings_and_falls_back(tmp_path):
+    path = str(tmp_path / 'catalog.json')
+    assert build_translation_catalog.main(['--stub', '--output', path]) == 0
+
+    from app import Translator, loan_chatbot
+
+    catalog = TranslationCatalog.load(path)
+    assert catalog.version.startswith('stub-')
+    greeting = loan_chatbot.general_responses['greeting']
+    assert catalog.get(greeting, 'hi') == f'[hi] {greeting}'
+    assert catalog.get('Not a static string', 'hi') is None
+    assert catalog.get(greeting, 'en') is None
+    assert catalog.stats()['hits'] == 1 and catalog.stats()['misses'] == 2
+
+    # The translator answers static strings from the catalog and sends the rest to the backend
+    translator = Translator()
+    translator.catalog = catalog
+    assert translator.translate(greeting, 'ta') == f'[ta] {greeting}'
+    assert catalog.hits == 2
+    assert translator.translate('Your reference is 12345', 'ta') == '[ta] Your reference is 12345'
+    assert catalog.misses == 3
+
+
+def test_failed_entries_are_left_to_the_live_translator(tmp_path):
+    class Flaky(StubTranslator):
+        def translate(self, text):
+            if text == 'b':
+                raise RuntimeError('upstream error')
+            return super().translate(text)
+
+    document = build_catalog(['b', 'a', 'a', ''], ['en', 'hi'], lambda lang: Flaky(target=lang), 'v1')
+    assert document['source'] == ['a', 'b'] and document['languages'] == {'hi': ['[hi] a', None]}
+
+    path = str(tmp_path / 'catalog.json')
+    write_catalog(document, path)
+    catalog = TranslationCatalog.load(path)
+    assert catalog.get('a', 'hi') == '[hi] a' and catalog.get('b', 'hi') is None
+    assert len(catalog) == 1
+
+    assert len(TranslationCatalog.load(str(tmp_path / 'missing.json'))) == 0
+
+
+def test_check_verifies_a_shipped_catalog_without_translating(tmp_path, monkeypatch):
+    path = str(tmp_path / 'catalog.json')
+    assert build_translation_catalog.main(['--check', '--output', path]) == 1
+    assert build_translation_catalog.main(['--stub', '--output', path]) == 0
+
+    # --check never builds, so it needs no translator at all
+    monkeypatch.setattr(build_translation_catalog, 'build_catalog', None)
+    assert build_translation_catalog.main(['--stub', '--check', '--output', path]) == 0
+    # A stub catalog is not the real one
+    assert build_translation_catalog.main(['--check', '--output', path]) == 1
+
+    with open(path, encoding='utf-8') as catalog_file:
+        document = json.load(catalog_file)
+    document['languages']['ta'][0] = None
+    write_catalog(document, path)
+    assert build_translation_catalog.main(['--stub', '--check', '--output', path]) == 1
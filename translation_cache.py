@@ -0,0 +1,231 @@
+"""Two-tier translation cache keyed by (text, target_lang)
+
+Tier 1 is a bounded in-process LRU. Tier 2 is a SQLite file shared by all
+gunicorn workers (and surviving restarts). Both tiers honour a TTL; the
+SQLite tier is additionally trimmed to a maximum number of rows.
+"""
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe bounded LRU mapping with per-entry expiry"""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+
+class SQLiteStore:
+    """Key/value store in a SQLite file shared across processes
+
+    Connections are opened lazily per process (and per thread), so a store
+    created before gunicorn forks is safe to use in every worker.
+    """
+
+    def __init__(self, path, table='translations', ttl=None, max_entries=100000, trim_every=256, label='Translation cache'):
+        self.path = path
+        self.table = table
+        self.label = label
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.trim_every = trim_every
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connection(self):
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            connection = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            connection.execute(f'CREATE INDEX IF NOT EXISTS {self.table}_created ON {self.table} (created_at)')
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def get(self, key):
+        try:
+            row = self._connection().execute(
+                f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"{self.label} read failed: {str(e)}")
+            return None
+        if row is None or (self.ttl and row[1] + self.ttl < time.time()):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key, value):
+        try:
+            connection = self._connection()
+            connection.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+            self._writes += 1
+            if self._writes % self.trim_every == 0:
+                self.trim(connection)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"{self.label} write failed: {str(e)}")
+
+    def trim(self, connection=None):
+        """Drop expired rows, then the oldest rows beyond max_entries"""
+        connection = connection or self._connection()
+        if self.ttl:
+            connection.execute(f'DELETE FROM {self.table} WHERE created_at < ?', (time.time() - self.ttl,))
+        connection.execute(
+            f'DELETE FROM {self.table} WHERE key IN ('
+            f'SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def purge_except(self, prefix):
+        """Drop every row whose key does not start with ``prefix``"""
+        try:
+            self._connection().execute(f'DELETE FROM {self.table} WHERE substr(key, 1, ?) != ?', (len(prefix), prefix))
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"{self.label} purge failed: {str(e)}")
+
+    def clear(self):
+        try:
+            self._connection().execute(f'DELETE FROM {self.table}')
+        except sqlite3.Error as e:
+            logger.warning(f"{self.label} clear failed: {str(e)}")
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors
+        }
+
+
+class TranslationCache:
+    """LRU in front of an optional shared SQLite store"""
+
+    def __init__(self, maxsize=1024, ttl=None, path=None, max_entries=100000):
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.disk = SQLiteStore(path, ttl=ttl, max_entries=max_entries) if path else None
+
+    @staticmethod
+    def _key(text, target_lang):
+        return f'{target_lang}\x00{text}'
+
+    def get(self, text, target_lang, shared=True):
+        """LRU, then (unless ``shared`` is False) the SQLite store"""
+        key = self._key(text, target_lang)
+        value = self.memory.get(key)
+        if value is None and shared and self.disk is not None:
+            value = self._get_shared(key)
+        return value
+
+    def get_shared(self, text, target_lang):
+        """SQLite store only; lets async callers run the disk read in a thread"""
+        return self._get_shared(self._key(text, target_lang)) if self.disk is not None else None
+
+    def _get_shared(self, key):
+        value = self.disk.get(key)
+        if value is not None:
+            # Promote shared entries into this worker's LRU
+            self.memory.set(key, value)
+        return value
+
+    def set(self, text, target_lang, translated):
+        key = self._key(text, target_lang)
+        self.memory.set(key, translated)
+        if self.disk is not None:
+            self.disk.set(key, translated)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        memory = self.memory.stats()
+        stats = {'memory': memory}
+        if self.disk is not None:
+            stats['disk'] = self.disk.stats()
+        lookups = memory['hits'] + memory['misses']
+        hits = memory['hits'] + (self.disk.hits if self.disk is not None else 0)
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def create_translation_cache():
+    """Build the translation cache from environment settings"""
+    ttl = float(os.getenv('TRANSLATION_CACHE_TTL', str(7 * 24 * 3600))) or None
+    path = os.getenv('TRANSLATION_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'translation_cache.sqlite3'))
+    return TranslationCache(
+        maxsize=int(os.getenv('TRANSLATION_CACHE_SIZE', '2048')),
+        ttl=ttl,
+        path=path or None,
+        max_entries=int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', '100000'))
+    )
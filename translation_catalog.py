@@ -0,0 +1,106 @@
+"""Precomputed translations for every static backend string
+
+The catalog is produced offline by ``build_translation_catalog.py`` and
+loaded once at startup. Layout (JSON)::
+
+    {"format": 1, "version": "...", "source": [text, ...],
+     "languages": {"hi": [text, ...], ...}}
+
+where each language list is aligned with ``source``.
+"""
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translation_catalog.json')
+
+CATALOG_FORMAT_VERSION = 1
+
+
+class TranslationCatalog:
+    """Read-only (text, target_lang) -> translation lookup"""
+
+    def __init__(self, entries=None, version=None):
+        # {lang: {source_text: translated_text}}
+        self.entries = entries or {}
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOG_PATH):
+        """Load a catalog file; a missing or invalid file yields an empty catalog"""
+        try:
+            with open(path, 'r', encoding='utf-8') as catalog_file:
+                document = json.load(catalog_file)
+        except FileNotFoundError:
+            logger.info(f"No translation catalog at {path}; static strings will use the live translator")
+            return cls()
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading translation catalog: {str(e)}")
+            return cls()
+
+        if document.get('format') != CATALOG_FORMAT_VERSION:
+            logger.error(f"Unsupported translation catalog format: {document.get('format')}")
+            return cls()
+
+        source = document['source']
+        entries = {
+            lang: {text: translated for text, translated in zip(source, translations) if translated}
+            for lang, translations in document['languages'].items()
+        }
+        logger.info(f"Loaded translation catalog {document.get('version')}: {len(source)} strings x {len(entries)} languages")
+        return cls(entries, document.get('version'))
+
+    def get(self, text, target_lang):
+        translated = self.entries.get(target_lang, {}).get(text)
+        if translated is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return translated
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.entries.values())
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def build_catalog(strings, languages, backend_factory, version=None):
+    """Translate ``strings`` into every language with ``backend_factory(lang)``
+
+    Returns the catalog document (see module docstring).
+    """
+    source = sorted(set(text for text in strings if text))
+    document = {
+        'format': CATALOG_FORMAT_VERSION,
+        'version': version,
+        'source': source,
+        'languages': {}
+    }
+    for lang in languages:
+        if lang == 'en':
+            continue
+        backend = backend_factory(lang)
+        translations = []
+        for text in source:
+            try:
+                translations.append(backend.translate(text))
+            except Exception as e:
+                logger.error(f"Catalog translation error ({lang}): {str(e)}")
+                translations.append(None)
+        document['languages'][lang] = translations
+    return document
+
+
+def write_catalog(document, path=DEFAULT_CATALOG_PATH):
+    with open(path, 'w', encoding='utf-8') as catalog_file:
+        json.dump(document, catalog_file, ensure_ascii=False, separators=(',', ':'))